@@ -8,7 +8,8 @@ export interface ICourseVersion {
     version_number: number;
     created_at?: string;
 
-    content_snapshot: Record<string, unknown>;
+    // Left out of list responses unless requested with ?expand=
+    content_snapshot?: Record<string, unknown>;
     notes?: string;
     created_by?: number | null;
     created_by_details?: IUser;
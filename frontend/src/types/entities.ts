@@ -79,8 +79,9 @@ export interface IQuizAttempt {
   completion_status: TQuizCompletionStatus;
   attempt_date: string;
   user_details: IUser;
-  quiz_details: IQuizTask;
-  readonly responses: IQuizResponse[];
+  // Left out of list responses unless requested with ?expand=
+  quiz_details?: IQuizTask;
+  readonly responses?: IQuizResponse[];
 }
 
 
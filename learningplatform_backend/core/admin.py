@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Course, LearningTask, QuizTask, CourseEnrollment
+from .models import Course, LearningTask, QuestionTag, QuizTask, CourseEnrollment
 
 
 @admin.register(Course)
@@ -28,3 +28,9 @@ class CourseEnrollmentAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "course", "status", "enrollment_date")
     search_fields = ("user__username", "course__title")
     list_filter = ("status",)
+
+
+@admin.register(QuestionTag)
+class QuestionTagAdmin(admin.ModelAdmin):
+    list_display = ("id", "name")
+    search_fields = ("name",)
@@ -0,0 +1,840 @@
+"""
+Query builders behind the analytics, progress and dashboard endpoints.
+
+Each report is split into independent sections. Every section is a plain
+function of ids that runs its own queries, so the synchronous views in
+``core.progress_api`` and ``core.views`` call them one after another, while
+``core.async_views`` runs them concurrently. The course analytics sections
+run one aggregate or ``GROUP BY`` query each, whatever the course size.
+"""
+
+import logging
+
+from django.db import connection
+from django.db.models import (
+    Aggregate,
+    Avg,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Max,
+    Min,
+    Q,
+    Subquery,
+    Window,
+)
+from django.db.models.functions import Cast, RowNumber, TruncMonth
+
+from .models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizQuestion,
+    QuizResponse,
+    TaskProgress,
+)
+from .progress_matrix import get_progress_matrix
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+
+# Course analytics
+
+
+def course_enrollment_stats(course_id):
+    stats = CourseEnrollment.objects.filter(course_id=course_id).aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(status="active")),
+        completed=Count("id", filter=Q(status="completed")),
+        dropped=Count("id", filter=Q(status="dropped")),
+    )
+    total = stats["total"]
+    stats["completion_percentage"] = (
+        round((stats["completed"] / total * 100), 2) if total > 0 else 0
+    )
+    return stats
+
+
+def course_completion_rates(course_id):
+    """Average per-student completion rate and its distribution, in one query."""
+    total_tasks = Subquery(
+        LearningTask.objects.filter(course_id=course_id)
+        .values("course_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    per_student = (
+        TaskProgress.objects.filter(task__course_id=course_id)
+        .values("user_id")
+        .annotate(
+            rate=Cast(Count("id", filter=Q(status="completed")), FloatField())
+            * 100
+            / total_tasks
+        )
+    )
+    stats = per_student.aggregate(
+        average=Avg("rate"),
+        below_25=Count("user_id", filter=Q(rate__lt=25)),
+        from_25_to_50=Count("user_id", filter=Q(rate__gte=25, rate__lt=50)),
+        from_50_to_75=Count("user_id", filter=Q(rate__gte=50, rate__lt=75)),
+        above_75=Count("user_id", filter=Q(rate__gte=75)),
+    )
+    return {
+        "average": round(stats["average"] or 0, 2),
+        "distribution": {
+            "below_25": stats["below_25"],
+            "25_to_50": stats["from_25_to_50"],
+            "50_to_75": stats["from_50_to_75"],
+            "above_75": stats["above_75"],
+        },
+    }
+
+
+def course_average_scores(course_id):
+    average = (
+        QuizAttempt.objects.filter(
+            quiz__course_id=course_id, completion_status="completed"
+        ).aggregate(Avg("score"))["score__avg"]
+        or 0
+    )
+    return {"quizzes": round(average, 2)}
+
+
+TASK_TYPES = LearningTask._meta.get_field("task_type").choices
+
+
+def course_content_distribution(course_id):
+    distribution = {value: 0 for value, _ in TASK_TYPES}
+    distribution.update(
+        LearningTask.objects.filter(course_id=course_id)
+        .values("task_type")
+        .annotate(count=Count("id"))
+        .order_by()
+        .values_list("task_type", "count")
+    )
+    return distribution
+
+
+def course_challenging_content(course_id):
+    """
+    The ten questions with the lowest success rate, among those answered
+    correctly by fewer than half of at least five responses.
+    """
+    questions = (
+        QuizResponse.objects.filter(question__quiz__course_id=course_id)
+        .values("question_id", "question__text", "question__quiz__title")
+        .annotate(
+            total_attempts=Count("id"),
+            success_rate=Cast(
+                Count("id", filter=Q(is_correct=True)), FloatField()
+            )
+            * 100
+            / Count("id"),
+        )
+        .filter(total_attempts__gte=5, success_rate__lt=50)
+        .order_by("success_rate", "question_id")[:10]
+    )
+    return {
+        "questions": [
+            {
+                "id": row["question_id"],
+                "text": row["question__text"],
+                "quiz": row["question__quiz__title"],
+                "success_rate": round(row["success_rate"], 2),
+                "total_attempts": row["total_attempts"],
+            }
+            for row in questions
+        ]
+    }
+
+
+COURSE_ANALYTICS_SECTIONS = (
+    ("enrollment_stats", course_enrollment_stats),
+    ("completion_rates", course_completion_rates),
+    ("average_scores", course_average_scores),
+    ("content_distribution", course_content_distribution),
+    ("challenging_content", course_challenging_content),
+)
+
+
+def build_course_analytics(course_id):
+    return {name: section(course_id) for name, section in COURSE_ANALYTICS_SECTIONS}
+
+
+# Per-task analytics
+
+
+class Percentile(Aggregate):
+    """
+    ``PERCENTILE_CONT`` ordered-set aggregate (PostgreSQL only; see
+    ``supports_percentiles``).
+    """
+
+    function = "PERCENTILE_CONT"
+    name = "Percentile"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def supports_percentiles():
+    return connection.vendor == "postgresql"
+
+
+def interpolated_percentile(sorted_values, percentile):
+    """Python equivalent of ``PERCENTILE_CONT`` over an already sorted list."""
+    position = (len(sorted_values) - 1) * percentile
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (
+        sorted_values[upper] - sorted_values[lower]
+    ) * (position - lower)
+
+
+def _completion_duration():
+    return ExpressionWrapper(
+        F("completion_date") - F("start_date"), output_field=DurationField()
+    )
+
+
+# Completed progress rows whose completion time is known
+TIMED_COMPLETION = Q(
+    status="completed", start_date__isnull=False, completion_date__isnull=False
+)
+
+
+def _hours(duration):
+    return round(duration.total_seconds() / 3600, 2) if duration is not None else None
+
+
+def task_completion_stats(course_id):
+    """
+    Status counts and completion time statistics per task id, in one
+    ``GROUP BY`` query (two without ``PERCENTILE_CONT`` support).
+    """
+    duration = _completion_duration()
+    timed = TIMED_COMPLETION
+    aggregates = {
+        "total": Count("id"),
+        "completed": Count("id", filter=Q(status="completed")),
+        "in_progress": Count("id", filter=Q(status="in_progress")),
+        "not_started": Count("id", filter=Q(status="not_started")),
+        "avg_duration": Avg(duration, filter=timed),
+    }
+    if supports_percentiles():
+        aggregates["median_duration"] = Percentile(duration, 0.5, filter=timed)
+        aggregates["p90_duration"] = Percentile(duration, 0.9, filter=timed)
+
+    stats = {
+        row.pop("task_id"): row
+        for row in TaskProgress.objects.filter(task__course_id=course_id)
+        .values("task_id")
+        .annotate(**aggregates)
+        .order_by()
+    }
+
+    if not supports_percentiles():
+        durations = {}
+        for task_id, value in (
+            TaskProgress.objects.filter(TIMED_COMPLETION, task__course_id=course_id)
+            .annotate(duration=_completion_duration())
+            .order_by("task_id", "duration")
+            .values_list("task_id", "duration")
+        ):
+            durations.setdefault(task_id, []).append(value)
+        for task_id, values in durations.items():
+            stats[task_id]["median_duration"] = interpolated_percentile(values, 0.5)
+            stats[task_id]["p90_duration"] = interpolated_percentile(values, 0.9)
+
+    return stats
+
+
+def quiz_question_stats(course_id):
+    """Average score per quiz and response success per question, by quiz id."""
+    quizzes = {
+        row["quiz_id"]: {
+            "average_score": round(row["average_score"] or 0, 2),
+            "total_attempts": row["total_attempts"],
+            "question_analysis": [],
+        }
+        for row in QuizAttempt.objects.filter(
+            quiz__course_id=course_id, completion_status="completed"
+        )
+        .values("quiz_id")
+        .annotate(average_score=Avg("score"), total_attempts=Count("id"))
+        .order_by()
+    }
+    for row in (
+        QuizQuestion.objects.filter(quiz__course_id=course_id)
+        .values("id", "quiz_id", "text")
+        .annotate(
+            total_responses=Count("responses"),
+            correct_responses=Count("responses", filter=Q(responses__is_correct=True)),
+        )
+        .order_by("id")
+    ):
+        total = row["total_responses"]
+        quiz = quizzes.setdefault(
+            row["quiz_id"],
+            {"average_score": 0, "total_attempts": 0, "question_analysis": []},
+        )
+        quiz["question_analysis"].append(
+            {
+                "question_id": row["id"],
+                "text": row["text"],
+                "success_rate": (
+                    round(row["correct_responses"] / total * 100, 2) if total else 0
+                ),
+                "total_responses": total,
+            }
+        )
+    for quiz in quizzes.values():
+        quiz["question_analysis"].sort(key=lambda x: x["success_rate"])
+    return quizzes
+
+
+def build_course_task_analytics(course_id):
+    """
+    Analytics for every task of a course, hardest first. Runs a fixed number
+    of queries however many tasks, students or questions the course has.
+    """
+    tasks = LearningTask.objects.filter(course_id=course_id).values(
+        "id", "title", "task_type"
+    )
+    completion = task_completion_stats(course_id)
+    quizzes = quiz_question_stats(course_id)
+
+    task_analytics = []
+    for task in tasks:
+        stats = completion.get(task["id"], {})
+        total = stats.get("total", 0)
+        completed = stats.get("completed", 0)
+        completion_rate = (completed / total) * 100 if total > 0 else 0
+
+        task_data = {
+            "task_id": task["id"],
+            "title": task["title"],
+            "type": task["task_type"],
+            "completion_stats": {
+                "total_students": total,
+                "completed": completed,
+                "in_progress": stats.get("in_progress", 0),
+                "not_started": stats.get("not_started", 0),
+                "completion_rate": round(completion_rate, 2),
+                "avg_completion_time_hours": _hours(stats.get("avg_duration")),
+                "median_completion_time_hours": _hours(stats.get("median_duration")),
+                "p90_completion_time_hours": _hours(stats.get("p90_duration")),
+            },
+            "difficulty_assessment": {
+                "estimated_difficulty": (
+                    "high"
+                    if completion_rate < 50
+                    else ("medium" if completion_rate < 80 else "low")
+                ),
+                "avg_attempts_to_complete": (
+                    round(total / completed, 2) if completed > 0 else None
+                ),
+            },
+        }
+        if task["task_type"] == "quiz":
+            task_data["quiz_analysis"] = quizzes.get(
+                task["id"],
+                {"average_score": 0, "total_attempts": 0, "question_analysis": []},
+            )
+        task_analytics.append(task_data)
+
+    # Sort by completion rate (ascending, to highlight problematic tasks)
+    task_analytics.sort(key=lambda x: x["completion_stats"]["completion_rate"])
+    return task_analytics
+
+
+# Course funnel
+
+
+def _funnel_rows(funnel, learners):
+    """
+    Add rates and drop-off to ``ProgressMatrix.task_funnel`` rows. Learners
+    drop off at the furthest task they reached, unless they completed the
+    last one.
+    """
+    percent = 100 / learners if learners else 0
+    rows = []
+    for index, task in enumerate(funnel):
+        if index + 1 < len(funnel):
+            dropped = task["reached"] - funnel[index + 1]["reached"]
+        else:
+            dropped = task["reached"] - task["completed"]
+        rows.append(
+            {
+                **task,
+                "reach_rate": round(task["reached"] * percent, 2),
+                "completion_rate": round(task["completed"] * percent, 2),
+                "dropped_off": dropped,
+            }
+        )
+    return rows
+
+
+def build_course_funnel(course_id):
+    """
+    How far the enrolled learners got through the course, task by task in
+    course order, overall and per enrollment month cohort. Computed from the
+    cached progress matrix, so only the task titles are read per request.
+    """
+    matrix = get_progress_matrix(course_id)
+    titles = dict(
+        LearningTask.objects.filter(course_id=course_id).values_list("id", "title")
+    )
+    tasks = [
+        {"task_id": task["task_id"], "title": titles.get(task["task_id"]), **task}
+        for task in _funnel_rows(matrix.task_funnel(), len(matrix.user_ids))
+    ]
+    return {
+        "total_learners": len(matrix.user_ids),
+        "tasks": tasks,
+        "cohorts": [
+            {
+                "cohort": month,
+                "learners": len(cohort.user_ids),
+                "tasks": _funnel_rows(cohort.task_funnel(), len(cohort.user_ids)),
+            }
+            for month, cohort in matrix.cohorts()
+        ],
+    }
+
+
+# Student progress
+#
+# Every section returns data for all of a student's courses at once, keyed by
+# course id where needed, so the report costs the same number of queries for
+# one enrollment or fifty.
+
+
+def _user_info(user):
+    full_name = f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}"
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "full_name": full_name.strip(),
+    }
+
+
+def student_enrollments(user_id):
+    return list(
+        CourseEnrollment.objects.filter(user_id=user_id).values(
+            "course_id", "course__title", "status", "enrollment_date"
+        )
+    )
+
+
+def student_enrollment_counts(user_id):
+    return CourseEnrollment.objects.filter(user_id=user_id).aggregate(
+        total_courses=Count("id"),
+        completed_courses=Count("id", filter=Q(status="completed")),
+        active_courses=Count("id", filter=Q(status="active")),
+        dropped_courses=Count("id", filter=Q(status="dropped")),
+    )
+
+
+def student_quiz_average(user_id):
+    return (
+        QuizAttempt.objects.filter(
+            user_id=user_id, completion_status="completed"
+        ).aggregate(Avg("score"))["score__avg"]
+        or 0
+    )
+
+
+def student_course_task_totals(user_id):
+    """Number of tasks in each course the student is enrolled in."""
+    return dict(
+        LearningTask.objects.filter(course__enrollments__user_id=user_id)
+        .values("course_id")
+        .annotate(total=Count("id"))
+        .order_by()
+        .values_list("course_id", "total")
+    )
+
+
+def student_course_completed_tasks(user_id):
+    return dict(
+        TaskProgress.objects.filter(user_id=user_id, status="completed")
+        .values("task__course_id")
+        .annotate(completed=Count("id"))
+        .order_by()
+        .values_list("task__course_id", "completed")
+    )
+
+
+def student_course_quiz_stats(user_id):
+    return {
+        row["quiz__course_id"]: row
+        for row in QuizAttempt.objects.filter(
+            user_id=user_id, completion_status="completed"
+        )
+        .values("quiz__course_id")
+        .annotate(average_score=Avg("score"), attempts=Count("id"))
+        .order_by()
+    }
+
+
+def student_course_recent_activity(user_id, per_course=3):
+    """The latest ``per_course`` progress updates in each course, in one query."""
+    activity = {}
+    rows = (
+        TaskProgress.objects.filter(user_id=user_id)
+        .annotate(
+            recency=Window(
+                RowNumber(),
+                partition_by=F("task__course_id"),
+                order_by=[F("updated_at").desc(), F("id").desc()],
+            )
+        )
+        .filter(recency__lte=per_course)
+        .order_by("task__course_id", "recency")
+        .values_list("task__course_id", "task__title", "status", "updated_at")
+    )
+    for course_id, title, status, updated_at in rows:
+        activity.setdefault(course_id, []).append(
+            {"task__title": title, "status": status, "updated_at": updated_at}
+        )
+    return activity
+
+
+STUDENT_PROGRESS_SECTIONS = (
+    ("enrollments", student_enrollments),
+    ("counts", student_enrollment_counts),
+    ("average_quiz_score", student_quiz_average),
+    ("task_totals", student_course_task_totals),
+    ("completed_tasks", student_course_completed_tasks),
+    ("quiz_stats", student_course_quiz_stats),
+    ("recent_activity", student_course_recent_activity),
+)
+
+
+def student_course_progress(enrollment, sections):
+    """Progress in one course, from a ``student_enrollments`` row."""
+    course_id = enrollment["course_id"]
+    total_tasks = sections["task_totals"].get(course_id, 0)
+    completed_tasks = sections["completed_tasks"].get(course_id, 0)
+    completion_percentage = (
+        (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
+    )
+    quiz_stats = sections["quiz_stats"].get(course_id, {})
+    recent_activity = sections["recent_activity"].get(course_id, [])
+
+    return {
+        "course_id": course_id,
+        "course_title": enrollment["course__title"],
+        "enrollment_status": enrollment["status"],
+        "enrollment_date": enrollment["enrollment_date"],
+        "progress_summary": {
+            "completion_percentage": round(completion_percentage, 2),
+            "completed_tasks": completed_tasks,
+            "total_tasks": total_tasks,
+        },
+        "assessment_performance": {
+            "average_quiz_score": round(quiz_stats.get("average_score") or 0, 2),
+            "quiz_attempts": quiz_stats.get("attempts", 0),
+        },
+        "recent_activity": recent_activity,
+        "last_access": recent_activity[0]["updated_at"] if recent_activity else None,
+    }
+
+
+def assemble_student_progress(user, sections):
+    """
+    Combine the ``STUDENT_PROGRESS_SECTIONS`` results (by name) into the
+    response document.
+    """
+    course_progress = [
+        student_course_progress(enrollment, sections)
+        for enrollment in sections["enrollments"]
+    ]
+    total_tasks = sum(c["progress_summary"]["total_tasks"] for c in course_progress)
+    completed_tasks = sum(
+        c["progress_summary"]["completed_tasks"] for c in course_progress
+    )
+    overall_completion = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
+
+    return {
+        "user_info": _user_info(user),
+        "overall_stats": {
+            **sections["counts"],
+            "overall_completion": round(overall_completion, 2),
+            "total_tasks_completed": completed_tasks,
+            "total_tasks": total_tasks,
+            "average_quiz_score": round(sections["average_quiz_score"], 2),
+        },
+        "courses": sorted(
+            course_progress, key=lambda x: x["enrollment_date"], reverse=True
+        ),
+    }
+
+
+def build_student_progress(user):
+    return assemble_student_progress(
+        user,
+        {name: section(user.id) for name, section in STUDENT_PROGRESS_SECTIONS},
+    )
+
+
+# Student quiz performance
+
+
+def student_quiz_overall_stats(user_id):
+    """Attempt totals, with pass/fail judged against each quiz's threshold."""
+    return QuizAttempt.objects.filter(
+        user_id=user_id, completion_status="completed"
+    ).aggregate(
+        total_attempts=Count("id"),
+        average_score=Avg("score"),
+        quizzes_passed=Count("id", filter=Q(score__gte=F("quiz__pass_threshold"))),
+        quizzes_failed=Count("id", filter=Q(score__lt=F("quiz__pass_threshold"))),
+    )
+
+
+def student_quiz_course_breakdown(user_id):
+    rows = (
+        QuizAttempt.objects.filter(user_id=user_id, completion_status="completed")
+        .values("quiz__course_id", "quiz__course__title")
+        .annotate(
+            total_quizzes=Count("quiz_id", distinct=True),
+            total_attempts=Count("id"),
+            average_score=Avg("score"),
+            highest_score=Max("score"),
+            lowest_score=Min("score"),
+        )
+        .order_by("-average_score", "quiz__course_id")
+    )
+    return [
+        {
+            "course_id": row["quiz__course_id"],
+            "course_title": row["quiz__course__title"],
+            "total_quizzes": row["total_quizzes"],
+            "total_attempts": row["total_attempts"],
+            "average_score": round(row["average_score"], 2),
+            "highest_score": round(row["highest_score"], 2),
+            "lowest_score": round(row["lowest_score"], 2),
+        }
+        for row in rows
+    ]
+
+
+def student_recent_quiz_attempts(user_id, limit=5):
+    rows = (
+        QuizAttempt.objects.filter(user_id=user_id, completion_status="completed")
+        .order_by("-attempt_date")
+        .values(
+            "id",
+            "quiz_id",
+            "quiz__title",
+            "quiz__course__title",
+            "score",
+            "attempt_date",
+            "started_at",
+        )
+        .annotate(
+            correct_answers=Count("responses", filter=Q(responses__is_correct=True)),
+            total_questions=Count("responses"),
+        )[:limit]
+    )
+    return [
+        {
+            "attempt_id": row["id"],
+            "quiz_id": row["quiz_id"],
+            "quiz_title": row["quiz__title"],
+            "course_title": row["quiz__course__title"],
+            "score": round(row["score"], 2),
+            "correct_answers": row["correct_answers"],
+            "total_questions": row["total_questions"],
+            "submission_time": row["attempt_date"],
+            "time_spent": (
+                str(row["attempt_date"] - row["started_at"])
+                if row["started_at"]
+                else None
+            ),
+        }
+        for row in rows
+    ]
+
+
+def student_category_performance(user_id):
+    return category_performance(
+        QuizResponse.objects.filter(
+            attempt__user_id=user_id, attempt__completion_status="completed"
+        )
+    )
+
+
+def build_student_quiz_performance(user):
+    overall = student_quiz_overall_stats(user.id)
+    total_attempts = overall["total_attempts"]
+    if total_attempts == 0:
+        return {
+            "user_info": _user_info(user),
+            "overall_stats": {
+                "total_attempts": 0,
+                "average_score": 0,
+                "quizzes_passed": 0,
+                "quizzes_failed": 0,
+            },
+            "course_breakdown": [],
+            "recent_attempts": [],
+            "performance_by_category": [],
+        }
+
+    overall["average_score"] = round(overall["average_score"] or 0, 2)
+    overall["pass_rate"] = round(overall["quizzes_passed"] / total_attempts * 100, 2)
+    return {
+        "user_info": _user_info(user),
+        "overall_stats": overall,
+        "course_breakdown": student_quiz_course_breakdown(user.id),
+        "recent_attempts": student_recent_quiz_attempts(user.id),
+        "performance_by_category": student_category_performance(user.id),
+    }
+
+
+# Question categories
+
+
+def _category_rows(rows):
+    """Shape grouped tag rows, weakest category first."""
+    categories = [
+        {
+            "category": row["question__tags__name"],
+            "total_questions": row["total_questions"],
+            "correct_answers": row["correct_answers"],
+            "success_rate": round(
+                row["correct_answers"] * 100 / row["total_questions"], 2
+            ),
+        }
+        for row in rows
+    ]
+    categories.sort(key=lambda row: (row["success_rate"], row["category"]))
+    return categories
+
+
+def _category_counts():
+    return {
+        "total_questions": Count("id"),
+        "correct_answers": Count("id", filter=Q(is_correct=True)),
+    }
+
+
+def category_performance(responses):
+    """
+    Answer counts and success rate per question tag over ``responses``,
+    grouped in one query. A response to a question with several tags counts
+    towards each of them; untagged questions are left out.
+    """
+    return _category_rows(
+        responses.filter(question__tags__isnull=False)
+        .values("question__tags__name")
+        .annotate(**_category_counts())
+        .order_by("question__tags__name")
+    )
+
+
+def course_category_performance(course_id):
+    return category_performance(
+        QuizResponse.objects.filter(question__quiz__course_id=course_id)
+    )
+
+
+def course_cohort_category_performance(course_id):
+    """
+    Category performance per enrollment month cohort of the course, grouped
+    in one query, oldest cohort first.
+    """
+    rows = (
+        QuizResponse.objects.filter(
+            question__quiz__course_id=course_id,
+            question__tags__isnull=False,
+            attempt__user__enrollments__course_id=course_id,
+        )
+        .values(
+            "question__tags__name",
+            cohort=TruncMonth("attempt__user__enrollments__enrollment_date"),
+        )
+        .annotate(**_category_counts())
+        .order_by("cohort", "question__tags__name")
+    )
+    cohorts = {}
+    for row in rows:
+        cohorts.setdefault(row["cohort"], []).append(row)
+    return [
+        {"cohort": cohort.strftime("%Y-%m"), "categories": _category_rows(rows)}
+        for cohort, rows in cohorts.items()
+    ]
+
+
+def build_course_category_performance(course_id):
+    return {
+        "categories": course_category_performance(course_id),
+        "cohorts": course_cohort_category_performance(course_id),
+    }
+
+
+# Dashboards
+
+
+def instructor_courses_created(user_id):
+    return Course.objects.filter(creator_id=user_id).count()
+
+
+def instructor_students_enrolled(user_id):
+    return (
+        CourseEnrollment.objects.filter(course__creator_id=user_id)
+        .values("user")
+        .distinct()
+        .count()
+    )
+
+
+def instructor_recent_activity(user_id):
+    return list(
+        TaskProgress.objects.filter(task__course__creator_id=user_id)
+        .order_by("-updated_at")[:5]
+        .values("task__title", "status", "updated_at")
+    )
+
+
+INSTRUCTOR_DASHBOARD_SECTIONS = (
+    ("courses_created", instructor_courses_created),
+    ("students_enrolled", instructor_students_enrolled),
+    ("recent_activity", instructor_recent_activity),
+)
+
+
+def build_instructor_dashboard(user_id):
+    return {name: section(user_id) for name, section in INSTRUCTOR_DASHBOARD_SECTIONS}
+
+
+def total_task_progress():
+    return TaskProgress.objects.count()
+
+
+def completed_task_progress():
+    return TaskProgress.objects.filter(status="completed").count()
+
+
+def average_quiz_score():
+    return QuizAttempt.objects.aggregate(Avg("score"))["score__avg"] or 0
+
+
+ADMIN_DASHBOARD_SECTIONS = (
+    ("totalTasks", total_task_progress),
+    ("completedTasks", completed_task_progress),
+    ("averageScore", average_quiz_score),
+)
+
+
+def build_admin_dashboard():
+    return {name: section() for name, section in ADMIN_DASHBOARD_SECTIONS}
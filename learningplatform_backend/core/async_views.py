@@ -0,0 +1,238 @@
+"""
+Async versions of the read-heavy analytics, progress and dashboard endpoints.
+
+These views are served under ``/api/v1/async/`` and only pay off when the
+project runs under ASGI (see ``learningplatform_backend/asgi.py``): while a
+report's queries run, the event loop keeps serving other requests instead of
+holding a worker thread.
+
+The report sections from ``core.analytics`` are independent, so they run
+concurrently with ``asyncio.gather``. Django's async ORM methods are
+thread-sensitive wrappers that would queue every query on the same thread,
+so each section instead runs in the thread pool on its own connection.
+Inside a transaction (e.g. in tests) uncommitted rows are only visible on
+the current connection, so sections then run one after another.
+
+Authentication reads the JWT claims the same way ``ClaimsJWTAuthentication``
+does for ``stateless_auth`` views, so most requests never load the user.
+"""
+
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .analytics import (
+    ADMIN_DASHBOARD_SECTIONS,
+    COURSE_ANALYTICS_SECTIONS,
+    INSTRUCTOR_DASHBOARD_SECTIONS,
+    STUDENT_PROGRESS_SECTIONS,
+    assemble_student_progress,
+)
+from .authentication import ClaimsJWTAuthentication
+from .caching import course_analytics_key, student_progress_key
+from .models import Course, User
+from .renderers import FastJSONRenderer
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+
+def _run_section(func, args):
+    try:
+        return func(*args)
+    finally:
+        # Pool threads live outside the request cycle, so apply
+        # CONN_MAX_AGE to their connections here
+        close_old_connections()
+
+
+async def gather_sections(*calls):
+    """
+    Run ``(func, args)`` pairs concurrently and return their results in order.
+    """
+    in_transaction = await sync_to_async(lambda: connection.in_atomic_block)()
+    if in_transaction or not getattr(settings, "ASYNC_PARALLEL_QUERIES", True):
+        return [await sync_to_async(func)(*args) for func, args in calls]
+
+    return await asyncio.gather(
+        *(
+            sync_to_async(_run_section, thread_sensitive=False)(func, args)
+            for func, args in calls
+        )
+    )
+
+
+async def authenticate(request):
+    """
+    Return the user for the request's bearer token, or None without one.
+
+    Raises ``InvalidToken`` or ``AuthenticationFailed`` for bad tokens.
+    """
+    auth = ClaimsJWTAuthentication()
+    header = auth.get_header(request)
+    if header is None:
+        return None
+    raw_token = auth.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    validated_token = auth.get_validated_token(raw_token)
+    if auth.has_user_claims(validated_token):
+        return await sync_to_async(auth.get_claims_user)(validated_token)
+    return await sync_to_async(auth.get_user)(validated_token)
+
+
+def error_response(message, status):
+    return JsonResponse({"error": message}, status=status)
+
+
+class AsyncAPIView(View):
+    """
+    Base class for async JSON endpoints that require a valid access token.
+
+    Set ``allowed_roles`` to restrict a view to those roles; ``allow_staff``
+    lets staff users in regardless of their role.
+    """
+
+    http_method_names = ["get", "options"]
+    allowed_roles = None
+    allow_staff = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            user = await authenticate(request)
+        except (InvalidToken, AuthenticationFailed) as e:
+            return error_response(str(e.detail), 401)
+        if user is None:
+            return error_response("Authentication credentials were not provided.", 401)
+
+        if self.allowed_roles is not None and not (
+            user.role in self.allowed_roles or (self.allow_staff and user.is_staff)
+        ):
+            return error_response(
+                "You do not have permission to access this resource.", 403
+            )
+
+        request.user = user
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+    def respond(self, data, status=200):
+        # Render like the DRF views so both variants return identical bodies
+        renderer = FastJSONRenderer()
+        return HttpResponse(
+            renderer.render(data), status=status, content_type=renderer.media_type
+        )
+
+
+class AsyncCourseAnalyticsAPI(AsyncAPIView):
+    """Async counterpart of ``CourseAnalyticsAPI``."""
+
+    allowed_roles = ("instructor", "admin")
+
+    async def get(self, request, pk):
+        cache_key = course_analytics_key(pk)
+        cached_data = await cache.aget(cache_key)
+        if cached_data:
+            return self.respond(cached_data)
+
+        if not await Course.objects.filter(pk=pk).aexists():
+            return error_response("Course not found.", 404)
+
+        results = await gather_sections(
+            *((section, (pk,)) for _, section in COURSE_ANALYTICS_SECTIONS)
+        )
+        analytics_data = {
+            name: result
+            for (name, _), result in zip(COURSE_ANALYTICS_SECTIONS, results)
+        }
+
+        # Cache the analytics data for 1 hour
+        await cache.aset(cache_key, analytics_data, 60 * 60)
+        return self.respond(analytics_data)
+
+
+class AsyncStudentProgressAPI(AsyncAPIView):
+    """Async counterpart of ``StudentProgressAPI``."""
+
+    async def get(self, request, pk=None):
+        user_id = request.user.id if pk is None else pk
+        if user_id != request.user.id and not (
+            request.user.role in ["instructor", "admin"] or request.user.is_staff
+        ):
+            return error_response(
+                "You do not have permission to view this user's progress", 403
+            )
+
+        cache_key = student_progress_key(user_id)
+        cached_data = await cache.aget(cache_key)
+        if cached_data:
+            return self.respond(cached_data)
+
+        try:
+            user = await User.objects.only(
+                "id", "username", "email", "first_name", "last_name"
+            ).aget(pk=user_id)
+        except User.DoesNotExist:
+            return error_response("User not found.", 404)
+
+        results = await gather_sections(
+            *((section, (user.id,)) for _, section in STUDENT_PROGRESS_SECTIONS)
+        )
+        sections = {
+            name: result
+            for (name, _), result in zip(STUDENT_PROGRESS_SECTIONS, results)
+        }
+        student_progress_data = assemble_student_progress(user, sections)
+
+        # Cache the data for 15 minutes
+        await cache.aset(cache_key, student_progress_data, 15 * 60)
+        return self.respond(student_progress_data)
+
+
+class AsyncInstructorDashboardAPI(AsyncAPIView):
+    """Async counterpart of ``InstructorDashboardAPI``."""
+
+    allowed_roles = ("instructor",)
+    allow_staff = False
+
+    async def get(self, request):
+        results = await gather_sections(
+            *(
+                (section, (request.user.id,))
+                for _, section in INSTRUCTOR_DASHBOARD_SECTIONS
+            )
+        )
+        return self.respond(
+            {
+                name: result
+                for (name, _), result in zip(INSTRUCTOR_DASHBOARD_SECTIONS, results)
+            }
+        )
+
+
+class AsyncAdminDashboardAPI(AsyncAPIView):
+    """Async counterpart of ``AdminDashboardAPI``."""
+
+    allowed_roles = ("admin",)
+    allow_staff = False
+
+    async def get(self, request):
+        results = await gather_sections(
+            *((section, ()) for _, section in ADMIN_DASHBOARD_SECTIONS)
+        )
+        return self.respond(
+            {
+                name: result
+                for (name, _), result in zip(ADMIN_DASHBOARD_SECTIONS, results)
+            }
+        )
@@ -0,0 +1,146 @@
+import logging
+
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .caching import get_cached_user, is_user_deactivated
+from .models import User
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Claims added by CustomTokenObtainPairSerializer.get_token; tokens issued
+# before all of them existed are authenticated the regular way
+REQUIRED_CLAIMS = ("username", "email", "role")
+
+
+class ClaimsUser(TokenUser):
+    """
+    A user object backed by the claims of a validated access token.
+
+    Exposes ``id``, ``username``, ``email``, ``role`` and ``is_staff`` without
+    touching the database. Any other attribute loads the full ``User`` row
+    (through the user cache) on first access, so code that unexpectedly needs
+    the model still works.
+    """
+
+    def __init__(self, token):
+        super().__init__(token)
+        self._user = None
+
+    def __str__(self):
+        return self.username
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def role(self):
+        return self.token.get("role", "")
+
+    def get_model_user(self):
+        """Return the full ``User`` instance for this token."""
+        if self._user is None:
+            self._user = get_cached_user(self.id)
+        return self._user
+
+    def __eq__(self, other):
+        if isinstance(other, User):
+            return self.id == other.pk
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.get_model_user(), attr)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that avoids a ``User`` query on every request.
+
+    Safe requests to views that set ``stateless_auth = True`` get a
+    ``ClaimsUser`` built from the token claims, unless the user has since
+    been deactivated or deleted. Every other request gets the real ``User``
+    model, served from a short-lived cache instead of the database.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        if self.can_use_claims(request, validated_token):
+            return self.get_claims_user(validated_token), validated_token
+
+        return self.get_user(validated_token), validated_token
+
+    def can_use_claims(self, request, validated_token):
+        if request.method not in SAFE_METHODS:
+            return False
+
+        parser_context = getattr(request, "parser_context", None) or {}
+        view = parser_context.get("view")
+        if not getattr(view, "stateless_auth", False):
+            return False
+
+        return self.has_user_claims(validated_token)
+
+    def has_user_claims(self, validated_token):
+        """Whether the token alone can describe its user."""
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation needs the stored password hash
+            return False
+
+        return all(claim in validated_token for claim in REQUIRED_CLAIMS)
+
+    def get_claims_user(self, validated_token):
+        """
+        Return a ``ClaimsUser`` for the token, rejecting users deactivated or
+        deleted since it was issued.
+        """
+        if is_user_deactivated(validated_token[api_settings.USER_ID_CLAIM]):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return ClaimsUser(validated_token)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = get_cached_user(user_id)
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
@@ -1,12 +1,37 @@
 from rest_framework import viewsets
 from django.contrib.auth.models import AnonymousUser
 
+from .fast_serializers import FastListMixin
+from .serializers import requested_fields
 
-class BaseViewSet(viewsets.ModelViewSet):
+
+class BaseViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     Base viewset with common filtering and permission logic.
+
+    Subclasses can declare ``query_plans`` to describe what each action's
+    serializer touches, so related rows are loaded up front instead of once
+    per object::
+
+        query_plans = {
+            "list": {
+                "select_related": ["user", "course"],
+                "prefetch_related": ["course__learning_tasks"],
+                "annotate": {"task_count": Count("course__learning_tasks")},
+            },
+        }
+
+    Setting ``compiled_serializer`` (see ``core.fast_serializers``) serves
+    plain list requests from ``values_list()`` rows instead.
+
+    The ``"default"`` plan is used for actions without a plan of their own.
+    A plan's ``"expand"`` entry maps expandable serializer fields to the
+    lookups they need; those are only prefetched when the client asks for
+    the field with ``?expand=`` or ``?fields=``.
     """
 
+    query_plans = {}
+
     def _is_admin_or_instructor(self, user):
         """Safely check if user is admin or instructor."""
         user_role = getattr(user, "role", "")
@@ -27,10 +52,37 @@ class BaseViewSet(viewsets.ModelViewSet):
 
         # Admins and instructors can see all data
         if self._is_admin_or_instructor(self.request.user):
-            return self.queryset
+            queryset = self.queryset.all()
+        else:
+            # Regular users can only see their own data
+            queryset = self.queryset.filter(user=self.request.user)
 
-        # Regular users can only see their own data
-        return self.queryset.filter(user=self.request.user)
+        return self.apply_query_plan(queryset)
+
+    def get_query_plan(self):
+        """Return the query plan for the current action."""
+        plans = self.query_plans
+        return plans.get(getattr(self, "action", None)) or plans.get("default", {})
+
+    def apply_query_plan(self, queryset):
+        """
+        Apply the select/prefetch/annotate steps of the current query plan.
+        """
+        plan = self.get_query_plan()
+        if plan.get("select_related"):
+            queryset = queryset.select_related(*plan["select_related"])
+        if plan.get("prefetch_related"):
+            queryset = queryset.prefetch_related(*plan["prefetch_related"])
+        if plan.get("annotate"):
+            queryset = queryset.annotate(**plan["annotate"])
+        if plan.get("expand"):
+            requested = (requested_fields(self.request, "expand") or set()) | (
+                requested_fields(self.request, "fields") or set()
+            )
+            for field, lookups in plan["expand"].items():
+                if field in requested:
+                    queryset = queryset.prefetch_related(*lookups)
+        return queryset
 
     def filter_queryset_by_params(self, queryset, params):
         """
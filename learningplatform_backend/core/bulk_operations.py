@@ -0,0 +1,455 @@
+import csv
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .caching import invalidate_enrollment_cache, invalidate_progress_caches
+from .models import CourseEnrollment, LearningTask, TaskProgress, User
+from .serializers import TaskProgressBulkItemSerializer, UserProvisionSerializer
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single bulk request; larger imports should be chunked
+MAX_BULK_ITEMS = 1000
+
+# Upper bound for one bulk enrollment request; the management command has none
+MAX_BULK_ENROLLMENTS = 10000
+
+# Rows per IN (...) lookup and per INSERT statement for large imports
+DEFAULT_CHUNK_SIZE = 500
+
+# Below this many plaintext passwords hashing stays inline; spinning up a
+# pool costs more than it saves
+MIN_PASSWORDS_FOR_POOL = 32
+
+# Threads hashing passwords inside a web request; forking a process pool from
+# a server worker is unsafe, so only the management command uses processes
+MAX_REQUEST_HASH_THREADS = 4
+
+
+def bulk_update_task_progress(user, items):
+    """
+    Apply many task progress updates for ``user`` in one transaction.
+
+    Every item is validated on its own, the referenced tasks are checked
+    against the user's enrollments with a single query, and the surviving
+    rows are written with one ``bulk_create`` and one ``bulk_update``.
+
+    Returns a list of per-item results in the same order as ``items``.
+    """
+    results = [None] * len(items)
+    valid = []
+
+    for index, item in enumerate(items):
+        serializer = TaskProgressBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {
+                "index": index,
+                "task": item.get("task") if isinstance(item, dict) else None,
+                "result": "error",
+                "errors": serializer.errors,
+            }
+
+    # One query: which of the requested tasks belong to courses the user is in
+    task_courses = dict(
+        LearningTask.objects.filter(
+            id__in={data["task"] for _, data in valid},
+            course__enrollments__user=user,
+        ).values_list("id", "course_id")
+    )
+
+    # One query: the progress rows that already exist for those tasks
+    existing = {
+        progress.task_id: progress
+        for progress in TaskProgress.objects.filter(
+            user=user, task_id__in=task_courses.keys()
+        ).order_by("id")
+    }
+
+    now = timezone.now()
+    to_create = {}
+    to_update = {}
+    applied = []
+
+    for index, data in valid:
+        task_id = data["task"]
+        if task_id not in task_courses:
+            results[index] = {
+                "index": index,
+                "task": task_id,
+                "result": "error",
+                "errors": {"task": ["You are not enrolled in this task's course."]},
+            }
+            continue
+
+        progress = existing.get(task_id) or to_create.get(task_id)
+        if progress is None:
+            progress = TaskProgress(user=user, task_id=task_id)
+            to_create[task_id] = progress
+        elif progress.pk is not None:
+            to_update[task_id] = progress
+
+        _apply_progress_item(progress, data, now)
+        applied.append((index, task_id))
+
+    with transaction.atomic():
+        TaskProgress.objects.bulk_create(list(to_create.values()))
+        TaskProgress.objects.bulk_update(
+            list(to_update.values()),
+            ["status", "start_date", "completion_date", "time_spent", "updated_at"],
+        )
+
+    for index, task_id in applied:
+        progress = to_create.get(task_id) or to_update[task_id]
+        results[index] = {
+            "index": index,
+            "task": task_id,
+            "result": "created" if task_id in to_create else "updated",
+            "id": progress.pk,
+            "status": progress.status,
+        }
+
+    if applied:
+        invalidate_progress_caches(
+            user_ids=[user.id],
+            course_ids=[task_courses[task_id] for _, task_id in applied],
+        )
+
+    logger.info(
+        "Bulk progress update for user %s: %s created, %s updated, %s failed",
+        user.id,
+        len(to_create),
+        len(to_update),
+        len(items) - len(applied),
+    )
+    return results
+
+
+def _apply_progress_item(progress, data, now):
+    """Mirror the field rules of ``EnhancedTaskProgressViewSet.update_status``."""
+    status = data["status"]
+
+    # Set start_date when task is started
+    if status == "in_progress" and not progress.start_date:
+        progress.start_date = now
+
+    progress.status = status
+
+    if data.get("completion_date"):
+        progress.completion_date = data["completion_date"]
+    elif status == "completed" and not progress.completion_date:
+        progress.completion_date = now
+
+    if "time_spent" in data:
+        progress.time_spent = data["time_spent"]
+
+    # bulk_update bypasses auto_now, so stamp the row explicitly
+    progress.updated_at = now
+
+
+def _chunks(values, size):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def parse_user_identifiers(text):
+    """
+    Extract user ids/emails from CSV text.
+
+    If the first row is a header containing ``id``, ``user_id`` or ``email``
+    that column is used, otherwise the first column of every row is taken.
+    """
+    rows = [row for row in csv.reader(io.StringIO(text)) if row]
+    if not rows:
+        return []
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    column = 0
+    for name in ("email", "user_id", "id"):
+        if name in header:
+            column = header.index(name)
+            rows = rows[1:]
+            break
+
+    return [
+        row[column].strip()
+        for row in rows
+        if len(row) > column and row[column].strip()
+    ]
+
+
+def resolve_user_identifiers(identifiers, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Map a mixed list of user ids and emails to user ids.
+
+    Lookups run in chunks of ``chunk_size`` so very large cohorts never build
+    a single oversized ``IN (...)`` clause. Returns ``(user_ids, not_found)``.
+    """
+    ids = {}
+    emails = {}
+    not_found = []
+
+    for identifier in identifiers:
+        value = str(identifier).strip()
+        if value.isdigit():
+            ids[int(value)] = value
+        elif "@" in value:
+            emails[value.lower()] = value
+        else:
+            not_found.append(value)
+
+    user_ids = set()
+
+    id_list = list(ids)
+    for chunk in _chunks(id_list, chunk_size):
+        user_ids.update(User.objects.filter(id__in=chunk).values_list("id", flat=True))
+    not_found.extend(ids[i] for i in id_list if i not in user_ids)
+
+    email_list = list(emails)
+    found_emails = set()
+    for chunk in _chunks(email_list, chunk_size):
+        matches = (
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=chunk)
+            .values_list("email_lower", "id")
+        )
+        for email, user_id in matches:
+            found_emails.add(email)
+            user_ids.add(user_id)
+    not_found.extend(emails[e] for e in email_list if e not in found_emails)
+
+    return sorted(user_ids), not_found
+
+
+def bulk_enroll_users(course, identifiers, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Enroll a cohort of users (ids and/or emails) in ``course``.
+
+    Users are resolved in chunks and inserted with one ``bulk_create`` per
+    chunk. A chunk that hits the ``(user, course)`` unique constraint (a
+    concurrent enrollment) is retried row by row, so only rows actually
+    inserted are reported as created.
+
+    Returns a summary dict with created/skipped counts and the identifiers
+    that did not match any user.
+    """
+    user_ids, not_found = resolve_user_identifiers(identifiers, chunk_size)
+
+    already_enrolled = set()
+    for chunk in _chunks(user_ids, chunk_size):
+        already_enrolled.update(
+            CourseEnrollment.objects.filter(
+                course=course, user_id__in=chunk
+            ).values_list("user_id", flat=True)
+        )
+
+    now = timezone.now()
+    new_enrollments = [
+        CourseEnrollment(
+            user_id=user_id, course=course, status="active", enrollment_date=now
+        )
+        for user_id in user_ids
+        if user_id not in already_enrolled
+    ]
+
+    created = []
+    skipped = len(already_enrolled)
+    with transaction.atomic():
+        for chunk in _chunks(new_enrollments, chunk_size):
+            try:
+                with transaction.atomic():
+                    CourseEnrollment.objects.bulk_create(chunk)
+                created.extend(chunk)
+                continue
+            except IntegrityError:
+                pass
+            for enrollment in chunk:
+                try:
+                    with transaction.atomic():
+                        CourseEnrollment.objects.bulk_create(
+                            [
+                                CourseEnrollment(
+                                    user_id=enrollment.user_id,
+                                    course=course,
+                                    status="active",
+                                    enrollment_date=now,
+                                )
+                            ]
+                        )
+                    created.append(enrollment)
+                except IntegrityError:
+                    skipped += 1
+
+    if created:
+        # bulk_create sends no post_save signals
+        invalidate_enrollment_cache([enrollment.user_id for enrollment in created])
+        invalidate_progress_caches(
+            user_ids=[enrollment.user_id for enrollment in created],
+            course_ids=[course.id],
+        )
+
+    logger.info(
+        "Bulk enrollment into course %s: %s created, %s skipped, %s not found",
+        course.id,
+        len(created),
+        skipped,
+        len(not_found),
+    )
+    return {
+        "course": course.id,
+        "created": len(created),
+        "skipped": skipped,
+        "not_found": not_found,
+    }
+
+
+def _init_hash_worker():
+    # Spawned workers start without Django configured
+    if not apps.ready:
+        django.setup()
+
+
+def hash_passwords(passwords, workers=None, processes=False):
+    """
+    Hash plaintext passwords with the configured hasher.
+
+    Large batches are spread over a pool since each hash is deliberately
+    CPU-expensive; small batches are hashed inline. ``processes=True`` (for
+    management commands) uses a process pool; otherwise a thread pool of at
+    most ``MAX_REQUEST_HASH_THREADS`` is used, which still overlaps hashes
+    as the PBKDF2 hasher releases the GIL.
+    """
+    if processes:
+        if workers is None:
+            workers = getattr(
+                settings, "USER_PROVISIONING_HASH_WORKERS", os.cpu_count() or 1
+            )
+    else:
+        workers = min(workers or MAX_REQUEST_HASH_THREADS, MAX_REQUEST_HASH_THREADS)
+
+    if workers <= 1 or len(passwords) < MIN_PASSWORDS_FOR_POOL:
+        return [make_password(password) for password in passwords]
+
+    if not processes:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(make_password, passwords))
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_hash_worker
+    ) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def bulk_provision_users(
+    entries, batch_size=DEFAULT_CHUNK_SIZE, workers=None, processes=False
+):
+    """
+    Create many user accounts with ``bulk_create``.
+
+    Each entry picks one password mode: ``sso`` (or no password at all)
+    stores an unusable password, ``password_hash`` is stored as-is after its
+    format is recognised, and ``password`` is hashed (see ``hash_passwords``
+    for ``workers`` and ``processes``). Accounts whose username or email
+    already exists are skipped rather than failing the batch.
+
+    Returns a summary dict with the created count and per-entry skips/errors.
+    """
+    errors = []
+    valid = []
+
+    for index, entry in enumerate(entries):
+        serializer = UserProvisionSerializer(data=entry)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({"index": index, "errors": serializer.errors})
+
+    for _, data in valid:
+        data["email"] = User.objects.normalize_email(data["email"])
+
+    # Find clashes with existing accounts in chunked lookups
+    usernames = [data["username"] for _, data in valid]
+    emails = [data["email"].lower() for _, data in valid]
+    taken_usernames = set()
+    taken_emails = set()
+    for chunk in _chunks(usernames, batch_size):
+        taken_usernames.update(
+            User.objects.filter(username__in=chunk).values_list("username", flat=True)
+        )
+    for chunk in _chunks(emails, batch_size):
+        taken_emails.update(
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=chunk)
+            .values_list("email_lower", flat=True)
+        )
+
+    skipped = []
+    accepted = []
+    for index, data in valid:
+        email = data["email"].lower()
+        if data["username"] in taken_usernames:
+            reason = "username exists"
+        elif email in taken_emails:
+            reason = "email exists"
+        else:
+            reason = None
+
+        if reason:
+            skipped.append(
+                {"index": index, "username": data["username"], "reason": reason}
+            )
+        else:
+            # Also guards against duplicates within the same batch
+            taken_usernames.add(data["username"])
+            taken_emails.add(email)
+            accepted.append(data)
+
+    plaintext = [data for data in accepted if data.get("password")]
+    for data, hashed in zip(
+        plaintext,
+        hash_passwords(
+            [data["password"] for data in plaintext], workers, processes=processes
+        ),
+    ):
+        data["password_hash"] = hashed
+
+    users = []
+    for data in accepted:
+        user = User(
+            username=data["username"],
+            email=data["email"],
+            display_name=data.get("display_name", ""),
+            first_name=data.get("first_name", ""),
+            last_name=data.get("last_name", ""),
+            role=data["role"],
+        )
+        if data.get("password_hash"):
+            user.password = data["password_hash"]
+        else:
+            user.set_unusable_password()
+        users.append(user)
+
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=batch_size)
+
+    logger.info(
+        "Bulk user provisioning: %s created (%s hashed), %s skipped, %s invalid",
+        len(users),
+        len(plaintext),
+        len(skipped),
+        len(errors),
+    )
+    return {"created": len(users), "skipped": skipped, "errors": errors}
@@ -0,0 +1,271 @@
+import hashlib
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import CourseEnrollment, QuizOption, QuizQuestion, User
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+
+def cache_is_shared():
+    """
+    Whether the default cache is shared by every worker process.
+
+    Signal handlers only invalidate the cache of the process that handled the
+    write, so values that must never be stale in other processes are only
+    kept across requests when this is true (``SHARED_CACHE`` setting).
+    """
+    return getattr(settings, "SHARED_CACHE", False)
+
+
+def course_analytics_key(course_id):
+    return f"course_analytics_{course_id}"
+
+
+def course_task_analytics_key(course_id):
+    return f"course_task_analytics_{course_id}"
+
+
+def course_category_performance_key(course_id):
+    return f"course_category_performance_{course_id}"
+
+
+def progress_matrix_key(course_id):
+    return f"progress_matrix_{course_id}"
+
+
+def quiz_scores_key(quiz_id):
+    return f"quiz_scores_{quiz_id}"
+
+
+def quiz_responses_key(quiz_id):
+    return f"quiz_responses_{quiz_id}"
+
+
+def student_progress_key(user_id):
+    return f"student_progress_{user_id}"
+
+
+def student_quiz_performance_key(user_id):
+    return f"student_quiz_performance_{user_id}"
+
+
+def invalidate_progress_caches(user_ids=(), course_ids=()):
+    """
+    Drop the cached analytics payloads that depend on task progress.
+
+    Bulk writes call this once per batch instead of once per row, so the
+    number of cache round trips does not grow with the batch size.
+    """
+    keys = [student_progress_key(user_id) for user_id in set(user_ids)]
+    for course_id in set(course_ids):
+        keys.append(course_analytics_key(course_id))
+        keys.append(course_task_analytics_key(course_id))
+        keys.append(progress_matrix_key(course_id))
+
+    if keys:
+        cache.delete_many(keys)
+        logger.debug("Invalidated %s progress cache keys", len(keys))
+
+
+def invalidate_progress_matrices(course_ids):
+    cache.delete_many([progress_matrix_key(course_id) for course_id in set(course_ids)])
+
+
+def invalidate_quiz_scores(quiz_ids):
+    """Drop the cached score and response arrays of the quizzes."""
+    keys = []
+    for quiz_id in set(quiz_ids):
+        keys.append(quiz_scores_key(quiz_id))
+        keys.append(quiz_responses_key(quiz_id))
+    cache.delete_many(keys)
+
+
+def user_cache_key(user_id):
+    return f"auth_user_{user_id}"
+
+
+def get_cached_user(user_id):
+    """
+    Return the ``User`` row for ``user_id``, served from the cache when possible.
+
+    Rows are kept for ``AUTH_USER_CACHE_TIMEOUT`` seconds and dropped by the
+    ``post_save``/``post_delete`` handlers in ``core.signals``.
+    Raises ``User.DoesNotExist`` like a normal lookup.
+    """
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.get(pk=user_id)
+        cache.set(key, user, getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60))
+    return user
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def deactivated_user_key(user_id):
+    return f"auth_user_deactivated_{user_id}"
+
+
+def set_user_deactivated(user_id, deactivated):
+    """
+    Flag a deactivated or deleted user for as long as access tokens issued
+    before that remain valid, so claims-only authentication rejects them.
+    """
+    key = deactivated_user_key(user_id)
+    if deactivated:
+        cache.set(key, True, int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()))
+    else:
+        cache.delete(key)
+
+
+def is_user_deactivated(user_id):
+    """
+    Whether ``user_id`` may no longer authenticate, without a query when the
+    cache is shared. A process-local cache would miss deactivations handled
+    by other processes, so the (short-lived) cached user row is checked
+    instead.
+    """
+    if cache_is_shared():
+        return bool(cache.get(deactivated_user_key(user_id)))
+    try:
+        return not get_cached_user(user_id).is_active
+    except User.DoesNotExist:
+        return True
+
+
+def user_enrollments_key(user_id):
+    return f"user_enrollments_{user_id}"
+
+
+def get_enrolled_course_ids(user_id, request=None):
+    """
+    Return the set of course ids ``user_id`` is enrolled in.
+
+    The set is memoised on ``request`` so permission classes and the view
+    share one lookup. With a shared cache it is also cached across requests
+    for ``ENROLLMENT_CACHE_TIMEOUT`` seconds; ``core.signals`` and the bulk
+    enrollment import drop the cached set whenever enrollments change.
+    """
+    memo = None
+    if request is not None:
+        memo = getattr(request, "_enrolled_course_ids", None)
+        if memo is None:
+            memo = {}
+            request._enrolled_course_ids = memo
+        if user_id in memo:
+            return memo[user_id]
+
+    shared = cache_is_shared()
+    key = user_enrollments_key(user_id)
+    course_ids = cache.get(key) if shared else None
+    if course_ids is None:
+        course_ids = frozenset(
+            CourseEnrollment.objects.filter(user_id=user_id).values_list(
+                "course_id", flat=True
+            )
+        )
+        if shared:
+            cache.set(
+                key, course_ids, getattr(settings, "ENROLLMENT_CACHE_TIMEOUT", 300)
+            )
+
+    if memo is not None:
+        memo[user_id] = course_ids
+    return course_ids
+
+
+def is_enrolled(user_id, course_id, request=None):
+    """Check enrollment against the cached enrollment set."""
+    try:
+        course_id = int(course_id)
+    except (TypeError, ValueError):
+        return False
+    return course_id in get_enrolled_course_ids(user_id, request)
+
+
+def invalidate_enrollment_cache(user_ids):
+    cache.delete_many([user_enrollments_key(user_id) for user_id in set(user_ids)])
+
+
+QUIZ_CONTENT_GENERATION_KEY = "quiz_content_generation"
+
+# Seconds quiz digests live in a cache that is private to each process, where
+# other processes' invalidations are never seen and stale 304s must be short
+UNSHARED_QUIZ_CONTENT_TIMEOUT = 30
+
+
+def quiz_content_cache_timeout():
+    if not cache_is_shared():
+        return UNSHARED_QUIZ_CONTENT_TIMEOUT
+    return getattr(settings, "QUIZ_CONTENT_CACHE_TIMEOUT", 60 * 60)
+
+
+def quiz_content_hash_key(quiz_id):
+    return f"quiz_content_hash_{quiz_id}"
+
+
+def get_quiz_content_hash(quiz_id):
+    """
+    Return a digest of a quiz's questions, options and question tags.
+
+    Questions and options carry no ``updated_at``, so conditional requests on
+    quizzes use this digest instead. It is cached until ``core.signals``
+    reports a question or option change, or ``quiz_content_cache_timeout()``
+    passes.
+    """
+    key = quiz_content_hash_key(quiz_id)
+    digest = cache.get(key)
+    if digest is None:
+        question_rows = list(
+            QuizQuestion.objects.filter(quiz_id=quiz_id)
+            .order_by("id")
+            .values_list("id", "text", "explanation", "points", "order")
+        )
+        option_rows = list(
+            QuizOption.objects.filter(question__quiz_id=quiz_id)
+            .order_by("id")
+            .values_list(
+                "id", "question_id", "text", "is_correct", "order", "explanation"
+            )
+        )
+        tag_rows = list(
+            QuizQuestion.tags.through.objects.filter(quizquestion__quiz_id=quiz_id)
+            .order_by("quizquestion_id", "questiontag__name")
+            .values_list("quizquestion_id", "questiontag__name")
+        )
+        content = repr((question_rows, option_rows, tag_rows)).encode("utf-8")
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        cache.set(key, digest, quiz_content_cache_timeout())
+    return digest
+
+
+def get_quiz_content_generation():
+    """
+    Return an id that changes whenever any quiz's questions or options change.
+
+    Used by quiz list ETags, which cannot afford a digest per listed quiz.
+    """
+    generation = cache.get(QUIZ_CONTENT_GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(
+            QUIZ_CONTENT_GENERATION_KEY, generation, quiz_content_cache_timeout()
+        ):
+            generation = cache.get(QUIZ_CONTENT_GENERATION_KEY)
+    return generation
+
+
+def invalidate_quiz_content(quiz_id=None):
+    if quiz_id is not None:
+        cache.delete(quiz_content_hash_key(quiz_id))
+    cache.set(
+        QUIZ_CONTENT_GENERATION_KEY, uuid.uuid4().hex, quiz_content_cache_timeout()
+    )
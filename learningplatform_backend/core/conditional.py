@@ -0,0 +1,119 @@
+"""
+HTTP conditional GET support (ETag / Last-Modified) for content viewsets.
+"""
+
+import hashlib
+import logging
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .caching import get_quiz_content_generation, get_quiz_content_hash
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(value):
+    return int(value.timestamp()) if value is not None else None
+
+
+class ConditionalGetMixin:
+    """
+    Adds ``ETag`` validators to ``retrieve`` and ``list``, and a
+    ``Last-Modified`` validator to ``retrieve``.
+
+    Validators come from ``last_modified_field`` (the object's value, or the
+    newest value plus the row count for lists), the request path and the
+    negotiated media type. A request whose ``If-None-Match`` or
+    ``If-Modified-Since`` still matches gets a 304 without running the
+    serializer. Subclasses add content that is not covered by the timestamp
+    through ``get_object_etag_parts`` / ``get_list_etag_parts``.
+
+    Lists send no ``Last-Modified``: deleting a row does not advance the
+    newest timestamp, so ``If-Modified-Since`` alone would keep matching.
+    """
+
+    last_modified_field = "updated_at"
+    # Whether the timestamp changes with everything the object response shows
+    timestamp_covers_object = True
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = getattr(instance, self.last_modified_field)
+        etag = self._make_etag(
+            last_modified.isoformat(), *self.get_object_etag_parts(instance)
+        )
+        return self._conditional_response(
+            etag,
+            last_modified if self.timestamp_covers_object else None,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.order_by().aggregate(
+            last_modified=Max(self.last_modified_field), count=Count("pk")
+        )
+        last_modified = stats["last_modified"]
+        etag = self._make_etag(
+            last_modified.isoformat() if last_modified else "",
+            stats["count"],
+            *self.get_list_etag_parts(queryset),
+        )
+        return self._conditional_response(
+            etag,
+            None,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def get_object_etag_parts(self, instance):
+        return ()
+
+    def get_list_etag_parts(self, queryset):
+        return ()
+
+    def _make_etag(self, *parts):
+        request = self.request
+        key = "|".join(
+            str(part)
+            for part in (
+                request.get_full_path(),
+                request.accepted_media_type,
+                *parts,
+            )
+        )
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return f'"{digest}"'
+
+    def _conditional_response(self, etag, last_modified, build_response):
+        last_modified = _timestamp(last_modified)
+        response = get_conditional_response(
+            self.request._request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = build_response()
+
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        # Clients may keep the content but must revalidate it before reuse
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class QuizConditionalGetMixin(ConditionalGetMixin):
+    """
+    Conditional GET for quizzes, whose questions and options change without
+    touching the quiz's ``updated_at``, so only the ETag covers them.
+    """
+
+    timestamp_covers_object = False
+
+    def get_object_etag_parts(self, instance):
+        return (get_quiz_content_hash(instance.pk),)
+
+    def get_list_etag_parts(self, queryset):
+        return (get_quiz_content_generation(),)
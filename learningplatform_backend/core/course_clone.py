@@ -0,0 +1,188 @@
+"""
+Clone or import a whole course tree with bulk inserts.
+
+Both operations work on the snapshot format of
+``core.course_content.build_course_snapshot``: a live course is snapshotted
+first (five queries), a ``CourseVersion`` already holds one. The tree is
+then written in one transaction with one insert per table (per batch):
+course, learning tasks, quiz tasks, questions, options and question tags,
+with foreign keys remapped in memory.
+"""
+
+import logging
+
+from django.db import connections, router, transaction
+
+from .course_content import build_course_snapshot
+from .serializers import CourseSnapshotSerializer
+from .models import (
+    Course,
+    LearningTask,
+    QuestionTag,
+    QuizOption,
+    QuizQuestion,
+    QuizTask,
+)
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+COURSE_FIELDS = (
+    "title",
+    "description",
+    "status",
+    "visibility",
+    "learning_objectives",
+    "prerequisites",
+)
+QUIZ_FIELDS = (
+    "time_limit_minutes",
+    "pass_threshold",
+    "max_attempts",
+    "randomize_questions",
+)
+
+
+class CourseImportError(ValueError):
+    """Raised when a snapshot does not describe a valid course tree."""
+
+
+def _insert_quiz_children(quizzes):
+    """
+    Insert the ``QuizTask`` rows of already created ``LearningTask`` parents.
+
+    ``bulk_create`` refuses multi-table inherited models, so the child table
+    rows are inserted directly, batched like ``bulk_create`` would.
+    """
+    if not quizzes:
+        return
+    db = router.db_for_write(QuizTask)
+    fields = QuizTask._meta.local_concrete_fields
+    ops = connections[db].ops
+    batch_size = ops.bulk_batch_size(fields, quizzes) or len(quizzes)
+    for start in range(0, len(quizzes), batch_size):
+        QuizTask._base_manager._insert(
+            quizzes[start : start + batch_size], fields=fields, using=db, raw=True
+        )
+
+
+def _tag_questions(questions, question_entries):
+    """Attach the snapshot's tag names, creating tags that do not exist yet."""
+    names = {
+        name for entry in question_entries for name in entry.get("tags", [])
+    }
+    if not names:
+        return
+    QuestionTag.objects.bulk_create(
+        [QuestionTag(name=name) for name in names], ignore_conflicts=True
+    )
+    tag_ids = dict(
+        QuestionTag.objects.filter(name__in=names).values_list("name", "id")
+    )
+    Through = QuizQuestion.tags.through
+    Through.objects.bulk_create(
+        Through(quizquestion_id=question.pk, questiontag_id=tag_ids[name])
+        for question, entry in zip(questions, question_entries)
+        for name in set(entry.get("tags", []))
+    )
+
+
+def import_course_snapshot(snapshot, creator, **overrides):
+    """
+    Create a new course owned by ``creator`` from a course snapshot.
+
+    ``overrides`` replace course metadata such as ``title`` or ``status``.
+    Returns ``(course, counts)``; raises ``CourseImportError`` for snapshots
+    that fail validation.
+    """
+    overrides = {key: value for key, value in overrides.items() if value is not None}
+    if overrides and isinstance(snapshot, dict) and isinstance(
+        snapshot.get("course"), dict
+    ):
+        snapshot = {**snapshot, "course": {**snapshot["course"], **overrides}}
+
+    # bulk_create and _insert skip model validation, so check the whole tree
+    # (field types, validators, choices) before writing anything
+    serializer = CourseSnapshotSerializer(data=snapshot)
+    if not serializer.is_valid():
+        raise CourseImportError(f"Invalid course snapshot: {serializer.errors}")
+    metadata = {
+        field: serializer.validated_data["course"].get(field, "")
+        for field in COURSE_FIELDS
+    }
+    task_entries = serializer.validated_data["tasks"]
+
+    try:
+        with transaction.atomic():
+            course = Course.objects.create(creator=creator, **metadata)
+
+            tasks = LearningTask.objects.bulk_create(
+                LearningTask(
+                    course=course,
+                    title=entry["title"],
+                    description=entry.get("description", ""),
+                    order=entry.get("order", 0),
+                    is_published=entry.get("is_published", False),
+                    task_type="quiz" if entry.get("quiz") is not None else "task",
+                )
+                for entry in task_entries
+            )
+
+            quiz_entries = []
+            quizzes = []
+            for task, entry in zip(tasks, task_entries):
+                quiz = entry.get("quiz")
+                if quiz is None:
+                    continue
+                quiz_task = QuizTask(
+                    learningtask_ptr_id=task.pk,
+                    **{field: quiz[field] for field in QUIZ_FIELDS if field in quiz},
+                )
+                quizzes.append(quiz_task)
+                quiz_entries.append(quiz)
+            _insert_quiz_children(quizzes)
+
+            question_entries = []
+            questions = []
+            for quiz_task, quiz in zip(quizzes, quiz_entries):
+                for question in quiz.get("questions", []):
+                    questions.append(
+                        QuizQuestion(
+                            quiz_id=quiz_task.learningtask_ptr_id,
+                            text=question["text"],
+                            explanation=question.get("explanation", ""),
+                            points=question.get("points", 1),
+                            order=question.get("order", 0),
+                        )
+                    )
+                    question_entries.append(question)
+            questions = QuizQuestion.objects.bulk_create(questions)
+
+            options = QuizOption.objects.bulk_create(
+                QuizOption(
+                    question_id=question.pk,
+                    text=option["text"],
+                    is_correct=option.get("is_correct", False),
+                    order=option.get("order", 0),
+                    explanation=option.get("explanation", ""),
+                )
+                for question, entry in zip(questions, question_entries)
+                for option in entry.get("options", [])
+            )
+            _tag_questions(questions, question_entries)
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        raise CourseImportError(f"Invalid course snapshot: {e}")
+
+    counts = {
+        "tasks": len(tasks),
+        "quizzes": len(quizzes),
+        "questions": len(questions),
+        "options": len(options),
+    }
+    logger.info("Imported course %s with %s", course.id, counts)
+    return course, counts
+
+
+def clone_course(course, creator, **overrides):
+    """Copy ``course`` and its whole task/quiz tree to a new course."""
+    return import_course_snapshot(build_course_snapshot(course), creator, **overrides)
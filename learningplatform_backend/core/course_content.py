@@ -0,0 +1,232 @@
+"""
+Course content snapshots and the immutable student bundles built from them.
+
+Publishing a course stores the full content tree (including quiz answers) as
+a new ``CourseVersion`` snapshot, and compiles the student-facing part of it
+into a gzip-compressed ``CourseContentBundle`` addressed by its checksum.
+Bundles never change once written, so they are served with long-lived cache
+headers and kept in the cache, leaving the relational tables untouched on
+student reads.
+"""
+
+import copy
+import gzip
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+
+from .course_versions import create_course_version
+from .models import (
+    Course,
+    CourseContentBundle,
+    CourseVersion,
+    LearningTask,
+    QuizOption,
+    QuizQuestion,
+    QuizTask,
+)
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Keys removed from the student bundle because they reveal answers
+ANSWER_KEYS = {"is_correct", "explanation"}
+
+
+def content_bundle_key(checksum):
+    return f"course_content_bundle_{checksum}"
+
+
+def course_content_pointer_key(course_id):
+    return f"course_content_pointer_{course_id}"
+
+
+def build_course_snapshot(course):
+    """
+    Return the full content tree of ``course`` as plain JSON data.
+
+    Tasks are ordered like the course page shows them; quizzes carry their
+    settings, questions (with tag names) and options (with answers). Runs
+    five queries regardless of the course size.
+    """
+    tasks = list(
+        LearningTask.objects.filter(course=course)
+        .order_by("order", "id")
+        .values("id", "title", "description", "order", "is_published", "task_type")
+    )
+    quizzes = {
+        quiz["learningtask_ptr_id"]: quiz
+        for quiz in QuizTask.objects.filter(course=course).values(
+            "learningtask_ptr_id",
+            "time_limit_minutes",
+            "pass_threshold",
+            "max_attempts",
+            "randomize_questions",
+        )
+    }
+    questions = {}
+    for question in (
+        QuizQuestion.objects.filter(quiz__course=course)
+        .order_by("order", "id")
+        .values("id", "quiz_id", "text", "explanation", "points", "order")
+    ):
+        question["tags"] = []
+        question["options"] = []
+        questions.setdefault(question.pop("quiz_id"), []).append(question)
+    questions_by_id = {
+        question["id"]: question
+        for quiz_questions in questions.values()
+        for question in quiz_questions
+    }
+    for option in (
+        QuizOption.objects.filter(question__quiz__course=course)
+        .order_by("order", "id")
+        .values("id", "question_id", "text", "is_correct", "order", "explanation")
+    ):
+        questions_by_id[option.pop("question_id")]["options"].append(option)
+    for question_id, tag in (
+        QuizQuestion.tags.through.objects.filter(quizquestion__quiz__course=course)
+        .order_by("questiontag__name")
+        .values_list("quizquestion_id", "questiontag__name")
+    ):
+        questions_by_id[question_id]["tags"].append(tag)
+
+    for task in tasks:
+        task["type"] = task.pop("task_type")
+        quiz = quizzes.get(task["id"])
+        if quiz:
+            quiz.pop("learningtask_ptr_id")
+            quiz["questions"] = questions.get(task["id"], [])
+            task["quiz"] = quiz
+
+    return {
+        "course": {
+            "id": course.id,
+            "title": course.title,
+            "description": course.description,
+            "version": course.version,
+            "status": course.status,
+            "visibility": course.visibility,
+            "learning_objectives": course.learning_objectives,
+            "prerequisites": course.prerequisites,
+        },
+        "tasks": tasks,
+    }
+
+
+def build_student_content(snapshot, version_number):
+    """
+    Derive the student-facing document from a full snapshot: published tasks
+    only and quiz questions without answers or explanations.
+    """
+    content = copy.deepcopy(snapshot)
+    content["version"] = version_number
+    content["tasks"] = [task for task in content["tasks"] if task["is_published"]]
+    for task in content["tasks"]:
+        for question in task.get("quiz", {}).get("questions", []):
+            for key in ANSWER_KEYS:
+                question.pop(key, None)
+            for option in question["options"]:
+                for key in ANSWER_KEYS:
+                    option.pop(key, None)
+    return content
+
+
+def encode_bundle(content):
+    """Return ``(checksum, gzip_bytes, size)`` for a student document."""
+    raw = json.dumps(
+        content, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    # mtime=0 keeps the compressed bytes deterministic
+    return hashlib.sha256(raw).hexdigest(), gzip.compress(raw, mtime=0), len(raw)
+
+
+def publish_course_version(course, user=None, notes=""):
+    """
+    Snapshot ``course`` as its next ``CourseVersion`` and compile its bundle.
+    """
+    snapshot = build_course_snapshot(course)
+
+    with transaction.atomic():
+        # Lock the course so concurrent publishes get distinct version numbers
+        Course.objects.select_for_update().only("pk").get(pk=course.pk)
+        last_number = (
+            CourseVersion.objects.filter(course=course).aggregate(
+                last=Max("version_number")
+            )["last"]
+            or 0
+        )
+        version = create_course_version(
+            course, last_number + 1, snapshot, notes=notes, created_by=user
+        )
+        checksum, content, size = encode_bundle(
+            build_student_content(snapshot, version.version_number)
+        )
+        bundle = CourseContentBundle.objects.create(
+            course=course,
+            version=version,
+            checksum=checksum,
+            content=content,
+            size=size,
+        )
+
+    cache.delete(course_content_pointer_key(course.id))
+    logger.info(
+        "Published course %s version %s as bundle %s (%s bytes)",
+        course.id,
+        version.version_number,
+        checksum,
+        size,
+    )
+    return bundle
+
+
+def _bundle_timeout():
+    return getattr(settings, "CONTENT_BUNDLE_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def get_content_bundle(checksum):
+    """
+    Return ``{"course_id", "content"}`` for a bundle, or None if unknown.
+    """
+    key = content_bundle_key(checksum)
+    bundle = cache.get(key)
+    if bundle is None:
+        row = (
+            CourseContentBundle.objects.filter(checksum=checksum)
+            .values("course_id", "content")
+            .first()
+        )
+        if row is None:
+            return None
+        bundle = {"course_id": row["course_id"], "content": bytes(row["content"])}
+        cache.set(key, bundle, _bundle_timeout())
+    return bundle
+
+
+def get_course_content_pointer(course_id):
+    """
+    Return ``{"version", "checksum"}`` of a course's latest bundle, or None.
+    """
+    key = course_content_pointer_key(course_id)
+    pointer = cache.get(key)
+    if pointer is None:
+        row = (
+            CourseContentBundle.objects.filter(course_id=course_id)
+            .order_by("-version__version_number")
+            .values("version__version_number", "checksum")
+            .first()
+        )
+        if row is None:
+            return None
+        pointer = {
+            "version": row["version__version_number"],
+            "checksum": row["checksum"],
+        }
+        cache.set(key, pointer, _bundle_timeout())
+    return pointer
@@ -0,0 +1,236 @@
+"""
+Compact storage for ``CourseVersion`` content snapshots.
+
+Every ``COURSE_VERSION_CHECKPOINT_INTERVAL`` versions a full snapshot is
+stored (a checkpoint). The versions in between only store a zlib-compressed
+JSON patch against the previous version. ``get_version_snapshot`` rebuilds
+any version from its nearest checkpoint in two queries and caches the
+result; versions are immutable, so cached snapshots never go stale.
+
+Patches are JSON lists:
+
+* ``["r", value]`` replaces the value,
+* ``["d", {key: value}, [removed keys], {key: patch}]`` edits a dict,
+* ``["l", {index: patch}]`` edits a list of unchanged length.
+"""
+
+import json
+import logging
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from rest_framework.exceptions import ValidationError
+
+from .models import CourseVersion
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+
+def version_snapshot_key(version_id):
+    return f"course_version_snapshot_{version_id}"
+
+
+def json_diff(old, new):
+    """Return a patch turning ``old`` into ``new``, or None if they are equal."""
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {}
+        nested = {}
+        for key, value in new.items():
+            if key not in old:
+                changed[key] = value
+            else:
+                patch = json_diff(old[key], value)
+                if patch is not None:
+                    nested[key] = patch
+        removed = [key for key in old if key not in new]
+        return ["d", changed, removed, nested]
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        items = {}
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            patch = json_diff(old_item, new_item)
+            if patch is not None:
+                items[str(index)] = patch
+        return ["l", items]
+    return ["r", new]
+
+
+def json_patch(document, patch):
+    """Apply a ``json_diff`` patch, returning the patched document."""
+    kind = patch[0]
+    if kind == "r":
+        return patch[1]
+    if kind == "d":
+        _, changed, removed, nested = patch
+        result = {key: value for key, value in document.items() if key not in removed}
+        for key, sub_patch in nested.items():
+            result[key] = json_patch(document[key], sub_patch)
+        result.update(changed)
+        return result
+    if kind == "l":
+        result = list(document)
+        for index, sub_patch in patch[1].items():
+            result[int(index)] = json_patch(result[int(index)], sub_patch)
+        return result
+    raise ValueError(f"Unknown snapshot patch type: {kind!r}")
+
+
+def _encode(patch):
+    return zlib.compress(json.dumps(patch, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode(data):
+    return json.loads(zlib.decompress(bytes(data)))
+
+
+def _checkpoint_interval():
+    return max(1, getattr(settings, "COURSE_VERSION_CHECKPOINT_INTERVAL", 10))
+
+
+def create_course_version(course, version_number, snapshot, notes="", created_by=None):
+    """
+    Store a new version of ``course``, as a checkpoint or a delta.
+
+    Version numbers must increase, since each delta is relative to the
+    version before it.
+    """
+    with transaction.atomic():
+        previous = (
+            CourseVersion.objects.select_for_update()
+            .filter(course=course)
+            .order_by("-version_number")
+            .only("id", "version_number", "is_checkpoint")
+            .first()
+        )
+        if previous is not None and version_number <= previous.version_number:
+            raise ValidationError(
+                {
+                    "version_number": (
+                        f"Must be greater than the latest version "
+                        f"({previous.version_number})."
+                    )
+                }
+            )
+
+        version = CourseVersion(
+            course=course,
+            version_number=version_number,
+            notes=notes,
+            created_by=created_by,
+        )
+        delta = None
+        if previous is not None and not _checkpoint_due(course):
+            # An unchanged snapshot is stored as a null patch
+            delta = _encode(json_diff(get_version_snapshot(previous), snapshot))
+            # A delta that does not save space is not worth the rebuild cost
+            if len(delta) >= len(_encode(["r", snapshot])):
+                delta = None
+
+        if delta is None:
+            version.is_checkpoint = True
+            version.content_snapshot = snapshot
+        else:
+            version.is_checkpoint = False
+            version.snapshot_delta = delta
+        version.save()
+
+    cache.set(version_snapshot_key(version.id), snapshot, _snapshot_timeout())
+    return version
+
+
+def _checkpoint_due(course):
+    """True once ``interval`` versions have passed since the last checkpoint."""
+    last_checkpoint = CourseVersion.objects.filter(
+        course=course, is_checkpoint=True
+    ).aggregate(number=Max("version_number"))["number"]
+    if last_checkpoint is None:
+        return True
+    since = CourseVersion.objects.filter(
+        course=course, version_number__gt=last_checkpoint
+    ).count()
+    return since + 1 >= _checkpoint_interval()
+
+
+def _snapshot_timeout():
+    return getattr(settings, "COURSE_VERSION_SNAPSHOT_CACHE_TIMEOUT", 60 * 60)
+
+
+def get_version_snapshot(version):
+    """
+    Return the full content snapshot of ``version``.
+
+    Checkpoints return their stored snapshot; deltas are rebuilt from the
+    nearest earlier checkpoint and cached.
+    """
+    loaded = "content_snapshot" not in version.get_deferred_fields()
+    if version.is_checkpoint and loaded:
+        return version.content_snapshot
+
+    key = version_snapshot_key(version.pk)
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    versions = CourseVersion.objects.filter(course_id=version.course_id)
+    checkpoint = (
+        versions.filter(
+            is_checkpoint=True, version_number__lte=version.version_number
+        )
+        .order_by("-version_number")
+        .values("version_number", "content_snapshot")
+        .first()
+    )
+    if checkpoint is None:
+        raise CourseVersion.DoesNotExist(
+            f"No checkpoint found for course version {version.pk}"
+        )
+
+    snapshot = checkpoint["content_snapshot"]
+    deltas = (
+        versions.filter(
+            version_number__gt=checkpoint["version_number"],
+            version_number__lte=version.version_number,
+        )
+        .order_by("version_number")
+        .values_list("snapshot_delta", flat=True)
+    )
+    for delta in deltas:
+        patch = _decode(delta)
+        if patch is not None:
+            snapshot = json_patch(snapshot, patch)
+
+    cache.set(key, snapshot, _snapshot_timeout())
+    return snapshot
+
+
+def delete_course_version(version):
+    """
+    Delete a version, first turning the next version into a checkpoint if it
+    is stored as a delta against this one.
+    """
+    version_id = version.pk
+    with transaction.atomic():
+        following = (
+            CourseVersion.objects.select_for_update()
+            .filter(
+                course_id=version.course_id,
+                version_number__gt=version.version_number,
+            )
+            .order_by("version_number")
+            .first()
+        )
+        if following is not None and not following.is_checkpoint:
+            following.content_snapshot = get_version_snapshot(following)
+            following.snapshot_delta = None
+            following.is_checkpoint = True
+            following.save(
+                update_fields=["content_snapshot", "snapshot_delta", "is_checkpoint"]
+            )
+        version.delete()
+
+    cache.delete(version_snapshot_key(version_id))
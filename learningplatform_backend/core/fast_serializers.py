@@ -0,0 +1,236 @@
+"""
+Read-only "compiled" serializers for hot list endpoints.
+
+A ``CompiledSerializer`` is declared once with the output layout of an
+existing DRF serializer and renders each row straight from a
+``values_list()`` query, skipping model instantiation and DRF's per-field
+machinery. Output matches the DRF serializers field for field (see
+``core/tests/test_fast_serializers.py``), so list endpoints can switch to it
+transparently through ``FastListMixin``.
+"""
+
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.duration import duration_string
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+_drf_datetime = serializers.DateTimeField()
+
+_VALUE = 0
+_NESTED = 1
+_COMPUTED = 2
+
+
+def format_datetime(value):
+    """Render a datetime exactly like ``serializers.DateTimeField``."""
+    if not value:
+        return None
+    if not settings.USE_TZ or api_settings.DATETIME_FORMAT != ISO_8601:
+        return _drf_datetime.to_representation(value)
+
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def format_duration(value):
+    """Render a timedelta exactly like ``serializers.DurationField``."""
+    return duration_string(value)
+
+
+class Computed:
+    """An output value computed from one or more looked-up columns."""
+
+    def __init__(self, func, *lookups):
+        self.func = func
+        self.lookups = lookups
+
+
+class CompiledSerializer:
+    """
+    Serializer that renders ``values_list()`` rows into plain dicts.
+
+    ``fields`` is a sequence of ``(name, spec)`` pairs. ``spec`` is either a
+    lookup (``"user__email"``), a ``(lookup, formatter)`` pair, a nested
+    sequence of pairs (rendered as a nested dict) or a ``Computed``. The
+    lookups are gathered into a single ``values_list()`` call and each row is
+    rendered from precomputed column indexes.
+    """
+
+    def __init__(self, fields):
+        self.lookups = []
+        self._plan = self._compile(fields)
+
+    def _column(self, lookup):
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        return self.lookups.index(lookup)
+
+    def _compile(self, fields):
+        plan = []
+        for name, spec in fields:
+            if isinstance(spec, Computed):
+                columns = tuple(self._column(lookup) for lookup in spec.lookups)
+                plan.append((name, _COMPUTED, (spec.func, columns)))
+            elif isinstance(spec, list):
+                plan.append((name, _NESTED, self._compile(spec)))
+            else:
+                lookup, formatter = spec if isinstance(spec, tuple) else (spec, None)
+                plan.append((name, _VALUE, (self._column(lookup), formatter)))
+        return plan
+
+    def _render(self, plan, row):
+        data = {}
+        for name, kind, arg in plan:
+            if kind == _VALUE:
+                index, formatter = arg
+                value = row[index]
+                if formatter is not None and value is not None:
+                    value = formatter(value)
+                data[name] = value
+            elif kind == _NESTED:
+                data[name] = self._render(arg, row)
+            else:
+                func, columns = arg
+                data[name] = func(*(row[index] for index in columns))
+        return data
+
+    def values(self, queryset):
+        """Turn a model queryset into the ``values_list()`` rows to render."""
+        return queryset.prefetch_related(None).values_list(*self.lookups)
+
+    def serialize(self, rows):
+        plan = self._plan
+        return [self._render(plan, row) for row in rows]
+
+
+class FastListMixin:
+    """
+    Serves list requests through ``compiled_serializer`` when one is set.
+
+    Requests using ``?fields=`` or ``?expand=`` still go through the DRF
+    serializer, which handles sparse fieldsets.
+    """
+
+    compiled_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.compiled_serializer
+        params = request.query_params
+        if compiled is None or "fields" in params or "expand" in params:
+            return super().list(request, *args, **kwargs)
+
+        rows = compiled.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.serialize(page))
+
+        return Response(compiled.serialize(rows))
+
+
+def _user_fields(prefix):
+    return [
+        ("id", f"{prefix}id"),
+        ("username", f"{prefix}username"),
+        ("email", f"{prefix}email"),
+        ("display_name", f"{prefix}display_name"),
+        ("role", f"{prefix}role"),
+    ]
+
+
+def _learning_task_fields(prefix=""):
+    return [
+        ("id", f"{prefix}id"),
+        ("course", f"{prefix}course"),
+        ("title", f"{prefix}title"),
+        ("description", f"{prefix}description"),
+        ("order", f"{prefix}order"),
+        ("is_published", f"{prefix}is_published"),
+        ("task_type", f"{prefix}task_type"),
+        ("created_at", (f"{prefix}created_at", format_datetime)),
+        ("updated_at", (f"{prefix}updated_at", format_datetime)),
+    ]
+
+
+def _course_fields(prefix):
+    return [
+        ("id", f"{prefix}id"),
+        ("title", f"{prefix}title"),
+        ("description", f"{prefix}description"),
+        ("version", f"{prefix}version"),
+        ("status", f"{prefix}status"),
+        ("visibility", f"{prefix}visibility"),
+        ("learning_objectives", f"{prefix}learning_objectives"),
+        ("prerequisites", f"{prefix}prerequisites"),
+        ("created_at", (f"{prefix}created_at", format_datetime)),
+        ("updated_at", (f"{prefix}updated_at", format_datetime)),
+        ("creator", f"{prefix}creator"),
+        ("creator_details", _user_fields(f"{prefix}creator__")),
+    ]
+
+
+def _progress_percentage(total, completed):
+    # Same arithmetic as CourseEnrollment.get_progress_stats
+    return (completed / total * 100) if total > 0 else 0
+
+
+# Mirrors LearningTaskSerializer
+learning_task_serializer = CompiledSerializer(_learning_task_fields())
+
+# Mirrors TaskProgressSerializer
+task_progress_serializer = CompiledSerializer(
+    [
+        ("id", "id"),
+        ("user", "user"),
+        ("task", "task"),
+        ("status", "status"),
+        ("time_spent", ("time_spent", format_duration)),
+        ("completion_date", ("completion_date", format_datetime)),
+        ("user_details", _user_fields("user__")),
+        ("task_details", _learning_task_fields("task__")),
+    ]
+)
+
+# Mirrors CourseEnrollmentSerializer; the queryset must carry the
+# total/completed task count annotations from the viewset's query plan
+course_enrollment_serializer = CompiledSerializer(
+    [
+        ("id", "id"),
+        ("user", "user"),
+        ("course", "course"),
+        ("enrollment_date", ("enrollment_date", format_datetime)),
+        ("status", "status"),
+        ("settings", "settings"),
+        ("user_details", _user_fields("user__")),
+        ("course_details", _course_fields("course__")),
+        (
+            "progress_percentage",
+            Computed(
+                _progress_percentage, "total_tasks_count", "completed_tasks_count"
+            ),
+        ),
+    ]
+)
+
+# Mirrors the slim list form of QuizAttemptSerializer (no expanded fields)
+quiz_attempt_list_serializer = CompiledSerializer(
+    [
+        ("id", "id"),
+        ("user", "user"),
+        ("quiz", "quiz"),
+        ("score", "score"),
+        ("time_taken", ("time_taken", format_duration)),
+        ("completion_status", "completion_status"),
+        ("attempt_date", ("attempt_date", format_datetime)),
+        ("user_details", _user_fields("user__")),
+    ]
+)
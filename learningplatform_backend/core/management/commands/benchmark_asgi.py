@@ -0,0 +1,84 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+SYNC_PREFIX = "/api/v1/"
+ASYNC_PREFIX = "/api/v1/async/"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares throughput of an endpoint on the WSGI deployment with its "
+        "async counterpart (core.async_views) on the ASGI deployment, under "
+        "many concurrent requests. Both servers must already be running, e.g. "
+        "'gunicorn learningplatform_backend.wsgi' and "
+        "'uvicorn learningplatform_backend.asgi:application'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--token", required=True, help="JWT access token")
+        parser.add_argument(
+            "--path",
+            default="/api/v1/instructor/dashboard/",
+            help="Synchronous endpoint path; the async path is derived from it",
+        )
+        parser.add_argument("--wsgi-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--asgi-url", default="http://127.0.0.1:8001")
+        parser.add_argument(
+            "--concurrency", type=int, default=200, help="Requests in flight"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=2000, help="Requests per deployment"
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path.startswith(SYNC_PREFIX) or path.startswith(ASYNC_PREFIX):
+            raise CommandError(f"--path must be a synchronous {SYNC_PREFIX} path")
+        async_path = ASYNC_PREFIX + path[len(SYNC_PREFIX) :]
+
+        for name, url in (
+            ("WSGI", options["wsgi_url"].rstrip("/") + path),
+            ("ASGI", options["asgi_url"].rstrip("/") + async_path),
+        ):
+            self._run(name, url, options)
+
+    def _run(self, name, url, options):
+        headers = {"Authorization": f"Bearer {options['token']}"}
+
+        def fetch(_):
+            request = urllib.request.Request(url, headers=headers)
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+                    ok = response.status == 200
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return ok, time.perf_counter() - start
+
+        # Warm up connections and caches before measuring
+        if not fetch(None)[0]:
+            raise CommandError(f"{name}: GET {url} did not return 200")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(fetch, range(options["requests"])))
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(latency for ok, latency in results if ok)
+        errors = len(results) - len(latencies)
+        if not latencies:
+            raise CommandError(f"{name}: every request failed")
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f"{name} {url}\n"
+            f"  {len(results) / elapsed:8.1f} req/s   "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms   "
+            f"p95 {p95 * 1000:7.1f} ms   errors {errors}"
+        )
+        self.stdout.write(self.style.SUCCESS(f"{name} benchmark complete"))
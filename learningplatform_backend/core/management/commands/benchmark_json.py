@@ -0,0 +1,77 @@
+import datetime
+import io
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+from core.renderers import FastJSONParser, FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF's JSON renderer/parser with core.renderers on a "
+        "generated analytics-style payload"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=10000, help="Rows in the generated payload"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs per backend (best is kept)"
+        )
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "orjson is not installed; FastJSONRenderer falls back to DRF"
+                )
+            )
+
+        now = timezone.now()
+        payload = [
+            {
+                "id": i,
+                "student": f"student_{i}",
+                "status": "completed" if i % 3 else "in_progress",
+                "score": i % 100,
+                "average_score": Decimal(i % 100) / 3,
+                "completion_rate": (i % 7) / 7 * 100,
+                "time_spent": datetime.timedelta(seconds=i),
+                "completion_date": (now - datetime.timedelta(hours=i)).isoformat(),
+                "last_activity": now - datetime.timedelta(minutes=i),
+            }
+            for i in range(options["rows"])
+        ]
+        repeat = options["repeat"]
+
+        drf_render = self._best(repeat, lambda: JSONRenderer().render(payload))
+        fast_render = self._best(repeat, lambda: FastJSONRenderer().render(payload))
+        self._report("render", drf_render, fast_render)
+
+        body = JSONRenderer().render(payload)
+        drf_parse = self._best(repeat, lambda: JSONParser().parse(io.BytesIO(body)))
+        fast_parse = self._best(
+            repeat, lambda: FastJSONParser().parse(io.BytesIO(body))
+        )
+        self._report("parse", drf_parse, fast_parse)
+
+    def _report(self, name, drf, fast):
+        self.stdout.write(
+            f"{name:<7} DRF {drf * 1000:8.1f} ms   "
+            f"fast {fast * 1000:8.1f} ms   x{drf / fast:.1f}"
+        )
+
+    def _best(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
@@ -0,0 +1,204 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.caching import progress_matrix_key
+from core.models import Course, CourseEnrollment, LearningTask, TaskProgress, User
+from core.progress_matrix import ProgressMatrix, get_progress_matrix
+
+
+class Rollback(Exception):
+    pass
+
+
+def loop_rollups(course_id):
+    """
+    The same rollups built the way the analytics views used to: one pass
+    over the progress rows, grouping into Python dicts.
+    """
+    task_ids = list(
+        LearningTask.objects.filter(course_id=course_id)
+        .order_by("order", "id")
+        .values_list("id", flat=True)
+    )
+    user_ids = set(
+        CourseEnrollment.objects.filter(course_id=course_id).values_list(
+            "user_id", flat=True
+        )
+    )
+    user_progress = {}
+    task_hours = {task_id: [] for task_id in task_ids}
+    for progress in TaskProgress.objects.filter(
+        task__course_id=course_id
+    ).select_related("user", "task"):
+        if progress.user_id not in user_ids:
+            continue
+        statuses = user_progress.setdefault(progress.user_id, {})
+        statuses[progress.task_id] = progress.status
+        if (
+            progress.status == "completed"
+            and progress.start_date
+            and progress.completion_date
+        ):
+            task_hours[progress.task_id].append(
+                (progress.completion_date - progress.start_date).total_seconds()
+                / 3600
+            )
+
+    rates = [
+        sum(status == "completed" for status in user_progress.get(u, {}).values())
+        * 100
+        / len(task_ids)
+        for u in user_ids
+    ]
+    funnel = []
+    for index, task_id in enumerate(task_ids):
+        later = task_ids[index:]
+        funnel.append(
+            {
+                "task_id": task_id,
+                "reached": sum(
+                    any(
+                        statuses.get(t, "not_started") != "not_started"
+                        for t in later
+                    )
+                    for statuses in user_progress.values()
+                ),
+                "completed": sum(
+                    statuses.get(task_id) == "completed"
+                    for statuses in user_progress.values()
+                ),
+            }
+        )
+    medians = {
+        task_id: statistics.median(hours) if hours else None
+        for task_id, hours in task_hours.items()
+    }
+    return rates, funnel, medians
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares course rollups (completion rates, task funnel, median "
+        "completion times) computed by a Python loop over progress rows with "
+        "the NumPy progress matrix in core.progress_matrix, built from the "
+        "database and from the cache. Nothing is kept: the data is created "
+        "inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--students", type=int, default=2000, help="Enrolled learners"
+        )
+        parser.add_argument("--tasks", type=int, default=40, help="Tasks in the course")
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Runs per variant (best is kept)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                course = self._seed(options["students"], options["tasks"])
+                self._run(course.id, options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _seed(self, students, tasks):
+        rng = random.Random(0)
+        now = timezone.now()
+        password = make_password(None)
+        instructor = User.objects.create(
+            username="bench_instructor",
+            email="bench_instructor@example.com",
+            role="instructor",
+            password=password,
+        )
+        course = Course.objects.create(
+            title="Bench course", description="", creator=instructor
+        )
+        learners = User.objects.bulk_create(
+            User(
+                username=f"bench_student_{i}",
+                email=f"bench_student_{i}@example.com",
+                role="student",
+                password=password,
+            )
+            for i in range(students)
+        )
+        course_tasks = LearningTask.objects.bulk_create(
+            LearningTask(course=course, title=f"Bench task {i}", order=i)
+            for i in range(tasks)
+        )
+        CourseEnrollment.objects.bulk_create(
+            CourseEnrollment(user=learner, course=course, status="active")
+            for learner in learners
+        )
+
+        def progress_rows():
+            # Each learner gets some way into the course and stops there
+            for learner in learners:
+                reached = rng.randint(0, tasks)
+                for index, task in enumerate(course_tasks[:reached]):
+                    start = now - datetime.timedelta(days=30)
+                    completed = index < reached - 1
+                    yield TaskProgress(
+                        user=learner,
+                        task=task,
+                        status="completed" if completed else "in_progress",
+                        start_date=start,
+                        completion_date=(
+                            start + datetime.timedelta(hours=rng.uniform(0.5, 48))
+                            if completed
+                            else None
+                        ),
+                    )
+
+        TaskProgress.objects.bulk_create(progress_rows(), batch_size=5000)
+        return course
+
+    def _run(self, course_id, repeat):
+        def matrix_rollups(matrix):
+            return (
+                matrix.completion_rates(),
+                matrix.task_funnel(),
+                matrix.completion_time_percentiles((50,)),
+            )
+
+        loop = self._best(repeat, lambda: loop_rollups(course_id))
+        build = self._best(
+            repeat, lambda: matrix_rollups(ProgressMatrix.load(course_id))
+        )
+        cache.delete(progress_matrix_key(course_id))
+        get_progress_matrix(course_id)
+        cached = self._best(
+            repeat, lambda: matrix_rollups(get_progress_matrix(course_id))
+        )
+
+        matrix = ProgressMatrix.load(course_id)
+        raw = sum(getattr(matrix, name).nbytes for name in ProgressMatrix.ARRAYS)
+        self.stdout.write(
+            f"{len(matrix.user_ids)} learners x {len(matrix.task_ids)} tasks, "
+            f"{int((matrix.status != 0).sum())} progress rows\n"
+            f"  python loop     {loop * 1000:8.1f} ms\n"
+            f"  matrix (db)     {build * 1000:8.1f} ms   x{loop / build:.1f}\n"
+            f"  matrix (cache)  {cached * 1000:8.1f} ms   x{loop / cached:.1f}\n"
+            f"  arrays {raw / 1024:.0f} KiB, "
+            f"cached {len(matrix.to_bytes()) / 1024:.0f} KiB compressed"
+        )
+        cache.delete(progress_matrix_key(course_id))
+
+    def _best(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
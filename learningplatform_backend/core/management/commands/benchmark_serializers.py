@@ -0,0 +1,169 @@
+import datetime
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.fast_serializers import (
+    course_enrollment_serializer,
+    learning_task_serializer,
+    quiz_attempt_list_serializer,
+    task_progress_serializer,
+)
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizTask,
+    TaskProgress,
+    User,
+)
+from core.progress_api import enrollment_progress_annotations
+from core.serializers import (
+    CourseEnrollmentSerializer,
+    LearningTaskSerializer,
+    QuizAttemptSerializer,
+    TaskProgressSerializer,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the DRF list serializers with the compiled serializers in "
+        "core.fast_serializers on generated data. Nothing is kept: the data "
+        "is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=2000, help="Rows serialized per endpoint"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Runs per serializer (best is kept)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options["rows"])
+                self._run(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _seed(self, rows):
+        now = timezone.now()
+        password = make_password(None)
+        instructor = User.objects.create(
+            username="bench_instructor",
+            email="bench_instructor@example.com",
+            role="instructor",
+            password=password,
+        )
+        students = User.objects.bulk_create(
+            User(
+                username=f"bench_student_{i}",
+                email=f"bench_student_{i}@example.com",
+                role="student",
+                password=password,
+            )
+            for i in range(rows)
+        )
+        courses = Course.objects.bulk_create(
+            Course(title=f"Bench course {i}", description="", creator=instructor)
+            for i in range(rows)
+        )
+        tasks = LearningTask.objects.bulk_create(
+            LearningTask(course=courses[0], title=f"Bench task {i}", order=i)
+            for i in range(rows)
+        )
+        quiz = QuizTask.objects.create(course=courses[0], title="Bench quiz")
+
+        CourseEnrollment.objects.bulk_create(
+            CourseEnrollment(user=student, course=course, status="active")
+            for student, course in zip(students, courses)
+        )
+        TaskProgress.objects.bulk_create(
+            TaskProgress(
+                user=student,
+                task=task,
+                status="completed",
+                time_spent=datetime.timedelta(minutes=5),
+                completion_date=now,
+            )
+            for student, task in zip(students, tasks)
+        )
+        QuizAttempt.objects.bulk_create(
+            QuizAttempt(
+                user=student,
+                quiz=quiz,
+                score=80,
+                time_taken=datetime.timedelta(minutes=10),
+                completion_status="completed",
+                attempt_date=now,
+            )
+            for student in students
+        )
+
+    def _run(self, repeat):
+        context = {"request": Request(APIRequestFactory().get("/"))}
+        cases = [
+            (
+                "learning tasks",
+                LearningTask.objects.all(),
+                LearningTaskSerializer,
+                learning_task_serializer,
+            ),
+            (
+                "task progress",
+                TaskProgress.objects.select_related("user", "task"),
+                TaskProgressSerializer,
+                task_progress_serializer,
+            ),
+            (
+                "enrollments",
+                CourseEnrollment.objects.select_related(
+                    "user", "course__creator"
+                ).annotate(**enrollment_progress_annotations()),
+                CourseEnrollmentSerializer,
+                course_enrollment_serializer,
+            ),
+            (
+                "quiz attempts",
+                QuizAttempt.objects.select_related("user", "quiz"),
+                QuizAttemptSerializer,
+                quiz_attempt_list_serializer,
+            ),
+        ]
+
+        for name, queryset, serializer_class, compiled in cases:
+            drf = self._best(
+                repeat,
+                lambda: serializer_class(
+                    queryset.all(), many=True, context=context
+                ).data,
+            )
+            fast = self._best(
+                repeat, lambda: compiled.serialize(compiled.values(queryset.all()))
+            )
+            self.stdout.write(
+                f"{name:<15} DRF {drf * 1000:8.1f} ms   "
+                f"compiled {fast * 1000:8.1f} ms   x{drf / fast:.1f}"
+            )
+
+    def _best(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
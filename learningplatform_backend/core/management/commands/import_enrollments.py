@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk_operations import (
+    DEFAULT_CHUNK_SIZE,
+    bulk_enroll_users,
+    parse_user_identifiers,
+)
+from core.models import Course
+
+
+class Command(BaseCommand):
+    help = "Enrolls a cohort of users (CSV of user ids or emails) in a course"
+
+    def add_arguments(self, parser):
+        parser.add_argument("course_id", type=int, help="ID of the target course")
+        parser.add_argument(
+            "csv_path",
+            help="CSV file with an 'email', 'user_id' or 'id' column (or one value per line)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Number of users resolved and inserted per query",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course = Course.objects.get(pk=options["course_id"])
+        except Course.DoesNotExist:
+            raise CommandError(f"Course {options['course_id']} does not exist")
+
+        try:
+            with open(options["csv_path"], encoding="utf-8-sig") as csv_file:
+                identifiers = parse_user_identifiers(csv_file.read())
+        except OSError as e:
+            raise CommandError(f"Could not read {options['csv_path']}: {e}")
+
+        if not identifiers:
+            raise CommandError("No user identifiers found in the CSV file")
+
+        summary = bulk_enroll_users(
+            course, identifiers, chunk_size=options["chunk_size"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Enrolled {summary['created']} users in '{course.title}' "
+                f"({summary['skipped']} already enrolled)"
+            )
+        )
+        if summary["not_found"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{len(summary['not_found'])} identifiers did not match a user: "
+                    + ", ".join(summary["not_found"][:20])
+                )
+            )
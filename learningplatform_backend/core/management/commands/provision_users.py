@@ -0,0 +1,70 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk_operations import DEFAULT_CHUNK_SIZE, bulk_provision_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates user accounts in bulk from a CSV file with the columns "
+        "username, email and optionally display_name, first_name, last_name, "
+        "role, password, password_hash"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", help="CSV file with one account per row")
+        parser.add_argument(
+            "--sso",
+            action="store_true",
+            help="Create every account with an unusable password (SSO login only)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Number of users inserted per query",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Processes used to hash plaintext passwords (default: CPU count)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["csv_path"], encoding="utf-8-sig", newline="") as f:
+                rows = list(csv.DictReader(f))
+        except OSError as e:
+            raise CommandError(f"Could not read {options['csv_path']}: {e}")
+
+        entries = []
+        for row in rows:
+            # Empty CSV cells mean "not provided", not "blank value"
+            entry = {key: value for key, value in row.items() if key and value}
+            if options["sso"]:
+                entry.pop("password", None)
+                entry.pop("password_hash", None)
+                entry["sso"] = True
+            entries.append(entry)
+
+        if not entries:
+            raise CommandError("No accounts found in the CSV file")
+
+        summary = bulk_provision_users(
+            entries,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            processes=True,
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Created {summary['created']} users"))
+        if summary["skipped"]:
+            self.stdout.write(
+                self.style.WARNING(f"Skipped {len(summary['skipped'])} existing users")
+            )
+        for error in summary["errors"]:
+            self.stdout.write(
+                self.style.ERROR(f"Row {error['index'] + 2}: {error['errors']}")
+            )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from core.token_blacklist import blacklist_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired outstanding/blacklisted JWT refresh tokens in batches. "
+        "Schedule it periodically (e.g. hourly cron) to keep the blacklist "
+        "tables small."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of tokens deleted per statement",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        batch_size = options["batch_size"]
+        deleted = 0
+
+        # Delete in id batches so a large backlog never holds one long lock;
+        # blacklist rows go with their outstanding token (ON DELETE CASCADE)
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+
+        if deleted:
+            blacklist_index.reset()
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired tokens"))
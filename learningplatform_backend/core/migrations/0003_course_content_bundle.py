@@ -0,0 +1,31 @@
+# Generated by Django 4.2.22 on 2026-10-19 05:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_course_updated_at_auto_now'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseContentBundle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checksum', models.CharField(max_length=64, unique=True)),
+                ('content', models.BinaryField()),
+                ('size', models.PositiveIntegerField(help_text='Uncompressed size in bytes')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='content_bundles', to='core.course')),
+                ('version', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='content_bundle', to='core.courseversion')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'get_latest_by': 'created_at',
+            },
+        ),
+    ]
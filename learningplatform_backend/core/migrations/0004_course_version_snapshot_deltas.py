@@ -0,0 +1,28 @@
+# Generated by Django 4.2.22 on 2026-10-19 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_course_content_bundle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseversion',
+            name='is_checkpoint',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='courseversion',
+            name='snapshot_delta',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='courseversion',
+            name='content_snapshot',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
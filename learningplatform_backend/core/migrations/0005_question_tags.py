@@ -0,0 +1,31 @@
+# Generated by Django 4.2.22 on 2026-10-19 05:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_course_version_snapshot_deltas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('description', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name': 'Question Tag',
+                'verbose_name_plural': 'Question Tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='quizquestion',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='questions', to='core.questiontag'),
+        ),
+    ]
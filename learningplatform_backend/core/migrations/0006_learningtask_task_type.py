@@ -0,0 +1,31 @@
+# Generated by Django 4.2.22 on 2026-10-19 05:35
+
+from django.db import migrations, models
+
+
+def mark_quiz_tasks(apps, schema_editor):
+    LearningTask = apps.get_model('core', 'LearningTask')
+    QuizTask = apps.get_model('core', 'QuizTask')
+    LearningTask.objects.filter(
+        pk__in=QuizTask.objects.values('learningtask_ptr_id')
+    ).update(task_type='quiz')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_question_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningtask',
+            name='task_type',
+            field=models.CharField(choices=[('task', 'Task'), ('quiz', 'Quiz')], default='task', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='learningtask',
+            index=models.Index(fields=['course', 'task_type'], name='core_learni_course__8421e1_idx'),
+        ),
+        migrations.RunPython(mark_quiz_tasks, migrations.RunPython.noop),
+    ]
@@ -35,7 +35,15 @@ class CustomUserManager(BaseUserManager):
 class User(AbstractUser):
     email = models.EmailField(unique=True)
     display_name = models.CharField(max_length=150, blank=True)
-    role = models.CharField(max_length=100, default="student")
+    role = models.CharField(
+        max_length=100,
+        choices=[
+            ("student", "Student"),
+            ("instructor", "Instructor"),
+            ("admin", "Admin"),
+        ],
+        default="student",
+    )
 
     objects = CustomUserManager()
 
@@ -65,7 +73,7 @@ class Course(models.Model):
     learning_objectives = models.TextField(blank=True)
     prerequisites = models.TextField(blank=True)
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
@@ -80,7 +88,11 @@ class CourseVersion(models.Model):
     )
     version_number = models.IntegerField()
     created_at = models.DateTimeField(default=timezone.now)
-    content_snapshot = models.JSONField()
+    # Full snapshot on checkpoints; other versions store a compressed patch
+    # against the previous version (see core.course_versions)
+    content_snapshot = models.JSONField(null=True, blank=True)
+    is_checkpoint = models.BooleanField(default=True)
+    snapshot_delta = models.BinaryField(null=True, blank=True)
     notes = models.TextField(blank=True)
     created_by = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, blank=True
@@ -94,6 +106,34 @@ class CourseVersion(models.Model):
         return f"{self.course.title} - v{self.version_number}"
 
 
+class CourseContentBundle(models.Model):
+    """
+    Immutable, gzip-compressed student view of a published course version.
+
+    Built by ``core.course_content.publish_course_version`` and served by
+    checksum, so student content reads never rebuild the course tree.
+    """
+
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="content_bundles"
+    )
+    version = models.OneToOneField(
+        CourseVersion, on_delete=models.CASCADE, related_name="content_bundle"
+    )
+    # SHA-256 of the uncompressed JSON document
+    checksum = models.CharField(max_length=64, unique=True)
+    content = models.BinaryField()
+    size = models.PositiveIntegerField(help_text="Uncompressed size in bytes")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at"]
+        get_latest_by = "created_at"
+
+    def __str__(self):
+        return f"{self.course.title} - bundle {self.checksum[:12]}"
+
+
 class StatusTransition(models.Model):
     course = models.ForeignKey(
         Course, on_delete=models.CASCADE, related_name="status_transitions"
@@ -120,9 +160,20 @@ class LearningTask(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_published = models.BooleanField(default=False)
+    # Which subclass the row belongs to, so queries can tell quizzes apart
+    # without joining the QuizTask table (kept in sync by QuizTask.save)
+    task_type = models.CharField(
+        max_length=20,
+        choices=[
+            ("task", "Task"),
+            ("quiz", "Quiz"),
+        ],
+        default="task",
+    )
 
     class Meta:
         ordering = ["course", "order"]
+        indexes = [models.Index(fields=["course", "task_type"])]
         verbose_name = "Learning Task"
         verbose_name_plural = "Learning Tasks"
 
@@ -147,6 +198,25 @@ class QuizTask(LearningTask):
     def __str__(self):
         return f"{self.course.title} - {self.title} (Quiz)"
 
+    def save(self, *args, **kwargs):
+        self.task_type = "quiz"
+        super().save(*args, **kwargs)
+
+
+class QuestionTag(models.Model):
+    """A skill or topic that quiz questions can be tagged with"""
+
+    name = models.CharField(max_length=100, unique=True)
+    description = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name = "Question Tag"
+        verbose_name_plural = "Question Tags"
+
+    def __str__(self):
+        return self.name
+
 
 class QuizQuestion(models.Model):
     """Represents a question in a quiz"""
@@ -158,6 +228,8 @@ class QuizQuestion(models.Model):
     explanation = models.TextField(blank=True)
     points = models.IntegerField(default=1)
     order = models.IntegerField(default=0)
+    # Used for category (skill) level analytics, see core.analytics
+    tags = models.ManyToManyField(QuestionTag, related_name="questions", blank=True)
 
     class Meta:
         ordering = ["order"]
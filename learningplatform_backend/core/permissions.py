@@ -2,8 +2,7 @@ import logging  # Add logging import
 
 from rest_framework.permissions import BasePermission
 
-from .models import \
-    CourseEnrollment
+from .caching import is_enrolled
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -45,23 +44,17 @@ class IsEnrolledInCourse(BasePermission):
         course_id = view.kwargs.get("course_id")
         user = request.user
 
-        # Debug logging
-        print(f"DEBUG: Checking enrollment for user {user} in course {course_id}")
-
         if not user.is_authenticated:
-            print("DEBUG: User is not authenticated.")
             return False
 
         # Allow access to course details even if not enrolled
         if course_id is None:
             return True
 
-        # Check if the user is enrolled in the course
-        is_enrolled = CourseEnrollment.objects.filter(
-            user=user, course_id=course_id
-        ).exists()
-        print(
-            f"DEBUG: Enrollment status for user {user.id} in course {course_id}: {is_enrolled}"
+        # Check the user's cached enrollment set
+        enrolled = is_enrolled(user.id, course_id, request)
+        logger.debug(
+            f"Enrollment status for user {user.id} in course {course_id}: {enrolled}"
         )
 
-        return is_enrolled
+        return enrolled
@@ -5,7 +5,14 @@ import logging  # Add a logger for this module
 
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
-from django.db.models import Avg, F  # Explicitly used in analytics methods
+from django.db.models import (  # Explicitly used in analytics methods
+    Avg,
+    Count,
+    F,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404  # Used in analytics methods
 from django.utils import timezone
 from rest_framework import filters, permissions, viewsets
@@ -33,8 +40,37 @@ from .serializers import (
     QuizAttemptSerializer,
     QuizResponseSerializer,
     TaskProgressSerializer,
+    ThresholdSimulationSerializer,
 )
 from .base_viewset import BaseViewSet  # Import the base viewset
+from .fast_serializers import (
+    course_enrollment_serializer,
+    quiz_attempt_list_serializer,
+    task_progress_serializer,
+)
+from .analytics import (
+    build_course_analytics,
+    build_course_category_performance,
+    build_course_funnel,
+    build_course_task_analytics,
+    build_student_progress,
+    build_student_quiz_performance,
+)
+from .bulk_operations import MAX_BULK_ITEMS, bulk_update_task_progress
+from .quiz_scores import (
+    get_quiz_response_matrix,
+    get_quiz_scores,
+    parse_percentiles,
+    simulate_thresholds,
+)
+from .caching import (
+    course_analytics_key,
+    course_category_performance_key,
+    course_task_analytics_key,
+    is_enrolled,
+    student_progress_key,
+    student_quiz_performance_key,
+)
 
 
 def _suppress_linter_warnings():
@@ -91,8 +127,7 @@ class IsInstructorOrAdmin(permissions.BasePermission):
         # Check if user has a role attribute, if not, default to False
         user_role = getattr(request.user, "role", "")
         is_staff = getattr(request.user, "is_staff", False)
-        # add logging
-        print(f"User role: {user_role}, Is staff: {is_staff}")
+        logger.debug(f"User role: {user_role}, Is staff: {is_staff}")
 
         return user_role in ["instructor", "admin"] or is_staff
 
@@ -130,11 +165,9 @@ class IsEnrolledInCourse(permissions.BasePermission):
             )
             return False
 
-        is_enrolled = CourseEnrollment.objects.filter(
-            user=request.user, course_id=course_id
-        ).exists()
+        enrolled = is_enrolled(request.user.id, course_id, request)
 
-        if is_enrolled:
+        if enrolled:
             logger.info(
                 f"Permission granted: User {request.user.id} is enrolled in course {course_id}."
             )
@@ -143,7 +176,38 @@ class IsEnrolledInCourse(permissions.BasePermission):
                 f"Permission denied: User {request.user.id} is not enrolled in course {course_id}."
             )
 
-        return is_enrolled
+        return enrolled
+
+
+def _count_subquery(queryset, group_by):
+    """Correlated COUNT(*) subquery that yields 0 instead of NULL."""
+    counts = (
+        queryset.order_by()
+        .values(group_by)
+        .annotate(count=Count("id"))
+        .values("count")[:1]
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def enrollment_progress_annotations():
+    """
+    Per-enrollment task counts used by ``CourseEnrollmentSerializer`` in place
+    of ``CourseEnrollment.calculate_course_progress``.
+    """
+    return {
+        "total_tasks_count": _count_subquery(
+            LearningTask.objects.filter(course=OuterRef("course_id")), "course"
+        ),
+        "completed_tasks_count": _count_subquery(
+            TaskProgress.objects.filter(
+                user=OuterRef("user_id"),
+                task__course=OuterRef("course_id"),
+                status="completed",
+            ),
+            "user",
+        ),
+    }
 
 
 # Enhanced viewsets with filtering
@@ -152,8 +216,18 @@ class EnhancedCourseEnrollmentViewSet(BaseViewSet):
     API endpoint for course enrollments with enhanced filtering and analytics.
     """
 
-    queryset = CourseEnrollment.objects.select_related("user", "course").all()
+    queryset = CourseEnrollment.objects.all()
+    read_plan = {
+        "select_related": ["user", "course__creator"],
+        "annotate": enrollment_progress_annotations(),
+    }
+    query_plans = {
+        "default": {"select_related": ["user", "course__creator"]},
+        "list": read_plan,
+        "retrieve": read_plan,
+    }
     serializer_class = CourseEnrollmentSerializer
+    compiled_serializer = course_enrollment_serializer
     permission_classes = [IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["course__title", "status"]
@@ -187,8 +261,10 @@ class EnhancedTaskProgressViewSet(BaseViewSet):
     API endpoint for task progress tracking.
     """
 
-    queryset = TaskProgress.objects.select_related("user", "task").all()
+    queryset = TaskProgress.objects.all()
+    query_plans = {"default": {"select_related": ["user", "task"]}}
     serializer_class = TaskProgressSerializer
+    compiled_serializer = task_progress_serializer
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
@@ -222,14 +298,73 @@ class EnhancedTaskProgressViewSet(BaseViewSet):
         serializer = self.get_serializer(progress)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["post"], url_path="bulk-update")
+    def bulk_update(self, request):
+        """
+        Create or update many progress records for the current user at once.
+
+        Accepts either a list of items or ``{"items": [...]}`` where each item
+        is ``{task, status, completion_date?, time_spent?}``. Returns a result
+        entry per item so clients can reconcile partial failures.
+        """
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get("items")
+
+        if not isinstance(items, list) or not items:
+            raise ValidationError("Expected a non-empty list of progress items.")
+
+        if len(items) > MAX_BULK_ITEMS:
+            raise ValidationError(
+                f"A single request may contain at most {MAX_BULK_ITEMS} items."
+            )
+
+        results = bulk_update_task_progress(request.user, items)
+        return Response(
+            {
+                "created": sum(1 for r in results if r["result"] == "created"),
+                "updated": sum(1 for r in results if r["result"] == "updated"),
+                "failed": sum(1 for r in results if r["result"] == "error"),
+                "results": results,
+            }
+        )
+
 
 class EnhancedQuizAttemptViewSet(BaseViewSet):
     """
     API endpoint for quiz attempts with enhanced filtering and analytics.
     """
 
-    queryset = QuizAttempt.objects.select_related("user", "quiz").all()
+    queryset = QuizAttempt.objects.all()
+    query_plans = {
+        "default": {"select_related": ["user", "quiz"]},
+        "list": {
+            "select_related": ["user", "quiz"],
+            "expand": {
+                "quiz_details": [
+                    "quiz__questions__options",
+                    "quiz__questions__tags",
+                ],
+                "responses": [
+                    "responses__question__options",
+                    "responses__question__tags",
+                    "responses__selected_option",
+                ],
+            },
+        },
+        "retrieve": {
+            "select_related": ["user", "quiz"],
+            "prefetch_related": [
+                "quiz__questions__options",
+                "quiz__questions__tags",
+                "responses__question__options",
+                "responses__question__tags",
+                "responses__selected_option",
+            ],
+        },
+    }
     serializer_class = QuizAttemptSerializer
+    compiled_serializer = quiz_attempt_list_serializer
     permission_classes = [IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["quiz__title"]
@@ -348,6 +483,8 @@ class CourseAnalyticsAPI(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticated, IsInstructorOrAdmin]
+    # Only role checks on the user, so token claims are enough
+    stateless_auth = True
 
     def get(self, request, pk=None):
         """
@@ -364,142 +501,13 @@ class CourseAnalyticsAPI(APIView):
         course = get_object_or_404(Course, pk=pk)
 
         # Try to get cached data first
-        cache_key = f"course_analytics_{pk}"
+        cache_key = course_analytics_key(pk)
         cached_data = cache.get(cache_key)
 
         if cached_data:
             return Response(cached_data)
 
-        # Calculate enrollment statistics
-        total_enrollments = CourseEnrollment.objects.filter(course=course).count()
-        active_enrollments = CourseEnrollment.objects.filter(
-            course=course, status="active"
-        ).count()
-        completed_enrollments = CourseEnrollment.objects.filter(
-            course=course, status="completed"
-        ).count()
-        dropped_enrollments = CourseEnrollment.objects.filter(
-            course=course, status="dropped"
-        ).count()
-
-        # Calculate completion rates
-        all_tasks = LearningTask.objects.filter(course=course)
-        total_tasks = all_tasks.count()
-
-        # Get all task progress records for this course
-        task_progress_records = TaskProgress.objects.filter(
-            task__course=course
-        ).select_related("user", "task")
-
-        # Group task progress by user to calculate completion rate per student
-        user_progress = {}
-        for progress in task_progress_records:
-            user_id = progress.user_id
-            if user_id not in user_progress:
-                user_progress[user_id] = {"completed": 0, "total": total_tasks}
-
-            if progress.status == "completed":
-                user_progress[user_id]["completed"] += 1
-
-        # Calculate average completion rate
-        completion_rates = []
-        for user_id, progress in user_progress.items():
-            if progress["total"] > 0:
-                completion_rate = (progress["completed"] / progress["total"]) * 100
-                completion_rates.append(completion_rate)
-
-        avg_completion_rate = (
-            sum(completion_rates) / len(completion_rates) if completion_rates else 0
-        )
-
-        # Calculate average scores for quiz tasks
-        quiz_attempts = QuizAttempt.objects.filter(
-            quiz__course=course, completion_status="completed"
-        )
-
-        avg_quiz_score = quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
-
-        # Task type distribution
-        task_types = {
-            "reading": LearningTask.objects.filter(
-                course=course, type="reading"
-            ).count(),
-            "video": LearningTask.objects.filter(course=course, type="video").count(),
-            "quiz": QuizTask.objects.filter(course=course).count(),
-            "assignment": LearningTask.objects.filter(
-                course=course, type="assignment"
-            ).count(),
-            "discussion": LearningTask.objects.filter(
-                course=course, type="discussion"
-            ).count(),
-        }
-
-        # Identify challenging content
-        # Get questions with low success rates
-        challenging_questions = []
-        quiz_tasks = QuizTask.objects.filter(course=course)
-
-        for quiz in quiz_tasks:
-            questions = QuizQuestion.objects.filter(quiz=quiz)
-
-            for question in questions:
-                # Calculate success rate for this question
-                total_responses = QuizResponse.objects.filter(question=question).count()
-
-                correct_responses = QuizResponse.objects.filter(
-                    question=question, is_correct=True
-                ).count()
-
-                if total_responses > 0:
-                    success_rate = (correct_responses / total_responses) * 100
-
-                    # If success rate is below 50%, consider it challenging
-                    if (
-                        success_rate < 50 and total_responses >= 5
-                    ):  # Only consider questions with sufficient attempts
-                        challenging_questions.append(
-                            {
-                                "id": question.id,
-                                "text": question.text,
-                                "quiz": quiz.title,
-                                "success_rate": round(success_rate, 2),
-                                "total_attempts": total_responses,
-                            }
-                        )
-
-        # Sort challenging questions by success rate (ascending)
-        challenging_questions.sort(key=lambda x: x["success_rate"])
-
-        # Compile results
-        analytics_data = {
-            "enrollment_stats": {
-                "total": total_enrollments,
-                "active": active_enrollments,
-                "completed": completed_enrollments,
-                "dropped": dropped_enrollments,
-                "completion_percentage": (
-                    round((completed_enrollments / total_enrollments * 100), 2)
-                    if total_enrollments > 0
-                    else 0
-                ),
-            },
-            "completion_rates": {
-                "average": round(avg_completion_rate, 2),
-                "distribution": {
-                    "below_25": len([r for r in completion_rates if r < 25]),
-                    "25_to_50": len([r for r in completion_rates if 25 <= r < 50]),
-                    "50_to_75": len([r for r in completion_rates if 50 <= r < 75]),
-                    "above_75": len([r for r in completion_rates if r >= 75]),
-                },
-            },
-            "average_scores": {"quizzes": round(avg_quiz_score, 2)},
-            "content_distribution": task_types,
-            "challenging_content": {
-                "questions": challenging_questions[
-                    :10
-                ]  # Top 10 most challenging questions
-            },
-        }
+        analytics_data = build_course_analytics(course.id)
 
         # Cache the analytics data for 1 hour
         cache.set(cache_key, analytics_data, 60 * 60)
@@ -548,9 +556,7 @@ class CourseStudentProgressAPI(APIView):
                 logger.info(
                     f"[CourseStudentProgressAPI] User {request.user.id} is a student. Checking enrollment."
                 )
-                if not CourseEnrollment.objects.filter(
-                    user=request.user, course=course
-                ).exists():
+                if not is_enrolled(request.user.id, course.id, request):
                     logger.warning(
                         f"[CourseStudentProgressAPI] Permission denied for user {request.user.id}. "
                         f"User is not enrolled in course {course.id}."
@@ -591,7 +597,7 @@ class CourseStudentProgressAPI(APIView):
                         {
                             "task_id": task.id,
                             "task_title": task.title,
-                            "task_type": task.type,
+                            "task_type": task.task_type,
                             "status": progress.status if progress else "not_started",
                             "completion_date": (
                                 progress.completion_date if progress else None
@@ -643,7 +649,7 @@ class CourseStudentProgressAPI(APIView):
                         {
                             "task_id": task.id,
                             "task_title": task.title,
-                            "task_type": task.type,
+                            "task_type": task.task_type,
                             "status": progress.status if progress else "not_started",
                             "completion_date": (
                                 progress.completion_date if progress else None
@@ -687,6 +693,8 @@ class CourseTaskAnalyticsAPI(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticated, IsInstructorOrAdmin]
+    # Only role checks on the user, so token claims are enough
+    stateless_auth = True
 
     def get(self, request, pk=None):
         """
@@ -704,135 +712,81 @@ class CourseTaskAnalyticsAPI(APIView):
         course = get_object_or_404(Course, pk=pk)
 
         # Try to get cached data first
-        cache_key = f"course_task_analytics_{pk}"
+        cache_key = course_task_analytics_key(pk)
         cached_data = cache.get(cache_key)
 
         if cached_data:
             return Response(cached_data)
 
-        # Get all tasks for this course
-        tasks = LearningTask.objects.filter(course=course)
+        task_analytics = build_course_task_analytics(course.id)
 
-        task_analytics = []
+        # Cache the analytics data for 1 hour
+        cache.set(cache_key, task_analytics, 60 * 60)
 
-        for task in tasks:
-            # Get all progress records for this task
-            task_progress_records = TaskProgress.objects.filter(task=task)
+        return Response(task_analytics)
 
-            # Calculate completion statistics
-            total_attempts = task_progress_records.count()
-            completed = task_progress_records.filter(status="completed").count()
-            in_progress = task_progress_records.filter(status="in_progress").count()
-            not_started = task_progress_records.filter(status="not_started").count()
 
-            completion_rate = (
-                (completed / total_attempts) * 100 if total_attempts > 0 else 0
-            )
+class CourseCategoryPerformanceAPI(APIView):
+    """
+    API endpoint for question category (tag) performance within a course,
+    overall and per enrollment month cohort.
+    """
 
-            # Average time to completion (for completed tasks with both start and completion dates)
-            avg_completion_time = None
-            completion_times = []
+    permission_classes = [permissions.IsAuthenticated, IsInstructorOrAdmin]
+    # Only role checks on the user, so token claims are enough
+    stateless_auth = True
 
-            for progress in task_progress_records.filter(
-                status="completed",
-                start_date__isnull=False,
-                completion_date__isnull=False,
-            ):
-                completion_time = (
-                    progress.completion_date - progress.start_date
-                ).total_seconds() / 3600  # in hours
-                completion_times.append(completion_time)
-
-            if completion_times:
-                avg_completion_time = sum(completion_times) / len(completion_times)
-
-            # Additional analytics for quiz tasks
-            quiz_data = None
-
-            if task.type == "quiz":
-                try:
-                    quiz_task = QuizTask.objects.get(id=task.id)
-                    quiz_attempts = QuizAttempt.objects.filter(
-                        quiz=quiz_task, completion_status="completed"
-                    )
-                    avg_quiz_score = (
-                        quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
-                    )
+    def get(self, request, pk=None):
+        """
+        Get category performance for a course
 
-                    # Question-level analysis
-                    question_analysis = []
-
-                    for question in QuizQuestion.objects.filter(quiz=quiz_task):
-                        responses = QuizResponse.objects.filter(question=question)
-                        total_responses = responses.count()
-                        correct_responses = responses.filter(is_correct=True).count()
-
-                        success_rate = (
-                            (correct_responses / total_responses) * 100
-                            if total_responses > 0
-                            else 0
-                        )
-
-                        question_analysis.append(
-                            {
-                                "question_id": question.id,
-                                "text": question.text,
-                                "success_rate": round(success_rate, 2),
-                                "total_responses": total_responses,
-                            }
-                        )
-
-                    quiz_data = {
-                        "average_score": round(avg_quiz_score, 2),
-                        "total_attempts": quiz_attempts.count(),
-                        "question_analysis": sorted(
-                            question_analysis, key=lambda x: x["success_rate"]
-                        ),
-                    }
-
-                except QuizTask.DoesNotExist:
-                    pass
-
-            # Compile task analytics
-            task_data = {
-                "task_id": task.id,
-                "title": task.title,
-                "type": task.type,
-                "completion_stats": {
-                    "total_students": total_attempts,
-                    "completed": completed,
-                    "in_progress": in_progress,
-                    "not_started": not_started,
-                    "completion_rate": round(completion_rate, 2),
-                    "avg_completion_time_hours": (
-                        round(avg_completion_time, 2) if avg_completion_time else None
-                    ),
-                },
-                "difficulty_assessment": {
-                    "estimated_difficulty": (
-                        "high"
-                        if completion_rate < 50
-                        else ("medium" if completion_rate < 80 else "low")
-                    ),
-                    "avg_attempts_to_complete": (
-                        round(total_attempts / completed, 2) if completed > 0 else None
-                    ),
-                },
-            }
+        Parameters:
+            pk (int): The course ID
 
-            # Add quiz data if available
-            if quiz_data:
-                task_data["quiz_analysis"] = quiz_data
+        Returns:
+            - categories: answer counts and success rate per tag, weakest first
+            - cohorts: the same per enrollment month ("YYYY-MM")
+        """
+        course = get_object_or_404(Course, pk=pk)
 
-            task_analytics.append(task_data)
+        cache_key = course_category_performance_key(pk)
+        cached_data = cache.get(cache_key)
+        if cached_data:
+            return Response(cached_data)
 
-        # Sort by completion rate (ascending, to highlight problematic tasks)
-        task_analytics.sort(key=lambda x: x["completion_stats"]["completion_rate"])
+        category_data = build_course_category_performance(course.id)
 
-        # Cache the analytics data for 1 hour
-        cache.set(cache_key, task_analytics, 60 * 60)
+        # Cache the category data for 1 hour
+        cache.set(cache_key, category_data, 60 * 60)
 
-        return Response(task_analytics)
+        return Response(category_data)
+
+
+class CourseFunnelAPI(APIView):
+    """
+    API endpoint for the drop-off funnel of a course: how many enrolled
+    learners reached and completed each task, in course order.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsInstructorOrAdmin]
+    # Only role checks on the user, so token claims are enough
+    stateless_auth = True
+
+    def get(self, request, pk=None):
+        """
+        Get the funnel of a course
+
+        Parameters:
+            pk (int): The course ID
+
+        Returns:
+            - total_learners: enrolled learners
+            - tasks: reached, started and completed counts and rates per task,
+              with the learners who dropped off there
+            - cohorts: the same per enrollment month ("YYYY-MM")
+        """
+        course = get_object_or_404(Course, pk=pk)
+        return Response(build_course_funnel(course.id))
 
 
 class StudentProgressAPI(APIView):
@@ -880,127 +834,13 @@ class StudentProgressAPI(APIView):
                     )
 
         # Try to get cached data first
-        cache_key = f"student_progress_{user.id}"
+        cache_key = student_progress_key(user.id)
         cached_data = cache.get(cache_key)
 
         if cached_data:
             return Response(cached_data)
 
-        # Get all course enrollments for this user
-        enrollments = CourseEnrollment.objects.filter(user=user).select_related(
-            "course"
-        )
-
-        # Initialize aggregated statistics
-        total_courses = enrollments.count()
-        completed_courses = enrollments.filter(status="completed").count()
-        active_courses = enrollments.filter(status="active").count()
-        dropped_courses = enrollments.filter(status="dropped").count()
-
-        total_tasks = 0
-        completed_tasks = 0
-
-        # Detailed progress for each course
-        course_progress = []
-
-        for enrollment in enrollments:
-            course = enrollment.course
-
-            # Get task progress for this course
-            course_task_progress = TaskProgress.objects.filter(
-                user=user, task__course=course
-            ).select_related("task")
-
-            # Course-specific task counts
-            course_total_tasks = LearningTask.objects.filter(course=course).count()
-            course_completed_tasks = course_task_progress.filter(
-                status="completed"
-            ).count()
-
-            # Update aggregated counts
-            total_tasks += course_total_tasks
-            completed_tasks += course_completed_tasks
-
-            # Calculate completion percentage
-            completion_percentage = (
-                (course_completed_tasks / course_total_tasks) * 100
-                if course_total_tasks > 0
-                else 0
-            )
-
-            # Get quiz performance
-            quiz_attempts = QuizAttempt.objects.filter(
-                user=user, quiz__course=course, completion_status="completed"
-            )
-
-            avg_quiz_score = quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
-
-            # Recent activity in this course
-            recent_activity = course_task_progress.order_by("-updated_at")[:3].values(
-                "task__title", "status", "updated_at"
-            )
-
-            # Compile course data
-            course_data = {
-                "course_id": course.id,
-                "course_title": course.title,
-                "enrollment_status": enrollment.status,
-                "enrollment_date": enrollment.enrollment_date,
-                "progress_summary": {
-                    "completion_percentage": round(completion_percentage, 2),
-                    "completed_tasks": course_completed_tasks,
-                    "total_tasks": course_total_tasks,
-                },
-                "assessment_performance": {
-                    "average_quiz_score": round(avg_quiz_score, 2),
-                    "quiz_attempts": quiz_attempts.count(),
-                },
-                "recent_activity": list(recent_activity),
-                "last_access": (
-                    course_task_progress.order_by("-updated_at").first().updated_at
-                    if course_task_progress.exists()
-                    else None
-                ),
-            }
-
-            course_progress.append(course_data)
-
-        # Calculate overall completion percentage
-        overall_completion_percentage = (
-            (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
-        )
-
-        # Get overall quiz performance"completed")
-        all_quiz_attempts = QuizAttempt.objects.filter(
-            user=user, completion_status="completed"
-        )
-
-        overall_avg_quiz_score = (
-            all_quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
-        )
-
-        # Compile results
-        student_progress_data = {
-            "user_info": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "full_name": f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip(),
-            },
-            "overall_stats": {
-                "total_courses": total_courses,
-                "completed_courses": completed_courses,
-                "active_courses": active_courses,
-                "dropped_courses": dropped_courses,
-                "overall_completion": round(overall_completion_percentage, 2),
-                "total_tasks_completed": completed_tasks,
-                "total_tasks": total_tasks,
-                "average_quiz_score": round(overall_avg_quiz_score, 2),
-            },
-            "courses": sorted(
-                course_progress, key=lambda x: x["enrollment_date"], reverse=True
-            ),
-        }
+        student_progress_data = build_student_progress(user)
 
         # Cache the data for 15 minutes
         cache.set(cache_key, student_progress_data, 15 * 60)
@@ -1052,190 +892,146 @@ class StudentQuizPerformanceAPI(APIView):
                     )
 
         # Try to get cached data first
-        cache_key = f"student_quiz_performance_{user.id}"
+        cache_key = student_quiz_performance_key(user.id)
         cached_data = cache.get(cache_key)
 
         if cached_data:
             return Response(cached_data)
 
-        # Get all quiz attempts for this user
-        quiz_attempts = QuizAttempt.objects.filter(
-            user=user, completion_status="completed"
-        ).select_related("quiz", "quiz__course")
+        performance_data = build_student_quiz_performance(user)
 
-        # Calculate overall statistics
-        total_attempts = quiz_attempts.count()
+        # Cache the data for 15 minutes, once there is something to show
+        if performance_data["overall_stats"]["total_attempts"]:
+            cache.set(cache_key, performance_data, 15 * 60)
 
-        if total_attempts == 0:
-            # No quiz attempts yet
-            return Response(
-                {
-                    "user_info": {
-                        "id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                        "full_name": f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip(),
-                    },
-                    "overall_stats": {
-                        "total_attempts": 0,
-                        "average_score": 0,
-                        "quizzes_passed": 0,
-                        "quizzes_failed": 0,
-                    },
-                    "course_breakdown": [],
-                    "recent_attempts": [],
-                    "performance_by_category": [],
-                }
-            )
-
-        # Calculate average score
-        avg_score = quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
-
-        # Count passed/failed quizzes (assuming 60% is passing)
-        passed_quizzes = quiz_attempts.filter(score__gte=60).count()
-        failed_quizzes = quiz_attempts.filter(score__lt=60).count()
-
-        # Get quiz responses for detailed analysis
-        quiz_responses = QuizResponse.objects.filter(
-            quiz_attempt__in=quiz_attempts
-        ).select_related("question", "selected_option", "quiz_attempt")
-
-        # Performance by course
-        course_breakdown = []
-
-        # Group attempts by course
-        course_attempts = {}
-        for attempt in quiz_attempts:
-            course_id = attempt.quiz.course.id
-            course_title = attempt.quiz.course.title
-
-            if course_id not in course_attempts:
-                course_attempts[course_id] = {
-                    "course_id": course_id,
-                    "course_title": course_title,
-                    "attempts": [],
-                    "quizzes": set(),
-                }
-
-            course_attempts[course_id]["attempts"].append(attempt)
-            course_attempts[course_id]["quizzes"].add(attempt.quiz.id)
+        return Response(performance_data)
 
-        # Calculate course-specific statistics
-        for course_id, data in course_attempts.items():
-            attempts = data["attempts"]
-            course_avg_score = sum(a.score for a in attempts) / len(attempts)
 
-            course_breakdown.append(
-                {
-                    "course_id": data["course_id"],
-                    "course_title": data["course_title"],
-                    "total_quizzes": len(data["quizzes"]),
-                    "total_attempts": len(attempts),
-                    "average_score": round(course_avg_score, 2),
-                    "highest_score": round(max(a.score for a in attempts), 2),
-                    "lowest_score": round(min(a.score for a in attempts), 2),
-                }
-            )
+class QuizScoreStatsAPI(APIView):
+    """
+    API endpoint for the score distribution of a quiz, over all attempts,
+    first attempts and best attempts, and where the requesting learner stands.
+    Served from cached sorted score arrays, so it does not scan the attempts.
+    """
 
-        # Sort by average score (descending)
-        course_breakdown.sort(key=lambda x: x["average_score"], reverse=True)
+    permission_classes = [permissions.IsAuthenticated]
+    # Only role and enrollment checks on the user, so token claims are enough
+    stateless_auth = True
 
-        # Recent quiz attempts (last 5)
-        recent_attempts = []
+    def get(self, request, pk=None):
+        """
+        Get score statistics for a quiz
 
-        for attempt in quiz_attempts.order_by("-attempt_date")[:5]:
-            # Get responses for this attempt
-            attempt_responses = quiz_responses.filter(quiz_attempt=attempt)
+        Parameters:
+            pk (int): The quiz ID
+            percentiles (query, optional): comma separated percentiles to
+              report, 10,25,50,75,90 by default
 
-            # Count correct/incorrect responses
-            correct_responses = attempt_responses.filter(is_correct=True).count()
-            total_responses = attempt_responses.count()
+        Returns:
+            - attempts, first_attempts, best_attempts: count, mean, extremes,
+              quartiles, percentiles and a 10-bucket histogram
+            - your_scores: the requesting user's first and best scores and
+              the percentage of learners they beat, or None without attempts
+        """
+        course_id = (
+            LearningTask.objects.filter(pk=pk, task_type="quiz")
+            .values_list("course_id", flat=True)
+            .first()
+        )
+        if course_id is None:
+            return Response({"error": "Quiz not found."}, status=404)
 
-            recent_attempts.append(
-                {
-                    "attempt_id": attempt.id,
-                    "quiz_id": attempt.quiz.id,
-                    "quiz_title": attempt.quiz.title,
-                    "course_title": attempt.quiz.course.title,
-                    "score": round(attempt.score, 2),
-                    "correct_answers": correct_responses,
-                    "total_questions": total_responses,
-                    "submission_time": attempt.attempt_date,
-                    "time_spent": (
-                        str(attempt.attempt_date - attempt.started_at)
-                        if attempt.started_at
-                        else None
-                    ),
-                }
+        user_role = getattr(request.user, "role", "")
+        is_staff = getattr(request.user, "is_staff", False)
+        if not (
+            user_role in ["instructor", "admin"]
+            or is_staff
+            or is_enrolled(request.user.id, course_id, request)
+        ):
+            return Response(
+                {"error": "You must be enrolled in the course to view quiz scores"},
+                status=403,
             )
 
-        # Performance by question category/tag (if available)
-        performance_by_category = []
-
-        # Analyze question categories (assuming questions have categories/tags)
-        question_categories = {}
-
-        for response in quiz_responses:
-            # Get the question's category or tag (if available)
-            category = getattr(response.question, "category", None) or getattr(
-                response.question, "tag", None
+        try:
+            percentiles = parse_percentiles(request.query_params.get("percentiles"))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        scores = get_quiz_scores(pk)
+        own = scores.learner_scores(request.user.id)
+        if own is not None:
+            own.update(
+                first_percentile_rank=scores.percentile_rank(own["first"], "first"),
+                best_percentile_rank=scores.percentile_rank(own["best"], "best"),
             )
 
-            if category:
-                if category not in question_categories:
-                    question_categories[category] = {"total": 0, "correct": 0}
-
-                question_categories[category]["total"] += 1
+        return Response(
+            {
+                "quiz_id": pk,
+                "attempts": scores.summary("all", percentiles),
+                "first_attempts": scores.summary("first", percentiles),
+                "best_attempts": scores.summary("best", percentiles),
+                "your_scores": own,
+            }
+        )
 
-                if response.is_correct:
-                    question_categories[category]["correct"] += 1
 
-        # Calculate success rate by category
-        for category, data in question_categories.items():
-            success_rate = (
-                (data["correct"] / data["total"]) * 100 if data["total"] > 0 else 0
-            )
+class QuizThresholdSimulationAPI(APIView):
+    """
+    API endpoint for trying out pass thresholds and question weights on a
+    quiz's completed attempts. All scenarios are evaluated together on the
+    cached response matrix, so no queries run per scenario.
+    """
 
-            performance_by_category.append(
-                {
-                    "category": category,
-                    "total_questions": data["total"],
-                    "correct_answers": data["correct"],
-                    "success_rate": round(success_rate, 2),
-                }
-            )
+    permission_classes = [permissions.IsAuthenticated, IsInstructorOrAdmin]
 
-        # Sort by success rate (ascending, to highlight problematic categories)
-        performance_by_category.sort(key=lambda x: x["success_rate"])
+    def post(self, request, pk=None):
+        """
+        Simulate pass rates for a quiz
 
-        # Compile results
-        performance_data = {
-            "user_info": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "full_name": f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip(),
-            },
-            "overall_stats": {
-                "total_attempts": total_attempts,
-                "average_score": round(avg_score, 2),
-                "quizzes_passed": passed_quizzes,
-                "quizzes_failed": failed_quizzes,
-                "pass_rate": (
-                    round((passed_quizzes / total_attempts) * 100, 2)
-                    if total_attempts > 0
-                    else 0
-                ),
-            },
-            "course_breakdown": course_breakdown,
-            "recent_attempts": recent_attempts,
-            "performance_by_category": performance_by_category,
-        }
+        Parameters:
+            pk (int): The quiz ID
+            thresholds (list): candidate pass thresholds (0-100)
+            scenarios (list, optional): named question weightings, each
+              {"name": ..., "points": {question_id: points}}; questions not
+              listed keep their points
 
-        # Cache the data for 15 minutes
-        cache.set(cache_key, performance_data, 15 * 60)
+        Returns:
+            - current_threshold, attempts, learners
+            - scenarios: the recorded scores first, then each weighting, with
+              the attempts and learners passing each threshold
+        """
+        quiz = QuizTask.objects.filter(pk=pk).values("pass_threshold").first()
+        if quiz is None:
+            return Response({"error": "Quiz not found."}, status=404)
+
+        serializer = ThresholdSimulationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        scenarios = serializer.validated_data["scenarios"]
+
+        matrix = get_quiz_response_matrix(pk)
+        unknown = {
+            question_id
+            for scenario in scenarios
+            for question_id in scenario["points"]
+        } - set(matrix.question_ids.tolist())
+        if unknown:
+            return Response(
+                {"error": f"Questions not in this quiz: {sorted(unknown)}"},
+                status=400,
+            )
 
-        return Response(performance_data)
+        simulation = simulate_thresholds(
+            matrix, serializer.validated_data["thresholds"], scenarios
+        )
+        return Response(
+            {
+                "quiz_id": pk,
+                "current_threshold": quiz["pass_threshold"],
+                **simulation,
+            }
+        )
 
 
 class CourseProgressAPI(APIView):
@@ -1245,7 +1041,7 @@ class CourseProgressAPI(APIView):
         """Calculate course progress on demand without storing progress data"""
         # Get all learning tasks for the course
         tasks = LearningTask.objects.filter(course_id=course_id).values(
-            "id", "title", "type", "order"
+            "id", "title", "task_type", "order"
         )
 
         # Get all completed tasks for this user in this course
@@ -1265,7 +1061,7 @@ class CourseProgressAPI(APIView):
                 {
                     "task_id": task["id"],
                     "title": task["title"],
-                    "type": task["type"],
+                    "type": task["task_type"],
                     "status": task_status,
                     "order": task["order"],
                 }
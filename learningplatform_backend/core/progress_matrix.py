@@ -0,0 +1,263 @@
+"""
+Course progress matrix: the status and completion time of every enrolled
+learner on every task of a course, as compact NumPy arrays.
+
+Analytics rollups (completion distributions and histograms, per-task
+funnels, completion time percentiles) are computed from the arrays in
+vectorized form instead of by looping over ``TaskProgress`` rows in Python.
+A matrix is loaded with three ``values_list`` queries and cached in
+compressed form until ``core.signals`` reports a change to the course's
+progress, enrollments or tasks.
+"""
+
+import io
+import logging
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Case, DurationField, ExpressionWrapper, F, Q, When
+
+from .caching import progress_matrix_key
+from .models import CourseEnrollment, LearningTask, TaskProgress
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Values of the status array
+NOT_STARTED = 0
+IN_PROGRESS = 1
+COMPLETED = 2
+
+# Signals drop stale matrices; the timeout only bounds how long a matrix can
+# survive queryset updates, which send no signals
+CACHE_TIMEOUT = 60 * 60
+
+_STATUS_CODES = {"in_progress": IN_PROGRESS, "completed": COMPLETED}
+
+
+class ProgressMatrix:
+    """
+    Progress of ``len(user_ids)`` learners (rows, by user id) on
+    ``len(task_ids)`` tasks (columns, in course order).
+
+    ``status`` holds ``NOT_STARTED``, ``IN_PROGRESS`` or ``COMPLETED``;
+    learners without a progress row for a task have not started it.
+    ``hours`` holds the time from start to completion of completed tasks and
+    NaN where it is unknown. ``enrolled_at`` holds each learner's enrollment
+    time.
+    """
+
+    ARRAYS = ("user_ids", "enrolled_at", "task_ids", "status", "hours")
+
+    def __init__(self, user_ids, enrolled_at, task_ids, status, hours):
+        self.user_ids = user_ids
+        self.enrolled_at = enrolled_at
+        self.task_ids = task_ids
+        self.status = status
+        self.hours = hours
+
+    @classmethod
+    def load(cls, course_id):
+        """Build the matrix of a course from the database, in three queries."""
+        task_ids = np.fromiter(
+            LearningTask.objects.filter(course_id=course_id)
+            .order_by("order", "id")
+            .values_list("id", flat=True),
+            dtype=np.int64,
+        )
+        enrollments = list(
+            CourseEnrollment.objects.filter(course_id=course_id)
+            .order_by("user_id")
+            .values_list("user_id", "enrollment_date")
+        )
+        user_ids = np.fromiter(
+            (user_id for user_id, _ in enrollments),
+            dtype=np.int64,
+            count=len(enrollments),
+        )
+        enrolled_at = np.fromiter(
+            (int(date.timestamp()) for _, date in enrollments),
+            dtype=np.int64,
+            count=len(enrollments),
+        ).astype("datetime64[s]")
+
+        timed = Q(
+            status="completed", start_date__isnull=False, completion_date__isnull=False
+        )
+        rows = list(
+            TaskProgress.objects.filter(task__course_id=course_id).values_list(
+                "user_id",
+                "task_id",
+                "status",
+                Case(
+                    When(
+                        timed,
+                        then=ExpressionWrapper(
+                            F("completion_date") - F("start_date"),
+                            output_field=DurationField(),
+                        ),
+                    ),
+                    output_field=DurationField(),
+                ),
+            )
+        )
+        users = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        tasks = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        codes = np.fromiter(
+            (_STATUS_CODES.get(row[2], NOT_STARTED) for row in rows),
+            dtype=np.int8,
+            count=len(rows),
+        )
+        hours = np.fromiter(
+            (
+                np.nan if row[3] is None else row[3].total_seconds() / 3600
+                for row in rows
+            ),
+            dtype=np.float64,
+            count=len(rows),
+        )
+
+        # Place each progress row; rows of learners who are not enrolled
+        # (any more), or on tasks added since the task query, are left out
+        user_rows = _positions(user_ids, users)
+        task_order = np.argsort(task_ids)
+        task_positions = _positions(task_ids[task_order], tasks)
+        placed = (user_rows >= 0) & (task_positions >= 0)
+        user_rows = user_rows[placed]
+        task_columns = task_order[task_positions[placed]]
+
+        shape = (len(user_ids), len(task_ids))
+        status = np.zeros(shape, dtype=np.int8)
+        status[user_rows, task_columns] = codes[placed]
+        duration = np.full(shape, np.nan, dtype=np.float32)
+        duration[user_rows, task_columns] = hours[placed]
+        return cls(user_ids, enrolled_at, task_ids, status, duration)
+
+    def select(self, rows):
+        """The matrix of the learners selected by ``rows`` (a mask or indices)."""
+        return ProgressMatrix(
+            self.user_ids[rows],
+            self.enrolled_at[rows],
+            self.task_ids,
+            self.status[rows],
+            self.hours[rows],
+        )
+
+    def cohorts(self):
+        """Yield ``("YYYY-MM", matrix)`` per enrollment month, oldest first."""
+        months = self.enrolled_at.astype("datetime64[M]")
+        for month in np.unique(months):
+            yield str(month), self.select(months == month)
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer, **{name: getattr(self, name) for name in self.ARRAYS}
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            return cls(**{name: arrays[name] for name in cls.ARRAYS})
+
+    def completion_rates(self):
+        """Percentage of the course's tasks each learner has completed."""
+        if not len(self.task_ids):
+            return np.zeros(len(self.user_ids))
+        return (self.status == COMPLETED).sum(axis=1) * 100 / len(self.task_ids)
+
+    def completion_distribution(self):
+        """Average completion rate and the number of learners per quarter."""
+        rates = self.completion_rates()
+        counts, _ = np.histogram(rates, bins=[0, 25, 50, 75, np.inf])
+        return {
+            "average": round(float(rates.mean()), 2) if rates.size else 0,
+            "distribution": dict(
+                zip(("below_25", "25_to_50", "50_to_75", "above_75"), counts.tolist())
+            ),
+        }
+
+    def completion_histogram(self, bins=10):
+        """Learners per completion rate bucket, ``bins`` equal buckets of 0-100."""
+        counts, edges = np.histogram(self.completion_rates(), bins=bins, range=(0, 100))
+        return {"edges": edges.round(2).tolist(), "counts": counts.tolist()}
+
+    def task_funnel(self):
+        """
+        Learners who reached (started it or any later task), started and
+        completed each task, in course order.
+        """
+        started = self.status != NOT_STARTED
+        reached = np.logical_or.accumulate(started[:, ::-1], axis=1)[:, ::-1]
+        return [
+            {
+                "task_id": task_id,
+                "reached": reached_count,
+                "started": started_count,
+                "completed": completed_count,
+            }
+            for task_id, reached_count, started_count, completed_count in zip(
+                self.task_ids.tolist(),
+                reached.sum(axis=0).tolist(),
+                started.sum(axis=0).tolist(),
+                (self.status == COMPLETED).sum(axis=0).tolist(),
+            )
+        ]
+
+    def completion_time_percentiles(self, percentiles=(50, 90)):
+        """
+        Completion time percentiles in hours per task, interpolated like
+        ``PERCENTILE_CONT``; None for tasks without timed completions.
+        """
+        timed = ~np.isnan(self.hours)
+        has_times = timed.any(axis=0)
+        values = np.full((len(percentiles), len(self.task_ids)), np.nan)
+        if has_times.any():
+            values[:, has_times] = np.nanpercentile(
+                self.hours[:, has_times].astype(np.float64), percentiles, axis=0
+            )
+        return [
+            {
+                "task_id": task_id,
+                "timed_completions": count,
+                **{
+                    f"p{p}": None if np.isnan(value) else value
+                    for p, value in zip(percentiles, column)
+                },
+            }
+            for task_id, count, column in zip(
+                self.task_ids.tolist(),
+                timed.sum(axis=0).tolist(),
+                values.round(2).T.tolist(),
+            )
+        ]
+
+
+def _positions(sorted_ids, ids):
+    """Index of each of ``ids`` in ``sorted_ids``, or -1 where it is missing."""
+    if not len(sorted_ids):
+        return np.full(len(ids), -1, dtype=np.int64)
+    positions = np.searchsorted(sorted_ids, ids)
+    clipped = np.minimum(positions, len(sorted_ids) - 1)
+    return np.where(sorted_ids[clipped] == ids, clipped, -1)
+
+
+def get_progress_matrix(course_id):
+    """Return the course's matrix, from the cache when it is current."""
+    key = progress_matrix_key(course_id)
+    data = cache.get(key)
+    if data is not None:
+        return ProgressMatrix.from_bytes(data)
+
+    matrix = ProgressMatrix.load(course_id)
+    data = matrix.to_bytes()
+    cache.set(key, data, CACHE_TIMEOUT)
+    logger.debug(
+        "Cached progress matrix of course %s: %s learners x %s tasks, %s bytes",
+        course_id,
+        len(matrix.user_ids),
+        len(matrix.task_ids),
+        len(data),
+    )
+    return matrix
@@ -0,0 +1,363 @@
+"""
+Scores and responses of a quiz's completed attempts, as NumPy arrays.
+
+``QuizScores`` answers histograms, quartiles, percentiles and percentile
+ranks ("better than 72% of learners") from sorted score arrays by binary
+search instead of by scanning the attempts table. ``QuizResponseMatrix``
+holds which questions each attempt answered correctly, so pass thresholds
+and question weights can be tried out without re-running queries.
+
+Both are loaded with ``values_list`` queries and cached in compressed form
+until ``core.signals`` reports a change to the quiz's attempts, responses or
+questions.
+"""
+
+import io
+import logging
+
+import numpy as np
+from django.core.cache import cache
+
+from .caching import quiz_responses_key, quiz_scores_key
+from .models import QuizAttempt, QuizQuestion, QuizResponse
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Signals drop stale arrays; the timeout only bounds how long they can
+# survive queryset updates, which send no signals
+CACHE_TIMEOUT = 60 * 60
+
+# Which attempts a distribution is made of
+DISTRIBUTIONS = ("all", "first", "best")
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+MAX_PERCENTILES = 20
+
+# Upper bounds for a single threshold simulation request
+MAX_SIMULATED_THRESHOLDS = 50
+MAX_SIMULATED_SCENARIOS = 50
+
+
+def _column(rows, index, dtype):
+    """Column ``index`` of ``values_list`` rows as an array."""
+    return np.fromiter((row[index] for row in rows), dtype=dtype, count=len(rows))
+
+
+class QuizScores:
+    """
+    Scores of a quiz's completed attempts.
+
+    ``learner_ids`` lists the learners with attempts in ascending order, with
+    their ``first`` and ``best`` scores alongside. ``sorted_all``,
+    ``sorted_first`` and ``sorted_best`` hold the scores of every attempt, of
+    first attempts and of best attempts in ascending order.
+    """
+
+    ARRAYS = (
+        "learner_ids",
+        "first",
+        "best",
+        "sorted_all",
+        "sorted_first",
+        "sorted_best",
+    )
+
+    def __init__(self, learner_ids, first, best, sorted_all, sorted_first, sorted_best):
+        self.learner_ids = learner_ids
+        self.first = first
+        self.best = best
+        self.sorted_all = sorted_all
+        self.sorted_first = sorted_first
+        self.sorted_best = sorted_best
+
+    @classmethod
+    def from_attempts(cls, user_ids, scores):
+        """
+        Build from per-attempt arrays, grouped by user and in attempt order
+        within each user.
+        """
+        # Index of each learner's first attempt
+        starts = np.flatnonzero(np.diff(user_ids, prepend=-1))
+        first = scores[starts]
+        best = np.maximum.reduceat(scores, starts)
+        return cls(
+            user_ids[starts],
+            first,
+            best,
+            np.sort(scores),
+            np.sort(first),
+            np.sort(best),
+        )
+
+    @classmethod
+    def load(cls, quiz_id):
+        rows = list(
+            QuizAttempt.objects.filter(quiz_id=quiz_id, completion_status="completed")
+            .order_by("user_id", "attempt_date", "id")
+            .values_list("user_id", "score")
+        )
+        return cls.from_attempts(
+            _column(rows, 0, np.int64), _column(rows, 1, np.float64)
+        )
+
+    def sorted(self, distribution):
+        """Ascending scores of one of ``DISTRIBUTIONS``."""
+        return getattr(self, f"sorted_{distribution}")
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer, **{name: getattr(self, name) for name in self.ARRAYS}
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            return cls(**{name: arrays[name] for name in cls.ARRAYS})
+
+    def summary(self, distribution="all", percentiles=DEFAULT_PERCENTILES, bins=10):
+        """
+        Count, mean, extremes, quartiles, ``percentiles`` (interpolated like
+        ``PERCENTILE_CONT``) and a histogram of ``bins`` equal buckets of
+        0-100 for one of ``DISTRIBUTIONS``.
+        """
+        scores = self.sorted(distribution)
+        counts, edges = np.histogram(scores, bins=bins, range=(0, 100))
+        histogram = {"edges": edges.round(2).tolist(), "counts": counts.tolist()}
+        if not len(scores):
+            return {
+                "count": 0,
+                "mean": None,
+                "min": None,
+                "max": None,
+                "quartiles": None,
+                "percentiles": {f"p{p:g}": None for p in percentiles},
+                "histogram": histogram,
+            }
+
+        q1, median, q3 = np.percentile(scores, (25, 50, 75)).round(2).tolist()
+        values = np.percentile(scores, percentiles).round(2).tolist()
+        return {
+            "count": len(scores),
+            "mean": round(float(scores.mean()), 2),
+            "min": float(scores[0]),
+            "max": float(scores[-1]),
+            "quartiles": {"q1": q1, "median": median, "q3": q3},
+            "percentiles": {f"p{p:g}": value for p, value in zip(percentiles, values)},
+            "histogram": histogram,
+        }
+
+    def percentile_rank(self, score, distribution="best"):
+        """Percentage of the distribution's scores strictly below ``score``."""
+        scores = self.sorted(distribution)
+        if not len(scores):
+            return None
+        below = np.searchsorted(scores, score, side="left")
+        return round(float(below * 100 / len(scores)), 2)
+
+    def learner_scores(self, user_id):
+        """The learner's first and best scores, or None without attempts."""
+        index = np.searchsorted(self.learner_ids, user_id)
+        if index == len(self.learner_ids) or self.learner_ids[index] != user_id:
+            return None
+        return {"first": float(self.first[index]), "best": float(self.best[index])}
+
+
+class QuizResponseMatrix:
+    """
+    Completed attempts (rows, grouped by user and in attempt order) against
+    the quiz's questions (columns, by id).
+
+    ``scores`` holds the recorded score of each attempt and ``user_ids`` its
+    learner. ``answered`` and ``correct`` mark the questions each attempt
+    responded to and got right; ``points`` holds each question's points.
+    """
+
+    ARRAYS = ("user_ids", "scores", "question_ids", "points", "answered", "correct")
+
+    def __init__(self, user_ids, scores, question_ids, points, answered, correct):
+        self.user_ids = user_ids
+        self.scores = scores
+        self.question_ids = question_ids
+        self.points = points
+        self.answered = answered
+        self.correct = correct
+
+    @classmethod
+    def load(cls, quiz_id):
+        """Build the matrix of a quiz from the database, in three queries."""
+        attempts = list(
+            QuizAttempt.objects.filter(quiz_id=quiz_id, completion_status="completed")
+            .order_by("user_id", "attempt_date", "id")
+            .values_list("id", "user_id", "score")
+        )
+        questions = list(
+            QuizQuestion.objects.filter(quiz_id=quiz_id)
+            .order_by("id")
+            .values_list("id", "points")
+        )
+        responses = list(
+            QuizResponse.objects.filter(
+                attempt__quiz_id=quiz_id,
+                attempt__completion_status="completed",
+                question__quiz_id=quiz_id,
+            ).values_list("attempt_id", "question_id", "is_correct")
+        )
+
+        attempt_ids = _column(attempts, 0, np.int64)
+        question_ids = _column(questions, 0, np.int64)
+        # Attempt ids are not sorted (attempts are grouped by user)
+        attempt_order = np.argsort(attempt_ids)
+        rows = attempt_order[
+            np.searchsorted(
+                attempt_ids[attempt_order], _column(responses, 0, np.int64)
+            )
+        ]
+        columns = np.searchsorted(question_ids, _column(responses, 1, np.int64))
+
+        shape = (len(attempts), len(questions))
+        answered = np.zeros(shape, dtype=bool)
+        answered[rows, columns] = True
+        correct = np.zeros(shape, dtype=bool)
+        correct[rows, columns] = _column(responses, 2, bool)
+        return cls(
+            _column(attempts, 1, np.int64),
+            _column(attempts, 2, np.float64),
+            question_ids,
+            _column(questions, 1, np.float64),
+            answered,
+            correct,
+        )
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer, **{name: getattr(self, name) for name in self.ARRAYS}
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            return cls(**{name: arrays[name] for name in cls.ARRAYS})
+
+    def weighted_scores(self, weightings):
+        """
+        Attempt scores (rows) under each of ``weightings`` (columns), each a
+        ``{question_id: points}`` override of the questions' points. Scores
+        are the share of the answered questions' points earned, like the
+        recorded score with every question worth its points.
+        """
+        weights = np.repeat(self.points[:, np.newaxis], len(weightings), axis=1)
+        for column, weighting in enumerate(weightings):
+            for question_id, points in weighting.items():
+                row = np.searchsorted(self.question_ids, question_id)
+                weights[row, column] = points
+        earned = self.correct.astype(np.float64) @ weights
+        possible = self.answered.astype(np.float64) @ weights
+        return np.divide(
+            earned * 100, possible, out=np.zeros_like(earned), where=possible > 0
+        )
+
+    def simulate(self, thresholds, weightings=()):
+        """
+        Attempts and learners passing each of ``thresholds`` under the
+        recorded scores (first row) and under each of ``weightings`` (next
+        rows), as two arrays of shape ``(1 + len(weightings), len(thresholds))``.
+        A learner passes when any of their attempts does.
+        """
+        scores = self.scores[:, np.newaxis]
+        if weightings:
+            scores = np.hstack([scores, self.weighted_scores(weightings)])
+        passed = scores[:, :, np.newaxis] >= np.asarray(thresholds, dtype=np.float64)
+
+        attempts_passed = passed.sum(axis=0)
+        if not len(self.user_ids):
+            return attempts_passed, attempts_passed
+        starts = np.flatnonzero(np.diff(self.user_ids, prepend=-1))
+        learners_passed = np.logical_or.reduceat(passed, starts, axis=0).sum(axis=0)
+        return attempts_passed, learners_passed
+
+    def learner_count(self):
+        return int(np.count_nonzero(np.diff(self.user_ids, prepend=-1)))
+
+
+def parse_percentiles(value):
+    """
+    Parse a comma separated list of percentiles (0-100), as given in a query
+    string. Raises ``ValueError`` with a message for the client.
+    """
+    if not value:
+        return DEFAULT_PERCENTILES
+    try:
+        percentiles = tuple(float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("percentiles must be comma separated numbers")
+    if len(percentiles) > MAX_PERCENTILES:
+        raise ValueError(f"At most {MAX_PERCENTILES} percentiles can be requested")
+    if any(not 0 <= p <= 100 for p in percentiles):
+        raise ValueError("percentiles must be between 0 and 100")
+    return percentiles
+
+
+def simulate_thresholds(matrix, thresholds, scenarios=()):
+    """
+    Pass counts and rates for each threshold under the recorded scores and
+    under each ``{"name", "points"}`` scenario, computed in one pass.
+    """
+    attempts_passed, learners_passed = matrix.simulate(
+        thresholds, [scenario["points"] for scenario in scenarios]
+    )
+    attempts = len(matrix.scores)
+    learners = matrix.learner_count()
+    attempt_percent = 100 / attempts if attempts else 0
+    learner_percent = 100 / learners if learners else 0
+    names = ["recorded"] + [scenario["name"] for scenario in scenarios]
+    return {
+        "attempts": attempts,
+        "learners": learners,
+        "scenarios": [
+            {
+                "name": name,
+                "results": [
+                    {
+                        "threshold": threshold,
+                        "attempts_passed": attempt_count,
+                        "attempt_pass_rate": round(attempt_count * attempt_percent, 2),
+                        "learners_passed": learner_count,
+                        "learner_pass_rate": round(learner_count * learner_percent, 2),
+                    }
+                    for threshold, attempt_count, learner_count in zip(
+                        thresholds, attempt_row, learner_row
+                    )
+                ],
+            }
+            for name, attempt_row, learner_row in zip(
+                names, attempts_passed.tolist(), learners_passed.tolist()
+            )
+        ],
+    }
+
+
+def _cached_arrays(cls, key, quiz_id):
+    data = cache.get(key)
+    if data is not None:
+        return cls.from_bytes(data)
+
+    arrays = cls.load(quiz_id)
+    data = arrays.to_bytes()
+    cache.set(key, data, CACHE_TIMEOUT)
+    logger.debug("Cached %s of quiz %s: %s bytes", cls.__name__, quiz_id, len(data))
+    return arrays
+
+
+def get_quiz_scores(quiz_id):
+    """Return the quiz's score arrays, from the cache when they are current."""
+    return _cached_arrays(QuizScores, quiz_scores_key(quiz_id), quiz_id)
+
+
+def get_quiz_response_matrix(quiz_id):
+    """Return the quiz's response matrix, from the cache when it is current."""
+    return _cached_arrays(QuizResponseMatrix, quiz_responses_key(quiz_id), quiz_id)
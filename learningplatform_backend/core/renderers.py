@@ -0,0 +1,78 @@
+"""
+JSON renderer and parser backed by orjson when it is installed.
+
+Both classes are drop-in replacements for DRF's ``JSONRenderer`` and
+``JSONParser`` and fall back to them when orjson is missing or cannot handle
+a payload (indented browsable output, integers wider than 64 bits, ...).
+Types orjson does not know natively (``timedelta``, ``Decimal``, lazy
+strings, querysets) are converted by DRF's own encoder, so the output is the
+same as with the stdlib backend.
+"""
+
+import logging
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# DRF escapes these for JavaScript compatibility, so do the same
+_LINE_SEPARATOR = "\u2028".encode("utf-8")
+_PARAGRAPH_SEPARATOR = "\u2029".encode("utf-8")
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that serializes with orjson when available."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # orjson always writes compact, unescaped UTF-8
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        try:
+            ret = orjson.dumps(
+                data,
+                default=encoder.default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError as e:
+            logger.debug("orjson could not render payload, falling back: %s", e)
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if _LINE_SEPARATOR in ret or _PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(_LINE_SEPARATOR, b"\\u2028").replace(
+                _PARAGRAPH_SEPARATOR, b"\\u2029"
+            )
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` that decodes UTF-8 bodies with orjson when available."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as e:
+            raise ParseError("JSON parse error - %s" % str(e))
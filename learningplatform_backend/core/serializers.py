@@ -1,14 +1,68 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (TokenObtainPairSerializer,
+                                                  TokenRefreshSerializer)
 
+from .course_versions import create_course_version, get_version_snapshot
+from .quiz_scores import MAX_SIMULATED_SCENARIOS, MAX_SIMULATED_THRESHOLDS
+from .token_blacklist import CachedBlacklistRefreshToken
 from .models import (Course, CourseEnrollment, CourseVersion, LearningTask,
-                     QuizAttempt, QuizOption, QuizQuestion, QuizResponse,
-                     QuizTask, StatusTransition, TaskProgress, User)
+                     QuestionTag, QuizAttempt, QuizOption, QuizQuestion,
+                     QuizResponse, QuizTask, StatusTransition, TaskProgress,
+                     User)
 
 
-class UserSerializer(serializers.ModelSerializer):
+def requested_fields(request, param):
+    """
+    Return the set of names in a comma separated query parameter such as
+    ``?fields=id,score``, or None when the parameter is absent.
+    """
+    value = request.query_params.get(param) if request is not None else None
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Lets clients shape read payloads with ``?fields=`` and ``?expand=``.
+
+    ``?fields=id,score`` keeps only the named fields. Fields listed in
+    ``Meta.expandable_fields`` are left out of list responses unless named in
+    ``?expand=`` (or ``?fields=``). Only the top-level serializer of a GET
+    request is affected, so nested and write serializers behave as before.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method != 'GET' or not self._is_top_level():
+            return fields
+
+        only = requested_fields(request, 'fields')
+        expand = requested_fields(request, 'expand') or set()
+
+        if isinstance(self.parent, serializers.ListSerializer):
+            for name in getattr(self.Meta, 'expandable_fields', ()):
+                if name not in expand and (only is None or name not in only):
+                    fields.pop(name, None)
+
+        if only is not None:
+            for name in set(fields) - only:
+                fields.pop(name)
+
+        return fields
+
+    def _is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'display_name', 'role']
@@ -42,6 +96,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['username'] = user.username
         token['email'] = user.email
         token['role'] = user.role
+        token['is_staff'] = user.is_staff
         return token
 
     def validate(self, attrs):
@@ -57,7 +112,13 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CachedBlacklistTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh that checks the blacklist through the cached index"""
+
+    token_class = CachedBlacklistRefreshToken
+
+
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     creator_details = UserSerializer(source='creator', read_only=True)
 
     class Meta:
@@ -70,19 +131,50 @@ class CourseSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'creator_details']
 
 
-class CourseVersionSerializer(serializers.ModelSerializer):
+class SnapshotField(serializers.JSONField):
+    """Reads a version's snapshot, rebuilding it from deltas when needed"""
+
+    def get_attribute(self, instance):
+        return get_version_snapshot(instance)
+
+
+class CourseVersionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     created_by_details = UserSerializer(source='created_by', read_only=True)
+    content_snapshot = SnapshotField()
 
     class Meta:
         model = CourseVersion
         fields = [
-            'id', 'course', 'version_number', 'created_at',
+            'id', 'course', 'version_number', 'created_at', 'is_checkpoint',
             'content_snapshot', 'notes', 'created_by', 'created_by_details'
         ]
-        read_only_fields = ['id', 'created_at', 'created_by_details']
+        read_only_fields = ['id', 'created_at', 'is_checkpoint', 'created_by_details']
+        # Snapshots are only listed with ?expand=content_snapshot
+        expandable_fields = ['content_snapshot']
 
-
-class StatusTransitionSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        return create_course_version(
+            validated_data['course'],
+            validated_data['version_number'],
+            validated_data['content_snapshot'],
+            notes=validated_data.get('notes', ''),
+            created_by=validated_data.get('created_by'),
+        )
+
+    def update(self, instance, validated_data):
+        # Later versions are stored relative to this one
+        for field in ('content_snapshot', 'course', 'version_number'):
+            if field in validated_data and (
+                field == 'content_snapshot'
+                or validated_data[field] != getattr(instance, field)
+            ):
+                raise serializers.ValidationError(
+                    {field: "Versions are immutable; create a new version instead."}
+                )
+        return super().update(instance, validated_data)
+
+
+class StatusTransitionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     changed_by_details = UserSerializer(source='changed_by', read_only=True)
 
     class Meta:
@@ -94,33 +186,47 @@ class StatusTransitionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'changed_at', 'changed_by_details']
 
 
-class LearningTaskSerializer(serializers.ModelSerializer):
+class LearningTaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = LearningTask
         fields = [
             'id', 'course', 'title', 'description',
-            'order', 'is_published', 'created_at', 'updated_at'
+            'order', 'is_published', 'task_type', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'task_type', 'created_at', 'updated_at']
 
 
-class QuizOptionSerializer(serializers.ModelSerializer):
+class QuizOptionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = QuizOption
         fields = ['id', 'question', 'text', 'is_correct', 'order']
         read_only_fields = ['id']
 
 
-class QuizQuestionSerializer(serializers.ModelSerializer):
+class QuestionTagSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = QuestionTag
+        fields = ['id', 'name', 'description']
+        read_only_fields = ['id']
+
+
+class QuizQuestionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     options = QuizOptionSerializer(many=True, read_only=True)
+    tags = serializers.SlugRelatedField(
+        many=True, slug_field='name', queryset=QuestionTag.objects.all(),
+        required=False
+    )
 
     class Meta:
         model = QuizQuestion
-        fields = ['id', 'quiz', 'text', 'explanation', 'points', 'order', 'options']
+        fields = [
+            'id', 'quiz', 'text', 'explanation', 'points', 'order', 'tags',
+            'options'
+        ]
         read_only_fields = ['id']
 
 
-class QuizTaskSerializer(serializers.ModelSerializer):
+class QuizTaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     questions = QuizQuestionSerializer(many=True, read_only=True)
 
     class Meta:
@@ -134,7 +240,7 @@ class QuizTaskSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class CourseEnrollmentSerializer(serializers.ModelSerializer):
+class CourseEnrollmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_details = UserSerializer(source='user', read_only=True)
     course_details = CourseSerializer(source='course', read_only=True)
     progress_percentage = serializers.SerializerMethodField()
@@ -148,10 +254,15 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'enrollment_date', 'user_details', 'course_details', 'progress_percentage']
 
     def get_progress_percentage(self, obj):
-        return obj.calculate_course_progress()
+        # Use the counts annotated by the viewset's query plan when present
+        total = getattr(obj, 'total_tasks_count', None)
+        completed = getattr(obj, 'completed_tasks_count', None)
+        if total is None or completed is None:
+            return obj.calculate_course_progress()
+        return (completed / total * 100) if total > 0 else 0
 
 
-class TaskProgressSerializer(serializers.ModelSerializer):
+class TaskProgressSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_details = UserSerializer(source='user', read_only=True)
     task_details = LearningTaskSerializer(source='task', read_only=True)
 
@@ -164,7 +275,7 @@ class TaskProgressSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user_details', 'task_details']
 
 
-class QuizResponseSerializer(serializers.ModelSerializer):
+class QuizResponseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     question_details = QuizQuestionSerializer(source='question', read_only=True)
     selected_option_details = QuizOptionSerializer(source='selected_option', read_only=True)
 
@@ -177,7 +288,7 @@ class QuizResponseSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'question_details', 'selected_option_details']
 
 
-class QuizAttemptSerializer(serializers.ModelSerializer):
+class QuizAttemptSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_details = UserSerializer(source='user', read_only=True)
     quiz_details = QuizTaskSerializer(source='quiz', read_only=True)
     responses = QuizResponseSerializer(many=True, read_only=True)
@@ -190,12 +301,163 @@ class QuizAttemptSerializer(serializers.ModelSerializer):
             'quiz_details', 'responses'
         ]
         read_only_fields = ['id', 'attempt_date', 'user_details', 'quiz_details', 'responses']
+        # The full quiz and every response are only listed with ?expand=
+        expandable_fields = ['quiz_details', 'responses']
 
 
-class NestedQuizAttemptSerializer(serializers.ModelSerializer):
+class NestedQuizAttemptSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """A simplified serializer for QuizAttempt when nested in other serializers"""
 
     class Meta:
         model = QuizAttempt
         fields = ['id', 'quiz', 'score', 'completion_status', 'attempt_date']
         read_only_fields = ['id', 'attempt_date']
+
+
+class TaskProgressBulkItemSerializer(serializers.Serializer):
+    """Validates a single entry of a bulk task progress update"""
+
+    task = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=['not_started', 'in_progress', 'completed'])
+    completion_date = serializers.DateTimeField(required=False, allow_null=True)
+    time_spent = serializers.DurationField(required=False)
+
+
+class ThresholdScenarioSerializer(serializers.Serializer):
+    """A named set of question point overrides, keyed by question id"""
+
+    name = serializers.CharField(max_length=100)
+    points = serializers.DictField(
+        child=serializers.FloatField(min_value=0), allow_empty=False
+    )
+
+
+class ThresholdSimulationSerializer(serializers.Serializer):
+    """Validates a pass threshold what-if request"""
+
+    thresholds = serializers.ListField(
+        child=serializers.FloatField(min_value=0, max_value=100),
+        min_length=1,
+        max_length=MAX_SIMULATED_THRESHOLDS,
+    )
+    scenarios = ThresholdScenarioSerializer(many=True, required=False, default=list)
+
+    def validate_scenarios(self, value):
+        if len(value) > MAX_SIMULATED_SCENARIOS:
+            raise serializers.ValidationError(
+                f"At most {MAX_SIMULATED_SCENARIOS} scenarios can be simulated."
+            )
+        for scenario in value:
+            try:
+                scenario['points'] = {
+                    int(question_id): points
+                    for question_id, points in scenario['points'].items()
+                }
+            except ValueError:
+                raise serializers.ValidationError(
+                    "Points must be keyed by question id."
+                )
+        return value
+
+
+class UserProvisionSerializer(serializers.Serializer):
+    """Validates a single account of a bulk user provisioning batch"""
+
+    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField()
+    display_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    role = serializers.ChoiceField(
+        choices=User._meta.get_field('role').choices, required=False, default='student'
+    )
+    password = serializers.CharField(
+        required=False, allow_blank=False, write_only=True, validators=[validate_password]
+    )
+    password_hash = serializers.CharField(required=False, allow_blank=False, write_only=True)
+    sso = serializers.BooleanField(required=False, default=False)
+
+    def validate_password_hash(self, value):
+        try:
+            identify_hasher(value)
+        except ValueError:
+            raise serializers.ValidationError("Unrecognised password hash format.")
+        return value
+
+    def validate(self, attrs):
+        if attrs.get('password') and attrs.get('password_hash'):
+            raise serializers.ValidationError(
+                "Provide either 'password' or 'password_hash', not both."
+            )
+        if attrs.get('sso') and (attrs.get('password') or attrs.get('password_hash')):
+            raise serializers.ValidationError("SSO accounts cannot have a password.")
+        return attrs
+
+
+# Course values the frontend knows about; the model itself accepts any string
+COURSE_STATUSES = ['draft', 'published', 'private', 'archived']
+COURSE_VISIBILITIES = ['public', 'private']
+
+
+class SnapshotOptionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = QuizOption
+        fields = ['text', 'is_correct', 'order', 'explanation']
+
+
+class SnapshotQuestionSerializer(serializers.ModelSerializer):
+    options = SnapshotOptionSerializer(many=True, required=False)
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=100), required=False
+    )
+
+    class Meta:
+        model = QuizQuestion
+        fields = ['text', 'explanation', 'points', 'order', 'options', 'tags']
+
+
+class SnapshotQuizSerializer(serializers.ModelSerializer):
+    questions = SnapshotQuestionSerializer(many=True, required=False)
+
+    class Meta:
+        model = QuizTask
+        fields = [
+            'time_limit_minutes', 'pass_threshold', 'max_attempts',
+            'randomize_questions', 'questions',
+        ]
+
+
+class SnapshotTaskSerializer(serializers.ModelSerializer):
+    quiz = SnapshotQuizSerializer(required=False, allow_null=True)
+
+    class Meta:
+        model = LearningTask
+        fields = ['title', 'description', 'order', 'is_published', 'quiz']
+
+
+class SnapshotCourseSerializer(serializers.ModelSerializer):
+    # Blank values are accepted so courses saved without them can be cloned
+    status = serializers.ChoiceField(
+        choices=COURSE_STATUSES, allow_blank=True, required=False
+    )
+    visibility = serializers.ChoiceField(
+        choices=COURSE_VISIBILITIES, allow_blank=True, required=False
+    )
+
+    class Meta:
+        model = Course
+        fields = [
+            'title', 'description', 'status', 'visibility',
+            'learning_objectives', 'prerequisites',
+        ]
+        extra_kwargs = {'description': {'allow_blank': True}}
+
+
+class CourseSnapshotSerializer(serializers.Serializer):
+    """
+    Validates a course content snapshot (see ``core.course_content``) before
+    ``core.course_clone`` bulk inserts it, which skips model validation.
+    """
+
+    course = SnapshotCourseSerializer()
+    tasks = SnapshotTaskSerializer(many=True)
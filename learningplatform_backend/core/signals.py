@@ -0,0 +1,163 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .caching import (
+    invalidate_cached_user,
+    invalidate_enrollment_cache,
+    invalidate_progress_matrices,
+    invalidate_quiz_content,
+    invalidate_quiz_scores,
+    set_user_deactivated,
+)
+from .models import (
+    CourseEnrollment,
+    LearningTask,
+    QuestionTag,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+    TaskProgress,
+    User,
+)
+from .token_blacklist import blacklist_index
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    """Keep the authentication user cache in step with the users table."""
+    invalidate_cached_user(instance.pk)
+    set_user_deactivated(
+        instance.pk, kwargs["signal"] is post_delete or not instance.is_active
+    )
+
+
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def drop_cached_enrollments(sender, instance, **kwargs):
+    """Keep the per-user enrollment sets used by permission checks current."""
+    invalidate_enrollment_cache([instance.user_id])
+
+
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+@receiver(post_save, sender=LearningTask)
+@receiver(post_delete, sender=LearningTask)
+@receiver(post_save, sender=QuizTask)
+@receiver(post_delete, sender=QuizTask)
+def drop_progress_matrix(sender, instance, **kwargs):
+    """The rows and columns of a course's progress matrix changed."""
+    invalidate_progress_matrices([instance.course_id])
+
+
+@receiver(post_save, sender=TaskProgress)
+@receiver(post_delete, sender=TaskProgress)
+def drop_progress_matrix_for_progress(sender, instance, **kwargs):
+    # Progress is usually saved with its task loaded; only look it up if not
+    if TaskProgress.task.is_cached(instance):
+        course_id = instance.task.course_id
+    else:
+        course_id = (
+            LearningTask.objects.filter(pk=instance.task_id)
+            .values_list("course_id", flat=True)
+            .first()
+        )
+    if course_id is not None:
+        invalidate_progress_matrices([course_id])
+
+
+@receiver(post_save, sender=QuizAttempt)
+@receiver(post_delete, sender=QuizAttempt)
+@receiver(post_save, sender=QuizQuestion)
+@receiver(post_delete, sender=QuizQuestion)
+def drop_quiz_scores(sender, instance, **kwargs):
+    """Keep the cached score and response arrays of the quiz current."""
+    invalidate_quiz_scores([instance.quiz_id])
+
+
+@receiver(post_save, sender=QuizResponse)
+@receiver(post_delete, sender=QuizResponse)
+def drop_quiz_scores_for_response(sender, instance, **kwargs):
+    # Only completed attempts are cached, and completing an attempt saves it
+    # (drop_quiz_scores), so answers to a loaded open attempt need nothing
+    if QuizResponse.attempt.is_cached(instance):
+        attempt = instance.attempt
+        if attempt.completion_status == "completed":
+            invalidate_quiz_scores([attempt.quiz_id])
+        return
+
+    quiz_id = (
+        QuizAttempt.objects.filter(
+            pk=instance.attempt_id, completion_status="completed"
+        )
+        .values_list("quiz_id", flat=True)
+        .first()
+    )
+    if quiz_id is not None:
+        invalidate_quiz_scores([quiz_id])
+
+
+@receiver(post_save, sender=QuizQuestion)
+@receiver(post_delete, sender=QuizQuestion)
+def drop_quiz_content_hash(sender, instance, **kwargs):
+    """Change the validators of quizzes whose questions changed."""
+    invalidate_quiz_content(instance.quiz_id)
+
+
+@receiver(post_save, sender=QuizOption)
+@receiver(post_delete, sender=QuizOption)
+def drop_quiz_content_hash_for_option(sender, instance, **kwargs):
+    quiz_id = (
+        QuizQuestion.objects.filter(pk=instance.question_id)
+        .values_list("quiz_id", flat=True)
+        .first()
+    )
+    invalidate_quiz_content(quiz_id)
+
+
+@receiver(m2m_changed, sender=QuizQuestion.tags.through)
+def drop_quiz_content_hash_for_tagging(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Tag assignments are part of a quiz's content digest."""
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_quiz_content(instance.quiz_id)
+        return
+
+    # Tagged from the tag side: ``instance`` is the tag
+    if action == "pre_clear":
+        questions = QuizQuestion.objects.filter(tags=instance)
+    elif action in ("post_add", "post_remove"):
+        questions = QuizQuestion.objects.filter(pk__in=pk_set)
+    else:
+        return
+    for quiz_id in questions.values_list("quiz_id", flat=True).distinct():
+        invalidate_quiz_content(quiz_id)
+
+
+@receiver(post_save, sender=QuestionTag)
+@receiver(pre_delete, sender=QuestionTag)
+def drop_quiz_content_hash_for_tag(sender, instance, **kwargs):
+    """Renamed or deleted tags change the quizzes whose questions use them."""
+    for quiz_id in (
+        QuizQuestion.objects.filter(tags=instance)
+        .values_list("quiz_id", flat=True)
+        .distinct()
+    ):
+        invalidate_quiz_content(quiz_id)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def publish_blacklisted_token(sender, instance, created, **kwargs):
+    """Make a new blacklist entry visible to the cached blacklist index."""
+    if created:
+        blacklist_index.record(instance)
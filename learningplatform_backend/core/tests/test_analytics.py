@@ -0,0 +1,486 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.analytics import interpolated_percentile
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuestionTag,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+    TaskProgress,
+)
+
+User = get_user_model()
+
+
+class AnalyticsTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.client.force_authenticate(user=self.instructor)
+
+    def make_course(self, students, questions):
+        """
+        A course with three reading tasks and one quiz. Student ``i``
+        completes ``i % 4`` of the four tasks, enrollments cycle through the
+        statuses and only the first question of the quiz is answered badly.
+        """
+        course = Course.objects.create(
+            title="Course", description="Description", creator=self.instructor
+        )
+        tasks = [
+            LearningTask.objects.create(course=course, title=f"Task {n}")
+            for n in range(3)
+        ]
+        quiz = QuizTask.objects.create(course=course, title="Quiz")
+        tasks.append(quiz)
+        quiz_questions = [
+            QuizQuestion.objects.create(quiz=quiz, text=f"Question {n}")
+            for n in range(questions)
+        ]
+        statuses = ["active", "completed", "dropped"]
+        for i in range(students):
+            student = User.objects.create_user(
+                username=f"student{course.id}_{i}",
+                email=f"student{course.id}_{i}@example.com",
+                password="studentpass",
+            )
+            CourseEnrollment.objects.create(
+                user=student, course=course, status=statuses[i % 3]
+            )
+            for n, task in enumerate(tasks):
+                TaskProgress.objects.create(
+                    user=student,
+                    task=task,
+                    status="completed" if n < i % 4 else "in_progress",
+                )
+            attempt = QuizAttempt.objects.create(
+                user=student,
+                quiz=quiz,
+                score=50 + i,
+                time_taken=timedelta(minutes=5),
+                completion_status="completed",
+            )
+            for n, question in enumerate(quiz_questions):
+                option = QuizOption.objects.create(question=question, text="A")
+                QuizResponse.objects.create(
+                    attempt=attempt,
+                    question=question,
+                    selected_option=option,
+                    is_correct=n > 0 or i % 5 == 0,
+                    time_spent=timedelta(seconds=10),
+                )
+        return course
+
+
+class CourseAnalyticsTests(AnalyticsTestCase):
+    def test_analytics_values(self):
+        course = self.make_course(students=8, questions=2)
+
+        data = self.client.get(f"/api/v1/courses/{course.id}/analytics/").json()
+
+        self.assertEqual(
+            data["enrollment_stats"],
+            {
+                "total": 8,
+                "active": 3,
+                "completed": 3,
+                "dropped": 2,
+                "completion_percentage": 37.5,
+            },
+        )
+        # Completion rates 0, 25, 50, 75, 0, 25, 50, 75
+        self.assertEqual(
+            data["completion_rates"],
+            {
+                "average": 37.5,
+                "distribution": {
+                    "below_25": 2,
+                    "25_to_50": 2,
+                    "50_to_75": 2,
+                    "above_75": 2,
+                },
+            },
+        )
+        self.assertEqual(data["average_scores"], {"quizzes": 53.5})
+        self.assertEqual(data["content_distribution"]["quiz"], 1)
+        self.assertEqual(data["content_distribution"]["task"], 3)
+        self.assertEqual(len(data["challenging_content"]["questions"]), 1)
+        question = data["challenging_content"]["questions"][0]
+        self.assertEqual(question["text"], "Question 0")
+        self.assertEqual(question["quiz"], "Quiz")
+        self.assertEqual(question["success_rate"], 25.0)
+        self.assertEqual(question["total_attempts"], 8)
+
+    def test_query_count_does_not_grow_with_the_course(self):
+        small = self.make_course(students=2, questions=1)
+        large = self.make_course(students=10, questions=4)
+
+        with self.assertNumQueries(6):
+            self.client.get(f"/api/v1/courses/{small.id}/analytics/")
+        with self.assertNumQueries(6):
+            self.client.get(f"/api/v1/courses/{large.id}/analytics/")
+
+
+class CourseTaskAnalyticsTests(AnalyticsTestCase):
+    def add_durations(self, course, hours):
+        """Give the completed progress rows of the course known durations."""
+        start = timezone.now() - timedelta(days=30)
+        rows = TaskProgress.objects.filter(
+            task__course=course, status="completed"
+        ).order_by("id")
+        for progress, duration in zip(rows, hours):
+            progress.start_date = start
+            progress.completion_date = start + timedelta(hours=duration)
+            progress.save()
+
+    def test_task_analytics_values(self):
+        course = self.make_course(students=8, questions=2)
+        first_task = LearningTask.objects.filter(course=course).order_by("id")[0]
+        self.add_durations(course, [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])
+
+        data = self.client.get(f"/api/v1/courses/{course.id}/task-analytics/").json()
+
+        by_id = {task["task_id"]: task for task in data}
+        stats = by_id[first_task.id]["completion_stats"]
+        self.assertEqual(by_id[first_task.id]["type"], "task")
+        self.assertEqual(stats["total_students"], 8)
+        self.assertEqual(stats["completed"], 6)
+        self.assertEqual(stats["in_progress"], 2)
+        durations = sorted(
+            (p.completion_date - p.start_date).total_seconds() / 3600
+            for p in TaskProgress.objects.filter(
+                task=first_task, completion_date__isnull=False
+            )
+        )
+        self.assertEqual(
+            stats["avg_completion_time_hours"], round(sum(durations) / 6, 2)
+        )
+        self.assertEqual(
+            stats["median_completion_time_hours"],
+            round((durations[2] + durations[3]) / 2, 2),
+        )
+
+        quiz = next(task for task in data if task["type"] == "quiz")
+        self.assertEqual(quiz["quiz_analysis"]["total_attempts"], 8)
+        self.assertEqual(
+            [q["success_rate"] for q in quiz["quiz_analysis"]["question_analysis"]],
+            [25.0, 100.0],
+        )
+        # Nobody completed the quiz task itself, so it is listed first
+        self.assertEqual(data[0]["task_id"], quiz["task_id"])
+
+    def test_task_query_count_does_not_grow_with_the_course(self):
+        small = self.make_course(students=2, questions=1)
+        large = self.make_course(students=10, questions=4)
+        self.add_durations(large, range(1, 30))
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.get(f"/api/v1/courses/{small.id}/task-analytics/")
+        with CaptureQueriesContext(connection) as large_queries:
+            self.client.get(f"/api/v1/courses/{large.id}/task-analytics/")
+
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertLessEqual(len(large_queries), 6)
+
+
+class CourseCategoryPerformanceTests(AnalyticsTestCase):
+    def test_category_values_per_course_and_cohort(self):
+        course = self.make_course(students=8, questions=2)
+        first, second = QuizQuestion.objects.filter(quiz__course=course).order_by(
+            "id"
+        )
+        algebra = QuestionTag.objects.create(name="algebra")
+        geometry = QuestionTag.objects.create(name="geometry")
+        first.tags.add(algebra, geometry)
+        second.tags.add(geometry)
+        last_month = timezone.now().replace(day=1) - timedelta(days=1)
+        earliest = CourseEnrollment.objects.filter(course=course).order_by("id")
+        CourseEnrollment.objects.filter(
+            pk__in=earliest.values_list("pk", flat=True)[:2]
+        ).update(
+            enrollment_date=last_month
+        )
+
+        data = self.client.get(
+            f"/api/v1/courses/{course.id}/category-performance/"
+        ).json()
+
+        # The first question is answered correctly by students 0 and 5 only
+        self.assertEqual(
+            data["categories"],
+            [
+                {
+                    "category": "algebra",
+                    "total_questions": 8,
+                    "correct_answers": 2,
+                    "success_rate": 25.0,
+                },
+                {
+                    "category": "geometry",
+                    "total_questions": 16,
+                    "correct_answers": 10,
+                    "success_rate": 62.5,
+                },
+            ],
+        )
+        self.assertEqual(
+            [cohort["cohort"] for cohort in data["cohorts"]],
+            [last_month.strftime("%Y-%m"), timezone.now().strftime("%Y-%m")],
+        )
+        # Students 0 and 1 form the earlier cohort
+        self.assertEqual(
+            data["cohorts"][0]["categories"][0],
+            {
+                "category": "algebra",
+                "total_questions": 2,
+                "correct_answers": 1,
+                "success_rate": 50.0,
+            },
+        )
+        self.assertEqual(data["cohorts"][1]["categories"][0]["total_questions"], 6)
+
+    def test_students_cannot_view_category_performance(self):
+        course = self.make_course(students=1, questions=1)
+        student = User.objects.get(enrollments__course=course)
+        self.client.force_authenticate(user=student)
+
+        response = self.client.get(
+            f"/api/v1/courses/{course.id}/category-performance/"
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+
+class CourseFunnelTests(AnalyticsTestCase):
+    def test_funnel_and_cohorts(self):
+        course = Course.objects.create(
+            title="Course", description="Description", creator=self.instructor
+        )
+        tasks = [
+            LearningTask.objects.create(course=course, title=f"Task {n}", order=n)
+            for n in range(3)
+        ]
+        # Student i completed the first i - 1 tasks and is on the next one;
+        # student 4 finished the course
+        for i in range(5):
+            student = User.objects.create_user(
+                username=f"student{i}",
+                email=f"student{i}@example.com",
+                password="studentpass",
+            )
+            CourseEnrollment.objects.create(user=student, course=course)
+            for n, task in enumerate(tasks[:i]):
+                TaskProgress.objects.create(
+                    user=student,
+                    task=task,
+                    status="completed" if n < i - 1 or i == 4 else "in_progress",
+                )
+        last_month = timezone.now().replace(day=1) - timedelta(days=1)
+        CourseEnrollment.objects.filter(user__username="student0").update(
+            enrollment_date=last_month
+        )
+        url = f"/api/v1/courses/{course.id}/funnel/"
+
+        data = self.client.get(url).json()
+
+        self.assertEqual(data["total_learners"], 5)
+        self.assertEqual(
+            [
+                (t["title"], t["reached"], t["completed"], t["dropped_off"])
+                for t in data["tasks"]
+            ],
+            [("Task 0", 4, 3, 1), ("Task 1", 3, 2, 1), ("Task 2", 2, 1, 1)],
+        )
+        self.assertEqual(data["tasks"][0]["reach_rate"], 80.0)
+        self.assertEqual(
+            [(c["cohort"], c["learners"]) for c in data["cohorts"]],
+            [(last_month.strftime("%Y-%m"), 1), (timezone.now().strftime("%Y-%m"), 4)],
+        )
+        self.assertEqual(data["cohorts"][0]["tasks"][0]["reached"], 0)
+        self.assertEqual(data["cohorts"][1]["tasks"][0]["reach_rate"], 100.0)
+
+        # The progress matrix is cached: only the course and titles are read
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        student = User.objects.get(username="student0")
+        self.client.force_authenticate(user=student)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class PercentileTests(SimpleTestCase):
+    def test_interpolated_percentile_matches_percentile_cont(self):
+        values = [1, 2, 3, 4]
+        self.assertEqual(interpolated_percentile(values, 0.5), 2.5)
+        self.assertAlmostEqual(interpolated_percentile(values, 0.9), 3.7)
+        self.assertEqual(interpolated_percentile([5], 0.9), 5)
+
+
+class StudentAnalyticsTestCase(AnalyticsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = User.objects.create_user(
+            username="learner",
+            email="learner@example.com",
+            password="learnerpass",
+            role="student",
+        )
+
+    def enroll(self, courses):
+        """Enroll the student in ``courses`` new courses of five tasks each."""
+        for c in range(courses):
+            course = Course.objects.create(
+                title=f"Course {c}",
+                description="Description",
+                creator=self.instructor,
+            )
+            CourseEnrollment.objects.create(user=self.student, course=course)
+            quiz = QuizTask.objects.create(course=course, title="Quiz")
+            QuizAttempt.objects.create(
+                user=self.student,
+                quiz=quiz,
+                score=60 + c,
+                time_taken=timedelta(minutes=5),
+                completion_status="completed",
+            )
+            for n in range(4):
+                task = LearningTask.objects.create(course=course, title=f"Task {n}")
+                TaskProgress.objects.create(
+                    user=self.student,
+                    task=task,
+                    status="completed" if n % 2 else "in_progress",
+                )
+
+
+class StudentProgressTests(StudentAnalyticsTestCase):
+    def test_progress_values(self):
+        self.enroll(2)
+        self.client.force_authenticate(user=self.student)
+
+        data = self.client.get("/api/v1/students/progress/").json()
+
+        self.assertEqual(data["overall_stats"]["total_courses"], 2)
+        self.assertEqual(data["overall_stats"]["total_tasks"], 10)
+        self.assertEqual(data["overall_stats"]["total_tasks_completed"], 4)
+        self.assertEqual(data["overall_stats"]["average_quiz_score"], 60.5)
+        course = next(c for c in data["courses"] if c["course_title"] == "Course 1")
+        self.assertEqual(course["progress_summary"]["completion_percentage"], 40)
+        self.assertEqual(course["assessment_performance"]["average_quiz_score"], 61)
+        self.assertEqual(
+            [a["task__title"] for a in course["recent_activity"]],
+            ["Task 3", "Task 2", "Task 1"],
+        )
+        self.assertEqual(
+            course["last_access"], course["recent_activity"][0]["updated_at"]
+        )
+
+    def test_query_count_does_not_grow_with_enrollments(self):
+        self.client.force_authenticate(user=self.student)
+        self.enroll(1)
+        with CaptureQueriesContext(connection) as one_course:
+            self.client.get("/api/v1/students/progress/")
+
+        self.enroll(5)
+        cache.clear()
+        with CaptureQueriesContext(connection) as six_courses:
+            self.client.get("/api/v1/students/progress/")
+
+        self.assertEqual(len(one_course), len(six_courses))
+
+
+class StudentQuizPerformanceTests(StudentAnalyticsTestCase):
+    def test_pass_fail_uses_each_quiz_threshold(self):
+        self.enroll(2)
+        QuizTask.objects.filter(course__title="Course 1").update(pass_threshold=50)
+        attempt = QuizAttempt.objects.get(quiz__course__title="Course 1")
+        question = QuizQuestion.objects.create(quiz=attempt.quiz, text="Question")
+        option = QuizOption.objects.create(question=question, text="A")
+        for is_correct in (True, False):
+            QuizResponse.objects.create(
+                attempt=attempt,
+                question=question,
+                selected_option=option,
+                is_correct=is_correct,
+                time_spent=timedelta(seconds=10),
+            )
+        self.client.force_authenticate(user=self.student)
+
+        data = self.client.get(
+            f"/api/v1/students/{self.student.id}/quiz-performance/"
+        ).json()
+
+        # Scores 60 and 61 against thresholds 70 and 50
+        self.assertEqual(data["overall_stats"]["quizzes_passed"], 1)
+        self.assertEqual(data["overall_stats"]["quizzes_failed"], 1)
+        self.assertEqual(data["overall_stats"]["pass_rate"], 50)
+        self.assertEqual(
+            [c["course_title"] for c in data["course_breakdown"]],
+            ["Course 1", "Course 0"],
+        )
+        recent = {a["attempt_id"]: a for a in data["recent_attempts"]}
+        self.assertEqual(recent[attempt.id]["correct_answers"], 1)
+        self.assertEqual(recent[attempt.id]["total_questions"], 2)
+
+    def test_query_count_does_not_grow_with_attempts(self):
+        self.client.force_authenticate(user=self.student)
+        url = f"/api/v1/students/{self.student.id}/quiz-performance/"
+        self.enroll(1)
+        with CaptureQueriesContext(connection) as one_course:
+            self.client.get(url)
+
+        self.enroll(5)
+        cache.clear()
+        with CaptureQueriesContext(connection) as six_courses:
+            self.client.get(url)
+
+        self.assertEqual(len(one_course), len(six_courses))
+
+    def test_performance_by_category(self):
+        self.enroll(1)
+        attempt = QuizAttempt.objects.get(user=self.student)
+        question = QuizQuestion.objects.create(quiz=attempt.quiz, text="Question")
+        question.tags.add(QuestionTag.objects.create(name="algebra"))
+        option = QuizOption.objects.create(question=question, text="A")
+        for is_correct in (True, True, False):
+            QuizResponse.objects.create(
+                attempt=attempt,
+                question=question,
+                selected_option=option,
+                is_correct=is_correct,
+                time_spent=timedelta(seconds=10),
+            )
+        self.client.force_authenticate(user=self.student)
+
+        data = self.client.get(
+            f"/api/v1/students/{self.student.id}/quiz-performance/"
+        ).json()
+
+        self.assertEqual(
+            data["performance_by_category"],
+            [
+                {
+                    "category": "algebra",
+                    "total_questions": 3,
+                    "correct_answers": 2,
+                    "success_rate": 66.67,
+                }
+            ],
+        )
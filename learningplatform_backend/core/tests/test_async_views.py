@@ -0,0 +1,144 @@
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizTask,
+    TaskProgress,
+)
+from core.serializers import CustomTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+def bearer(user):
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+
+class AsyncViewsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        cls.student = User.objects.create_user(
+            username="student",
+            email="student@example.com",
+            password="studentpass",
+            role="student",
+            first_name="Sam",
+        )
+        cls.other = User.objects.create_user(
+            username="other",
+            email="other@example.com",
+            password="otherpass",
+            role="student",
+        )
+        cls.course = Course.objects.create(
+            title="Course", description="Description", creator=cls.instructor
+        )
+        task = LearningTask.objects.create(course=cls.course, title="Reading")
+        quiz = QuizTask.objects.create(course=cls.course, title="Quiz")
+        CourseEnrollment.objects.create(user=cls.student, course=cls.course)
+        TaskProgress.objects.create(user=cls.student, task=task, status="completed")
+        QuizAttempt.objects.create(
+            user=cls.student,
+            quiz=quiz,
+            score=80,
+            time_taken=timedelta(minutes=5),
+            completion_status="completed",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def assert_same_as_sync(self, path, user):
+        sync_response = self.client.get(f"/api/v1/{path}", **bearer(user))
+        cache.clear()
+        async_response = self.client.get(f"/api/v1/async/{path}", **bearer(user))
+
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(json.loads(async_response.content), sync_response.json())
+        return async_response.json()
+
+    def test_async_endpoints_match_sync_endpoints(self):
+        progress = self.assert_same_as_sync("students/progress/", self.student)
+        self.assertEqual(progress["overall_stats"]["total_tasks_completed"], 1)
+
+        self.assert_same_as_sync(
+            f"students/{self.student.id}/progress/", self.instructor
+        )
+        analytics = self.assert_same_as_sync(
+            f"courses/{self.course.id}/analytics/", self.instructor
+        )
+        self.assertEqual(analytics["average_scores"]["quizzes"], 80)
+        self.assert_same_as_sync("instructor/dashboard/", self.instructor)
+
+    def test_authentication_and_roles_are_enforced(self):
+        self.assertEqual(
+            self.client.get("/api/v1/async/students/progress/").status_code, 401
+        )
+        self.assertEqual(
+            self.client.get(
+                "/api/v1/async/students/progress/",
+                HTTP_AUTHORIZATION="Bearer not-a-token",
+            ).status_code,
+            401,
+        )
+        self.assertEqual(
+            self.client.get(
+                f"/api/v1/async/students/{self.student.id}/progress/",
+                **bearer(self.other),
+            ).status_code,
+            403,
+        )
+        self.assertEqual(
+            self.client.get(
+                f"/api/v1/async/courses/{self.course.id}/analytics/",
+                **bearer(self.student),
+            ).status_code,
+            403,
+        )
+        self.assertEqual(
+            self.client.get(
+                "/api/v1/async/courses/999/analytics/", **bearer(self.instructor)
+            ).status_code,
+            404,
+        )
+
+    def test_deactivated_users_are_rejected(self):
+        headers = bearer(self.instructor)
+        self.instructor.is_active = False
+        self.instructor.save()
+
+        for shared in (True, False):
+            with self.subTest(shared_cache=shared), override_settings(
+                SHARED_CACHE=shared
+            ):
+                response = self.client.get(
+                    "/api/v1/async/instructor/dashboard/", **headers
+                )
+                self.assertEqual(response.status_code, 401)
+
+    async def test_views_run_under_the_async_client(self):
+        # Issuing a token records it in the outstanding token table
+        headers = await sync_to_async(bearer)(self.instructor)
+
+        response = await self.async_client.get(
+            "/api/v1/async/admin/dashboard/",
+            headers={"Authorization": headers["HTTP_AUTHORIZATION"]},
+        )
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,235 @@
+import datetime
+import os
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from core.authentication import ClaimsJWTAuthentication, ClaimsUser
+from core.serializers import CustomTokenObtainPairSerializer
+from core.token_blacklist import BlacklistIndex, BloomFilter, blacklist_index
+
+User = get_user_model()
+
+
+class StatelessView(APIView):
+    stateless_auth = True
+
+
+class StatefulView(APIView):
+    pass
+
+
+class ClaimsJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        refresh = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.access = str(refresh.access_token)
+        self.factory = APIRequestFactory()
+        self.authenticator = ClaimsJWTAuthentication()
+
+    def _request(self, view_class, method="get"):
+        request = getattr(self.factory, method)(
+            "/", HTTP_AUTHORIZATION=f"Bearer {self.access}"
+        )
+        return view_class().initialize_request(request)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_stateless_view_gets_claims_user_without_queries(self):
+        request = self._request(StatelessView)
+
+        with self.assertNumQueries(0):
+            user, _ = self.authenticator.authenticate(request)
+
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.role, "instructor")
+        self.assertEqual(user.email, "instructor@example.com")
+        self.assertFalse(user.is_staff)
+        self.assertEqual(user, self.user)
+
+    def test_deactivated_user_loses_claims_access(self):
+        self.user.is_active = False
+        self.user.save()
+
+        for shared in (True, False):
+            with self.subTest(shared_cache=shared):
+                with override_settings(SHARED_CACHE=shared):
+                    with self.assertRaises(AuthenticationFailed):
+                        self.authenticator.authenticate(self._request(StatelessView))
+
+    @override_settings(SHARED_CACHE=True)
+    def test_reactivated_user_regains_claims_access(self):
+        self.user.is_active = False
+        self.user.save()
+        self.user.is_active = True
+        self.user.save()
+
+        user, _ = self.authenticator.authenticate(self._request(StatelessView))
+
+        self.assertIsInstance(user, ClaimsUser)
+
+    def test_claims_user_loads_model_for_other_attributes(self):
+        request = self._request(StatelessView)
+        user, _ = self.authenticator.authenticate(request)
+
+        self.assertEqual(user.display_name, self.user.display_name)
+        self.assertEqual(user.get_model_user(), self.user)
+
+    def test_unsafe_methods_get_the_model_user(self):
+        request = self._request(StatelessView, method="post")
+
+        user, _ = self.authenticator.authenticate(request)
+
+        self.assertIsInstance(user, User)
+
+    def test_model_user_is_cached_between_requests(self):
+        with self.assertNumQueries(1):
+            self.authenticator.authenticate(self._request(StatefulView))
+        with self.assertNumQueries(0):
+            user, _ = self.authenticator.authenticate(self._request(StatefulView))
+
+        self.assertEqual(user, self.user)
+
+    def test_cached_user_is_dropped_on_save(self):
+        self.authenticator.authenticate(self._request(StatefulView))
+
+        self.user.role = "admin"
+        self.user.save()
+
+        user, _ = self.authenticator.authenticate(self._request(StatefulView))
+        self.assertEqual(user.role, "admin")
+
+    def test_stateless_dashboard_endpoint(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+        response = client.get("/api/v1/instructor/dashboard/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["courses_created"], 0)
+
+
+class BloomFilterTests(TestCase):
+    def test_added_items_are_always_found(self):
+        bloom = BloomFilter(capacity=500)
+        items = [f"jti-{i}" for i in range(500)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+        false_positives = sum(f"other-{i}" in bloom for i in range(2000))
+        self.assertLess(false_positives, 100)
+
+
+@override_settings(SHARED_CACHE=True)
+class CachedTokenBlacklistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="student",
+            email="student@example.com",
+            password="studentpass",
+            role="student",
+        )
+        self.refresh = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.client = APIClient()
+
+    def test_refresh_skips_blacklist_table_once_index_is_warm(self):
+        response = self.client.post(
+            "/auth/token/refresh/", {"refresh": str(self.refresh)}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.client.post(
+                "/auth/token/refresh/", {"refresh": str(self.refresh)}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+
+    def test_logout_blacklists_refresh_token(self):
+        # Warm the index first so the new entry must arrive via the signal
+        self.client.post(
+            "/auth/token/refresh/", {"refresh": str(self.refresh)}, format="json"
+        )
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            "/auth/logout/", {"refresh": str(self.refresh)}, format="json"
+        )
+        self.assertEqual(response.status_code, 205)
+        self.client.force_authenticate(user=None)
+
+        response = self.client.post(
+            "/auth/token/refresh/", {"refresh": str(self.refresh)}, format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def logout(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.post("/auth/logout/", {"refresh": str(self.refresh)}, format="json")
+        self.client.force_authenticate(user=None)
+
+    def test_logout_is_seen_by_other_processes(self):
+        # Another worker with its own, already warm, filter
+        other = BlacklistIndex()
+        self.assertFalse(other.contains(self.refresh["jti"]))
+
+        self.logout()
+
+        self.assertTrue(other.contains(self.refresh["jti"]))
+
+    @override_settings(SHARED_CACHE=False)
+    def test_unshared_cache_checks_the_table(self):
+        # Another worker whose local cache never sees this process's writes
+        other = BlacklistIndex()
+        with mock.patch("core.token_blacklist.cache", LocMemCache("other", {})):
+            self.assertFalse(other.contains(self.refresh["jti"]))
+
+            self.logout()
+
+            with self.assertNumQueries(1):
+                self.assertTrue(other.contains(self.refresh["jti"]))
+
+    def test_blacklisted_token_found_after_cache_is_cleared(self):
+        self.refresh.blacklist()
+        cache.clear()
+
+        self.assertTrue(blacklist_index.contains(self.refresh["jti"]))
+
+    def test_purge_expired_tokens(self):
+        expired = OutstandingToken.objects.create(
+            user=self.user,
+            jti="expired-jti",
+            token="expired",
+            expires_at=timezone.now() - datetime.timedelta(days=1),
+        )
+        BlacklistedToken.objects.create(token=expired)
+
+        call_command(
+            "purge_expired_tokens", "--batch-size", "1", stdout=open(os.devnull, "w")
+        )
+
+        self.assertFalse(OutstandingToken.objects.filter(jti="expired-jti").exists())
+        self.assertFalse(BlacklistedToken.objects.filter(token_id=expired.id).exists())
+        self.assertTrue(
+            OutstandingToken.objects.filter(jti=self.refresh["jti"]).exists()
+        )
@@ -0,0 +1,440 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from core.bulk_operations import bulk_enroll_users, hash_passwords
+from core.models import Course, CourseEnrollment, LearningTask, TaskProgress
+
+User = get_user_model()
+
+
+class TaskProgressBulkUpdateTests(APITestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@example.com",
+            password="studentpass",
+            role="student",
+        )
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+
+        self.course = Course.objects.create(
+            title="Test Course",
+            description="A test course.",
+            status="published",
+            visibility="public",
+            creator=self.instructor,
+        )
+        self.other_course = Course.objects.create(
+            title="Other Course",
+            description="Not enrolled.",
+            status="published",
+            visibility="public",
+            creator=self.instructor,
+        )
+
+        self.tasks = [
+            LearningTask.objects.create(course=self.course, title=f"Task {i}", order=i)
+            for i in range(5)
+        ]
+        self.foreign_task = LearningTask.objects.create(
+            course=self.other_course, title="Foreign Task", order=1
+        )
+
+        CourseEnrollment.objects.create(
+            user=self.student, course=self.course, status="active"
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.student)
+
+    def test_bulk_update_creates_and_updates_rows(self):
+        existing = TaskProgress.objects.create(
+            user=self.student, task=self.tasks[0], status="in_progress"
+        )
+
+        response = self.client.post(
+            "/api/v1/task-progress/bulk-update/",
+            {
+                "items": [
+                    {"task": self.tasks[0].id, "status": "completed"},
+                    {
+                        "task": self.tasks[1].id,
+                        "status": "in_progress",
+                        "time_spent": "00:15:00",
+                    },
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(response.data["failed"], 0)
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.status, "completed")
+        self.assertIsNotNone(existing.completion_date)
+
+        created = TaskProgress.objects.get(user=self.student, task=self.tasks[1])
+        self.assertEqual(created.status, "in_progress")
+        self.assertIsNotNone(created.start_date)
+        self.assertEqual(created.time_spent.total_seconds(), 15 * 60)
+
+    def test_bulk_update_reports_per_item_errors(self):
+        response = self.client.post(
+            "/api/v1/task-progress/bulk-update/",
+            [
+                {"task": self.tasks[0].id, "status": "completed"},
+                {"task": self.foreign_task.id, "status": "completed"},
+                {"task": self.tasks[1].id, "status": "finished"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(results[0]["result"], "created")
+        self.assertEqual(results[1]["result"], "error")
+        self.assertIn("task", results[1]["errors"])
+        self.assertEqual(results[2]["result"], "error")
+        self.assertIn("status", results[2]["errors"])
+        self.assertFalse(
+            TaskProgress.objects.filter(task=self.foreign_task).exists()
+        )
+
+    def test_bulk_update_query_count_is_independent_of_batch_size(self):
+        items = [{"task": task.id, "status": "completed"} for task in self.tasks]
+
+        # enrollment check, existing rows, savepoint pair and a single insert
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                "/api/v1/task-progress/bulk-update/", items, format="json"
+            )
+
+        self.assertEqual(response.data["created"], len(self.tasks))
+
+    def test_bulk_update_invalidates_cached_progress(self):
+        cache.set(f"student_progress_{self.student.id}", {"stale": True})
+        cache.set(f"course_analytics_{self.course.id}", {"stale": True})
+
+        self.client.post(
+            "/api/v1/task-progress/bulk-update/",
+            [{"task": self.tasks[0].id, "status": "completed"}],
+            format="json",
+        )
+
+        self.assertIsNone(cache.get(f"student_progress_{self.student.id}"))
+        self.assertIsNone(cache.get(f"course_analytics_{self.course.id}"))
+
+    def test_bulk_update_rejects_empty_payload(self):
+        response = self.client.post(
+            "/api/v1/task-progress/bulk-update/", {"items": []}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkEnrollmentTests(APITestCase):
+    def setUp(self):
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.other_instructor = User.objects.create_user(
+            username="other",
+            email="other@example.com",
+            password="otherpass",
+            role="instructor",
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f"student{i}",
+                email=f"student{i}@example.com",
+                password="studentpass",
+                role="student",
+            )
+            for i in range(6)
+        ]
+
+        self.course = Course.objects.create(
+            title="Cohort Course",
+            description="A course for a large cohort.",
+            status="published",
+            visibility="public",
+            creator=self.instructor,
+        )
+        CourseEnrollment.objects.create(
+            user=self.students[0], course=self.course, status="active"
+        )
+
+        self.client = APIClient()
+        self.url = f"/api/v1/courses/{self.course.id}/bulk-enroll/"
+
+    def test_bulk_enroll_by_ids_and_emails(self):
+        self.client.force_authenticate(user=self.instructor)
+
+        response = self.client.post(
+            self.url,
+            {
+                "users": [
+                    self.students[0].id,
+                    self.students[1].id,
+                    "Student2@Example.com",
+                    "student3@example.com",
+                    "missing@example.com",
+                    999999,
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(response.data["skipped"], 1)
+        self.assertCountEqual(
+            response.data["not_found"], ["missing@example.com", "999999"]
+        )
+        self.assertEqual(CourseEnrollment.objects.filter(course=self.course).count(), 4)
+
+    def test_concurrent_enrollments_are_reported_as_skipped(self):
+        # Enrolled by another request after the existing enrollments were read
+        with mock.patch.object(
+            CourseEnrollment.objects,
+            "filter",
+            return_value=CourseEnrollment.objects.none(),
+        ):
+            summary = bulk_enroll_users(
+                self.course, [self.students[0].id, self.students[1].id]
+            )
+
+        self.assertEqual((summary["created"], summary["skipped"]), (1, 1))
+        self.assertEqual(CourseEnrollment.objects.filter(course=self.course).count(), 2)
+
+    def test_bulk_enroll_rejects_a_list_body(self):
+        self.client.force_authenticate(user=self.instructor)
+
+        response = self.client.post(self.url, [self.students[1].id], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_enroll_from_csv_upload(self):
+        self.client.force_authenticate(user=self.instructor)
+        csv_file = SimpleUploadedFile(
+            "cohort.csv",
+            b"name,email\nFour,student4@example.com\nFive,student5@example.com\n",
+            content_type="text/csv",
+        )
+
+        response = self.client.post(self.url, {"file": csv_file}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+
+    def test_bulk_enroll_rejects_non_utf8_csv(self):
+        self.client.force_authenticate(user=self.instructor)
+        csv_file = SimpleUploadedFile(
+            "cohort.csv",
+            "name,email\nRen\u00e9,student4@example.com\n".encode("cp1252"),
+            content_type="text/csv",
+        )
+
+        response = self.client.post(self.url, {"file": csv_file}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("UTF-8", response.data["error"])
+
+    def test_bulk_enroll_requires_course_owner_or_admin(self):
+        self.client.force_authenticate(user=self.other_instructor)
+
+        response = self.client.post(
+            self.url, {"users": [self.students[1].id]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_enrollments_command(self):
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", delete=False
+        ) as csv_file:
+            csv_file.write("user_id\n")
+            for student in self.students:
+                csv_file.write(f"{student.id}\n")
+
+        try:
+            call_command(
+                "import_enrollments",
+                str(self.course.id),
+                csv_file.name,
+                "--chunk-size",
+                "2",
+                stdout=open(os.devnull, "w"),
+            )
+        finally:
+            os.unlink(csv_file.name)
+
+        self.assertEqual(
+            CourseEnrollment.objects.filter(course=self.course).count(),
+            len(self.students),
+        )
+
+
+class BulkUserProvisioningTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            password="adminpass",
+            role="admin",
+            is_staff=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.url = "/api/v1/users/bulk-provision/"
+
+    def test_provision_sso_hashed_and_plaintext_accounts(self):
+        imported_hash = make_password("imported-secret")
+
+        response = self.client.post(
+            self.url,
+            {
+                "users": [
+                    {"username": "sso1", "email": "sso1@example.com", "sso": True},
+                    {
+                        "username": "imported",
+                        "email": "imported@example.com",
+                        "password_hash": imported_hash,
+                    },
+                    {
+                        "username": "plain",
+                        "email": "plain@example.com",
+                        "password": "plain-secret",
+                        "role": "instructor",
+                    },
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+
+        self.assertFalse(User.objects.get(username="sso1").has_usable_password())
+        self.assertEqual(User.objects.get(username="imported").password, imported_hash)
+        plain = User.objects.get(username="plain")
+        self.assertTrue(plain.check_password("plain-secret"))
+        self.assertEqual(plain.role, "instructor")
+
+    def test_provision_skips_existing_and_rejects_bad_hashes(self):
+        response = self.client.post(
+            self.url,
+            {
+                "users": [
+                    {"username": "admin", "email": "new@example.com", "sso": True},
+                    {"username": "fresh", "email": "ADMIN@example.com", "sso": True},
+                    {"username": "dupe", "email": "dupe@example.com", "sso": True},
+                    {"username": "dupe", "email": "dupe2@example.com", "sso": True},
+                    {
+                        "username": "broken",
+                        "email": "broken@example.com",
+                        "password_hash": "not-a-hash",
+                    },
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(
+            [skip["reason"] for skip in response.data["skipped"]],
+            ["username exists", "email exists", "username exists"],
+        )
+        self.assertEqual(response.data["errors"][0]["index"], 4)
+
+    def test_provision_validates_passwords_and_roles(self):
+        response = self.client.post(
+            self.url,
+            {
+                "users": [
+                    {"username": "weak", "email": "weak@example.com", "password": "123"},
+                    {"username": "boss", "email": "boss@example.com", "role": "owner"},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 0)
+        errors = response.data["errors"]
+        self.assertIn("password", errors[0]["errors"])
+        self.assertIn("role", errors[1]["errors"])
+
+    def test_provision_requires_admin(self):
+        student = User.objects.create_user(
+            username="student",
+            email="student@example.com",
+            password="studentpass",
+            role="student",
+        )
+        self.client.force_authenticate(user=student)
+
+        response = self.client.post(
+            self.url,
+            {"users": [{"username": "x", "email": "x@example.com", "sso": True}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+    )
+    def test_hash_passwords_process_pool(self):
+        passwords = [f"secret-{i}" for i in range(40)]
+
+        hashes = hash_passwords(passwords, workers=2, processes=True)
+
+        self.assertEqual(len(hashes), len(passwords))
+        self.assertTrue(check_password(passwords[7], hashes[7]))
+
+    @override_settings(
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+    )
+    def test_requests_hash_without_forking(self):
+        users = [
+            {
+                "username": f"u{i}",
+                "email": f"u{i}@example.com",
+                "password": "Xy7!qwerty",
+            }
+            for i in range(40)
+        ]
+        with mock.patch(
+            "core.bulk_operations.ProcessPoolExecutor", side_effect=AssertionError
+        ):
+            response = self.client.post(self.url, {"users": users}, format="json")
+
+        self.assertEqual(response.data["created"], 40)
+        self.assertTrue(User.objects.get(username="u7").check_password("Xy7!qwerty"))
+
+    def test_provision_rejects_a_list_body(self):
+        response = self.client.post(self.url, [{"username": "x"}], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,117 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.caching import UNSHARED_QUIZ_CONTENT_TIMEOUT, get_quiz_content_hash
+from core.models import Course, LearningTask, QuizOption, QuizQuestion, QuizTask
+
+User = get_user_model()
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.course = Course.objects.create(
+            title="Course", description="Description", creator=self.instructor
+        )
+        self.task = LearningTask.objects.create(
+            course=self.course, title="Task", order=1
+        )
+        self.quiz = QuizTask.objects.create(course=self.course, title="Quiz", order=2)
+        self.question = QuizQuestion.objects.create(quiz=self.quiz, text="Question")
+        self.option = QuizOption.objects.create(
+            question=self.question, text="Answer", is_correct=True
+        )
+        self.client.force_authenticate(user=self.instructor)
+
+    def test_course_detail_returns_304_without_serializing(self):
+        url = f"/api/v1/courses/{self.course.id}/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_course_update_changes_etag(self):
+        url = f"/api/v1/courses/{self.course.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        self.client.patch(url, {"title": "Renamed"}, format="json")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["title"], "Renamed")
+
+    def test_task_list_honors_if_none_match(self):
+        url = f"/api/v1/learning-tasks/?course={self.course.id}"
+        etag = self.client.get(url)["ETag"]
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        LearningTask.objects.create(course=self.course, title="New task", order=3)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 3)
+
+    def test_lists_and_quizzes_only_validate_by_etag(self):
+        url = f"/api/v1/learning-tasks/?course={self.course.id}"
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+        self.assertNotIn(
+            "Last-Modified", self.client.get(f"/api/v1/quiz-tasks/{self.quiz.id}/")
+        )
+
+        since = self.client.get(f"/api/v1/courses/{self.course.id}/")["Last-Modified"]
+        self.task.delete()
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_quiz_etag_tracks_question_content(self):
+        detail_url = f"/api/v1/quiz-tasks/{self.quiz.id}/"
+        list_url = "/api/v1/quiz-tasks/"
+        detail_etag = self.client.get(detail_url)["ETag"]
+        list_etag = self.client.get(list_url)["ETag"]
+        self.assertEqual(
+            self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code,
+            304,
+        )
+
+        self.option.text = "Changed answer"
+        self.option.save()
+
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["questions"][0]["options"][0]["text"], "Changed answer"
+        )
+        response = self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_unshared_quiz_digests_expire(self):
+        digest = get_quiz_content_hash(self.quiz.id)
+        # Changed in another process, whose invalidation this one never sees
+        QuizOption.objects.filter(pk=self.option.pk).update(text="Changed answer")
+        self.assertEqual(get_quiz_content_hash(self.quiz.id), digest)
+
+        later = time.time() + UNSHARED_QUIZ_CONTENT_TIMEOUT + 1
+        with mock.patch("time.time", return_value=later):
+            self.assertNotEqual(get_quiz_content_hash(self.quiz.id), digest)
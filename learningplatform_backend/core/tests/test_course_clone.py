@@ -0,0 +1,188 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.course_clone import clone_course
+from core.course_content import build_course_snapshot
+from core.models import (
+    Course,
+    CourseVersion,
+    LearningTask,
+    QuestionTag,
+    QuizOption,
+    QuizQuestion,
+    QuizTask,
+)
+
+User = get_user_model()
+
+
+def strip_ids(snapshot):
+    """Return the snapshot tree without database ids for comparison."""
+
+    def clean(value):
+        if isinstance(value, dict):
+            return {k: clean(v) for k, v in value.items() if k != "id"}
+        if isinstance(value, list):
+            return [clean(item) for item in value]
+        return value
+
+    return clean(snapshot["tasks"])
+
+
+class CourseCloneTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.other = User.objects.create_user(
+            username="other",
+            email="other@example.com",
+            password="otherpass",
+            role="instructor",
+        )
+        self.tag = QuestionTag.objects.create(name="algebra")
+
+    def make_course(self, quizzes):
+        course = Course.objects.create(
+            title="Course",
+            description="Description",
+            status="published",
+            visibility="public",
+            creator=self.instructor,
+        )
+        LearningTask.objects.create(
+            course=course, title="Reading", order=0, is_published=True
+        )
+        for q in range(quizzes):
+            quiz = QuizTask.objects.create(
+                course=course, title=f"Quiz {q}", order=q + 1, pass_threshold=60
+            )
+            for n in range(3):
+                question = QuizQuestion.objects.create(
+                    quiz=quiz, text=f"Question {n}", order=n, explanation="Why"
+                )
+                QuizOption.objects.create(question=question, text="A", is_correct=True)
+                QuizOption.objects.create(question=question, text="B", order=1)
+                if n == 0:
+                    question.tags.add(self.tag)
+        return course
+
+    def test_clone_copies_the_whole_tree(self):
+        course = self.make_course(quizzes=2)
+
+        clone, counts = clone_course(course, self.other, title="Copy")
+
+        self.assertEqual(
+            counts, {"tasks": 3, "quizzes": 2, "questions": 6, "options": 12}
+        )
+        self.assertEqual(clone.title, "Copy")
+        self.assertEqual(clone.creator, self.other)
+        self.assertEqual(clone.status, "published")
+        self.assertEqual(
+            strip_ids(build_course_snapshot(clone)),
+            strip_ids(build_course_snapshot(course)),
+        )
+        self.assertEqual(QuizTask.objects.get(course=clone, order=1).pass_threshold, 60)
+        self.assertEqual(self.tag.questions.filter(quiz__course=clone).count(), 2)
+
+    def test_clone_runs_a_fixed_number_of_queries(self):
+        small = self.make_course(quizzes=1)
+        large = self.make_course(quizzes=6)
+
+        with CaptureQueriesContext(connection) as small_queries:
+            clone_course(small, self.instructor)
+        with CaptureQueriesContext(connection) as large_queries:
+            clone_course(large, self.instructor)
+
+        self.assertEqual(len(small_queries), len(large_queries))
+
+    def test_clone_endpoint_from_a_version(self):
+        course = self.make_course(quizzes=1)
+        self.client.force_authenticate(user=self.instructor)
+        self.client.post(f"/api/v1/courses/{course.id}/publish-content/", {})
+        LearningTask.objects.create(course=course, title="Added later", order=9)
+
+        response = self.client.post(
+            f"/api/v1/courses/{course.id}/clone/",
+            {"version": 1, "title": "From v1"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["course"]["title"], "From v1")
+        self.assertEqual(response.data["counts"]["tasks"], 2)
+
+    def test_clone_rejects_a_malformed_version_snapshot(self):
+        course = self.make_course(quizzes=1)
+        CourseVersion.objects.create(
+            course=course,
+            version_number=1,
+            content_snapshot={"course": {}, "tasks": [{"order": 1}]},
+        )
+        self.client.force_authenticate(user=self.instructor)
+
+        response = self.client.post(
+            f"/api/v1/courses/{course.id}/clone/", {"version": 1}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Course.objects.count(), 1)
+
+    def test_only_the_creator_can_clone(self):
+        course = self.make_course(quizzes=1)
+        self.client.force_authenticate(user=self.other)
+
+        response = self.client.post(f"/api/v1/courses/{course.id}/clone/", {})
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_import_rejects_invalid_snapshots(self):
+        self.client.force_authenticate(user=self.instructor)
+
+        response = self.client.post(
+            "/api/v1/courses/import/",
+            {"snapshot": {"course": {}, "tasks": [{"order": 1}]}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Course.objects.exists())
+
+    def test_import_validates_field_values(self):
+        self.client.force_authenticate(user=self.instructor)
+
+        def quiz_snapshot(quiz, **course):
+            return {
+                "course": {"title": "Imported", "description": "", **course},
+                "tasks": [{"title": "Quiz", "quiz": quiz}],
+            }
+
+        for snapshot in [
+            quiz_snapshot({"time_limit_minutes": "abc"}),
+            quiz_snapshot({"pass_threshold": 500}),
+            quiz_snapshot({"max_attempts": -3}),
+            quiz_snapshot({}, status="bogus"),
+            quiz_snapshot({"questions": [{"text": "Q", "options": [{}]}]}),
+        ]:
+            with self.subTest(snapshot=snapshot):
+                response = self.client.post(
+                    "/api/v1/courses/import/", {"snapshot": snapshot}, format="json"
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Course.objects.exists())
+
+        response = self.client.post(
+            "/api/v1/courses/import/",
+            {"snapshot": quiz_snapshot({"pass_threshold": "80"}), "status": "draft"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(QuizTask.objects.get().pass_threshold, 80)
+        self.assertEqual(Course.objects.get().status, "draft")
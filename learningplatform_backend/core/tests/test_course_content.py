@@ -0,0 +1,151 @@
+import gzip
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.models import (
+    Course,
+    CourseContentBundle,
+    CourseEnrollment,
+    CourseVersion,
+    LearningTask,
+    QuizOption,
+    QuizQuestion,
+    QuizTask,
+)
+
+User = get_user_model()
+
+
+class CourseContentBundleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@example.com",
+            password="studentpass",
+            role="student",
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider",
+            email="outsider@example.com",
+            password="outsiderpass",
+            role="student",
+        )
+        self.course = Course.objects.create(
+            title="Course", description="Description", creator=self.instructor
+        )
+        LearningTask.objects.create(
+            course=self.course, title="Draft", order=1, is_published=False
+        )
+        LearningTask.objects.create(
+            course=self.course, title="Reading", order=2, is_published=True
+        )
+        quiz = QuizTask.objects.create(
+            course=self.course, title="Quiz", order=3, is_published=True
+        )
+        question = QuizQuestion.objects.create(
+            quiz=quiz, text="2 + 2?", explanation="Basic arithmetic"
+        )
+        QuizOption.objects.create(question=question, text="4", is_correct=True)
+        QuizOption.objects.create(question=question, text="5", is_correct=False)
+        CourseEnrollment.objects.create(user=self.student, course=self.course)
+
+    def _publish(self):
+        self.client.force_authenticate(user=self.instructor)
+        response = self.client.post(
+            f"/api/v1/courses/{self.course.id}/publish-content/",
+            {"notes": "First release"},
+            format="json",
+        )
+        self.client.force_authenticate(user=None)
+        return response
+
+    def test_publish_stores_version_snapshot_and_bundle(self):
+        response = self._publish()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["version"], 1)
+        version = CourseVersion.objects.get(course=self.course)
+        self.assertEqual(version.notes, "First release")
+        # The instructor snapshot keeps every task and the answers
+        self.assertEqual(len(version.content_snapshot["tasks"]), 3)
+        quiz = version.content_snapshot["tasks"][2]["quiz"]
+        self.assertTrue(quiz["questions"][0]["options"][0]["is_correct"])
+        self.assertEqual(
+            CourseContentBundle.objects.get().checksum, response.data["checksum"]
+        )
+
+    def test_student_bundle_omits_answers_and_drafts(self):
+        url = self._publish().data["url"]
+        self.client.force_authenticate(user=self.student)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("immutable", response["Cache-Control"])
+        content = json.loads(response.content)
+        self.assertEqual(
+            [task["title"] for task in content["tasks"]], ["Reading", "Quiz"]
+        )
+        question = content["tasks"][1]["quiz"]["questions"][0]
+        self.assertNotIn("explanation", question)
+        for option in question["options"]:
+            self.assertEqual(set(option), {"id", "text", "order"})
+
+    @override_settings(SHARED_CACHE=True)
+    def test_bundle_reads_skip_the_database_once_cached(self):
+        url = self._publish().data["url"]
+        self.client.force_authenticate(user=self.student)
+        self.client.get(f"/api/v1/courses/{self.course.id}/content/")
+        self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(response.content))["version"], 1)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304
+        )
+
+    def test_content_pointer_follows_latest_publish(self):
+        self._publish()
+        self.client.force_authenticate(user=self.student)
+        first = self.client.get(f"/api/v1/courses/{self.course.id}/content/").data
+
+        self._publish()
+        self.client.force_authenticate(user=self.student)
+        second = self.client.get(f"/api/v1/courses/{self.course.id}/content/").data
+
+        self.assertEqual(first["version"], 1)
+        self.assertEqual(second["version"], 2)
+        self.assertNotEqual(first["checksum"], second["checksum"])
+
+    def test_non_enrolled_students_cannot_read_content(self):
+        url = self._publish().data["url"]
+        self.client.force_authenticate(user=self.outsider)
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(
+            self.client.get(f"/api/v1/courses/{self.course.id}/content/").status_code,
+            403,
+        )
+
+    def test_only_the_creator_can_publish(self):
+        self.client.force_authenticate(user=self.student)
+
+        response = self.client.post(
+            f"/api/v1/courses/{self.course.id}/publish-content/", {}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 403)
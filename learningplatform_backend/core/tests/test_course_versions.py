@@ -0,0 +1,131 @@
+import copy
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from core.course_versions import get_version_snapshot, json_diff, json_patch
+from core.models import Course, CourseVersion
+
+User = get_user_model()
+
+
+def make_snapshot(revision):
+    return {
+        "course": {"title": f"Course rev {revision}", "description": "x" * 500},
+        "tasks": [
+            {"id": i, "title": f"Task {i}", "order": i, "body": "y" * 200}
+            for i in range(10 + revision // 3)
+        ],
+    }
+
+
+class JsonDiffTests(SimpleTestCase):
+    def test_patch_reproduces_new_document(self):
+        old = {"a": 1, "b": {"c": [1, 2, 3], "d": "x"}, "gone": True}
+        new = {"a": 2, "b": {"c": [1, 5, 3], "d": "x"}, "added": [1]}
+
+        self.assertEqual(json_patch(copy.deepcopy(old), json_diff(old, new)), new)
+        self.assertIsNone(json_diff(new, copy.deepcopy(new)))
+
+    def test_lists_of_different_length_are_replaced(self):
+        self.assertEqual(json_diff([1, 2], [1, 2, 3]), ["r", [1, 2, 3]])
+
+
+class CourseVersionStorageTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.course = Course.objects.create(
+            title="Course", description="Description", creator=self.instructor
+        )
+        self.client.force_authenticate(user=self.instructor)
+
+    def _create(self, number, snapshot=None):
+        return self.client.post(
+            "/api/v1/course-versions/",
+            {
+                "course": self.course.id,
+                "version_number": number,
+                "content_snapshot": snapshot or make_snapshot(number),
+            },
+            format="json",
+        )
+
+    def test_versions_store_checkpoints_and_deltas(self):
+        for number in range(1, 13):
+            self.assertEqual(self._create(number).status_code, 201)
+
+        versions = CourseVersion.objects.filter(course=self.course).order_by(
+            "version_number"
+        )
+        self.assertEqual(
+            [v.version_number for v in versions if v.is_checkpoint], [1, 11]
+        )
+        self.assertIsNone(versions.get(version_number=5).content_snapshot)
+
+        cache.clear()
+        for version in versions:
+            self.assertEqual(
+                get_version_snapshot(version), make_snapshot(version.version_number)
+            )
+
+    def test_list_omits_snapshots_unless_expanded(self):
+        for number in range(1, 4):
+            self._create(number)
+
+        listed = self.client.get("/api/v1/course-versions/").data["results"]
+        self.assertNotIn("content_snapshot", listed[0])
+
+        expanded = self.client.get(
+            "/api/v1/course-versions/?expand=content_snapshot"
+        ).data["results"]
+        self.assertEqual(expanded[2]["content_snapshot"], make_snapshot(3))
+
+    def test_detail_rebuilds_delta_versions(self):
+        for number in range(1, 4):
+            self._create(number)
+        cache.clear()
+        version = CourseVersion.objects.get(course=self.course, version_number=3)
+
+        response = self.client.get(f"/api/v1/course-versions/{version.id}/")
+
+        self.assertFalse(response.data["is_checkpoint"])
+        self.assertEqual(response.data["content_snapshot"], make_snapshot(3))
+
+    def test_deleting_a_version_keeps_later_versions_intact(self):
+        for number in range(1, 4):
+            self._create(number)
+        first = CourseVersion.objects.get(course=self.course, version_number=1)
+
+        response = self.client.delete(f"/api/v1/course-versions/{first.id}/")
+
+        self.assertEqual(response.status_code, 204)
+        cache.clear()
+        for version in CourseVersion.objects.filter(course=self.course):
+            self.assertEqual(
+                get_version_snapshot(version), make_snapshot(version.version_number)
+            )
+
+    def test_versions_are_append_only(self):
+        self._create(1)
+        self._create(2)
+        version = CourseVersion.objects.get(course=self.course, version_number=2)
+
+        self.assertEqual(self._create(2).status_code, 400)
+        response = self.client.patch(
+            f"/api/v1/course-versions/{version.id}/",
+            {"content_snapshot": {"changed": True}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.patch(
+            f"/api/v1/course-versions/{version.id}/", {"notes": "ok"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,134 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.fast_serializers import (
+    course_enrollment_serializer,
+    learning_task_serializer,
+    quiz_attempt_list_serializer,
+    task_progress_serializer,
+)
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizTask,
+    TaskProgress,
+)
+from core.progress_api import enrollment_progress_annotations
+from core.serializers import (
+    CourseEnrollmentSerializer,
+    LearningTaskSerializer,
+    QuizAttemptSerializer,
+    TaskProgressSerializer,
+)
+
+User = get_user_model()
+
+
+class CompiledSerializerParityTests(TestCase):
+    def setUp(self):
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@example.com",
+            password="studentpass",
+            role="student",
+            display_name="Student",
+        )
+        self.course = Course.objects.create(
+            title="Course",
+            description="Description",
+            creator=self.instructor,
+            status="published",
+        )
+        self.task = LearningTask.objects.create(
+            course=self.course, title="Task", order=1, is_published=True
+        )
+        self.quiz = QuizTask.objects.create(course=self.course, title="Quiz", order=2)
+        CourseEnrollment.objects.create(
+            user=self.student,
+            course=self.course,
+            status="active",
+            settings={"notifications": True},
+        )
+        TaskProgress.objects.create(
+            user=self.student,
+            task=self.task,
+            status="completed",
+            time_spent=datetime.timedelta(minutes=12, microseconds=5),
+            completion_date=timezone.now(),
+        )
+        TaskProgress.objects.create(
+            user=self.student, task=self.quiz, status="in_progress"
+        )
+        QuizAttempt.objects.create(
+            user=self.student,
+            quiz=self.quiz,
+            score=85,
+            time_taken=datetime.timedelta(minutes=7),
+            completion_status="completed",
+        )
+        self.context = {"request": Request(APIRequestFactory().get("/"))}
+
+    def assertParity(self, compiled, serializer_class, queryset):
+        expected = serializer_class(queryset, many=True, context=self.context).data
+        actual = compiled.serialize(compiled.values(queryset))
+        self.assertEqual(actual, [dict(item) for item in expected])
+
+    def test_learning_task_parity(self):
+        self.assertParity(
+            learning_task_serializer, LearningTaskSerializer, LearningTask.objects.all()
+        )
+
+    def test_task_progress_parity(self):
+        self.assertParity(
+            task_progress_serializer, TaskProgressSerializer, TaskProgress.objects.all()
+        )
+
+    def test_course_enrollment_parity(self):
+        queryset = CourseEnrollment.objects.annotate(
+            **enrollment_progress_annotations()
+        )
+        self.assertParity(
+            course_enrollment_serializer, CourseEnrollmentSerializer, queryset
+        )
+
+    def test_quiz_attempt_parity(self):
+        self.assertParity(
+            quiz_attempt_list_serializer,
+            QuizAttemptSerializer,
+            QuizAttempt.objects.all(),
+        )
+
+    def test_parity_in_non_utc_timezone(self):
+        with timezone.override("Europe/Berlin"):
+            self.assertParity(
+                task_progress_serializer,
+                TaskProgressSerializer,
+                TaskProgress.objects.all(),
+            )
+
+    def test_list_endpoint_uses_compiled_serializer(self):
+        client = APIClient()
+        client.force_authenticate(user=self.student)
+
+        with self.assertNumQueries(2):
+            response = client.get("/api/v1/task-progress/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            response.data["results"][0]["task_details"]["title"],
+            TaskProgress.objects.first().task.title,
+        )
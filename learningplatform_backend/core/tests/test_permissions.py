@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from core.bulk_operations import bulk_enroll_users
+from core.caching import is_enrolled
+from core.models import Course, CourseEnrollment
+from core.permissions import IsEnrolledInCourse
+
+User = get_user_model()
+
+
+class EnrollmentView(APIView):
+    permission_classes = [IsEnrolledInCourse]
+
+
+@override_settings(SHARED_CACHE=True)
+class CachedEnrollmentPermissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@example.com",
+            password="studentpass",
+            role="student",
+        )
+        self.course = Course.objects.create(
+            title="Course", description="Description", creator=self.instructor
+        )
+        self.other_course = Course.objects.create(
+            title="Other", description="Description", creator=self.instructor
+        )
+        CourseEnrollment.objects.create(user=self.student, course=self.course)
+        self.factory = APIRequestFactory()
+        self.permission = IsEnrolledInCourse()
+
+    def _check(self, course_id):
+        request = self.factory.get("/")
+        force_authenticate(request, user=self.student)
+        view = EnrollmentView()
+        view.kwargs = {"course_id": str(course_id)}
+        request = view.initialize_request(request)
+        return self.permission.has_permission(request, view)
+
+    def test_enrollment_set_is_cached_between_requests(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(self._check(self.course.id))
+        with self.assertNumQueries(0):
+            self.assertTrue(self._check(self.course.id))
+            self.assertFalse(self._check(self.other_course.id))
+
+    @override_settings(SHARED_CACHE=False)
+    def test_unshared_cache_only_memoises_per_request(self):
+        request = self.factory.get("/")
+        with self.assertNumQueries(1):
+            self.assertTrue(is_enrolled(self.student.id, self.course.id, request))
+            self.assertFalse(
+                is_enrolled(self.student.id, self.other_course.id, request)
+            )
+        # Another process may have changed the enrollments since
+        with self.assertNumQueries(1):
+            self.assertTrue(self._check(self.course.id))
+
+    def test_enrolling_invalidates_cached_set(self):
+        self.assertFalse(self._check(self.other_course.id))
+
+        CourseEnrollment.objects.create(user=self.student, course=self.other_course)
+
+        self.assertTrue(self._check(self.other_course.id))
+
+    def test_unenrolling_invalidates_cached_set(self):
+        self.assertTrue(self._check(self.course.id))
+
+        CourseEnrollment.objects.filter(user=self.student).delete()
+
+        self.assertFalse(self._check(self.course.id))
+
+    def test_bulk_enrollment_invalidates_cached_set(self):
+        self.assertFalse(self._check(self.other_course.id))
+
+        bulk_enroll_users(self.other_course, [self.student.email])
+
+        self.assertTrue(self._check(self.other_course.id))
@@ -0,0 +1,158 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from core.analytics import course_completion_rates, interpolated_percentile
+from core.caching import progress_matrix_key
+from core.models import Course, CourseEnrollment, LearningTask, TaskProgress
+from core.progress_matrix import (
+    COMPLETED,
+    IN_PROGRESS,
+    NOT_STARTED,
+    ProgressMatrix,
+    get_progress_matrix,
+)
+
+User = get_user_model()
+
+
+class ProgressMatrixTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.course = Course.objects.create(
+            title="Course", description="Description", creator=instructor
+        )
+        # Created out of order to check the columns follow the course order
+        self.tasks = [
+            LearningTask.objects.create(course=self.course, title=f"Task {n}", order=n)
+            for n in (2, 0, 1, 3)
+        ]
+        self.tasks.sort(key=lambda task: task.order)
+        start = timezone.now() - timedelta(days=10)
+        self.students = []
+        # Student i completes the first i tasks and is working on the next one
+        for i in range(4):
+            student = User.objects.create_user(
+                username=f"student{i}",
+                email=f"student{i}@example.com",
+                password="studentpass",
+            )
+            self.students.append(student)
+            CourseEnrollment.objects.create(
+                user=student, course=self.course, status="active"
+            )
+            for n, task in enumerate(self.tasks[: i + 1]):
+                TaskProgress.objects.create(
+                    user=student,
+                    task=task,
+                    status="completed" if n < i else "in_progress",
+                    start_date=start,
+                    completion_date=(
+                        start + timedelta(hours=i + n + 1) if n < i else None
+                    ),
+                )
+        # Progress of someone who is not enrolled is left out
+        outsider = User.objects.create_user(
+            username="outsider", email="outsider@example.com", password="pass"
+        )
+        TaskProgress.objects.create(
+            user=outsider, task=self.tasks[3], status="completed"
+        )
+
+    def test_load_places_progress_in_course_order(self):
+        with self.assertNumQueries(3):
+            matrix = ProgressMatrix.load(self.course.id)
+
+        self.assertEqual(matrix.task_ids.tolist(), [task.id for task in self.tasks])
+        self.assertEqual(
+            matrix.user_ids.tolist(), [student.id for student in self.students]
+        )
+        self.assertEqual(
+            matrix.status[2].tolist(), [COMPLETED, COMPLETED, IN_PROGRESS, NOT_STARTED]
+        )
+        self.assertEqual(matrix.hours[2, 1], 4)
+
+    def test_load_leaves_out_tasks_added_after_the_task_query(self):
+        added = LearningTask.objects.create(course=self.course, title="Added", order=9)
+        TaskProgress.objects.create(
+            user=self.students[0], task=added, status="completed"
+        )
+        listed = LearningTask.objects.exclude(pk=added.pk)
+
+        with mock.patch.object(
+            LearningTask, "objects", mock.Mock(filter=listed.filter)
+        ):
+            matrix = ProgressMatrix.load(self.course.id)
+
+        self.assertEqual(matrix.task_ids.tolist(), [task.id for task in self.tasks])
+        self.assertEqual(matrix.status[0].tolist(), [IN_PROGRESS, 0, 0, 0])
+
+    def test_rollups(self):
+        matrix = ProgressMatrix.load(self.course.id)
+
+        # The SQL version counts everyone with progress, enrolled or not
+        TaskProgress.objects.filter(user__username="outsider").delete()
+        self.assertEqual(
+            matrix.completion_distribution(), course_completion_rates(self.course.id)
+        )
+        self.assertEqual(matrix.completion_histogram(bins=4)["counts"], [1, 1, 1, 1])
+        self.assertEqual(
+            [
+                (task["reached"], task["started"], task["completed"])
+                for task in matrix.task_funnel()
+            ],
+            [(4, 4, 3), (3, 3, 2), (2, 2, 1), (1, 1, 0)],
+        )
+
+        percentiles = matrix.completion_time_percentiles((50, 90))
+        first_task_hours = [2, 3, 4]
+        self.assertEqual(percentiles[0]["timed_completions"], 3)
+        self.assertEqual(percentiles[0]["p50"], 3)
+        self.assertEqual(
+            percentiles[0]["p90"],
+            round(interpolated_percentile(first_task_hours, 0.9), 2),
+        )
+        self.assertEqual(
+            percentiles[3],
+            {
+                "task_id": self.tasks[3].id,
+                "timed_completions": 0,
+                "p50": None,
+                "p90": None,
+            },
+        )
+
+    def test_cached_matrix_is_dropped_when_progress_changes(self):
+        get_progress_matrix(self.course.id)
+        self.assertIsNotNone(cache.get(progress_matrix_key(self.course.id)))
+        with self.assertNumQueries(0):
+            cached = get_progress_matrix(self.course.id)
+        self.assertEqual(
+            cached.status.tolist(), ProgressMatrix.load(self.course.id).status.tolist()
+        )
+
+        TaskProgress.objects.create(
+            user=self.students[0], task=self.tasks[3], status="in_progress"
+        )
+
+        self.assertIsNone(cache.get(progress_matrix_key(self.course.id)))
+        self.assertEqual(get_progress_matrix(self.course.id).status[0, 3], IN_PROGRESS)
+
+    def test_saving_progress_with_its_task_loaded_adds_no_queries(self):
+        progress = TaskProgress.objects.select_related("task").get(
+            user=self.students[1], task=self.tasks[1]
+        )
+        progress.status = "completed"
+
+        with self.assertNumQueries(1):
+            progress.save()
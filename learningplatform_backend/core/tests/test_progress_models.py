@@ -481,3 +481,38 @@ class CourseEnrollmentAPITest(TestCase):
             CourseEnrollment.objects.filter(user=self.user, course=self.course).count(),
             1,
         )
+
+
+class LearningTaskTypeTest(TestCase):
+    def setUp(self):
+        self.instructor = User.objects.create_user(
+            username="typeinstructor",
+            email="typeinstructor@example.com",
+            password="password123",
+            role="instructor",
+        )
+        self.course = Course.objects.create(
+            title="Typed Course", description="Description", creator=self.instructor
+        )
+        self.task = LearningTask.objects.create(course=self.course, title="Reading")
+        self.quiz = QuizTask.objects.create(course=self.course, title="Quiz")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.instructor)
+
+    def test_quiz_tasks_are_marked_on_save(self):
+        self.assertEqual(self.task.task_type, "task")
+        self.assertEqual(LearningTask.objects.get(pk=self.quiz.pk).task_type, "quiz")
+
+    def test_course_details_and_task_filter_use_the_type(self):
+        details = self.client.get(f"/api/v1/courses/{self.course.id}/details/")
+        self.assertEqual(
+            {task["title"]: task["type"] for task in details.data["tasks"]},
+            {"Reading": "task", "Quiz": "quiz"},
+        )
+
+        response = self.client.get(
+            f"/api/v1/learning-tasks/?course={self.course.id}&task_type=quiz"
+        )
+        self.assertEqual(
+            [task["id"] for task in response.json()["results"]], [self.quiz.id]
+        )
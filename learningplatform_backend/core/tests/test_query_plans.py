@@ -0,0 +1,137 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+    TaskProgress,
+)
+
+User = get_user_model()
+
+
+class QueryPlanTests(APITestCase):
+    def setUp(self):
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        self.course = Course.objects.create(
+            title="Course", description="Description", creator=self.instructor
+        )
+        self.tasks = [
+            LearningTask.objects.create(course=self.course, title=f"Task {i}", order=i)
+            for i in range(2)
+        ]
+        self.quiz = QuizTask.objects.create(
+            course=self.course, title="Quiz", order=3, pass_threshold=70
+        )
+        self.question = QuizQuestion.objects.create(
+            quiz=self.quiz, text="Question", order=1
+        )
+        self.option = QuizOption.objects.create(
+            question=self.question, text="Answer", is_correct=True, order=1
+        )
+        self.student_count = 0
+        self.client.force_authenticate(user=self.instructor)
+
+    def _add_students(self, count):
+        for _ in range(count):
+            self.student_count += 1
+            student = User.objects.create_user(
+                username=f"student{self.student_count}",
+                email=f"student{self.student_count}@example.com",
+                password="studentpass",
+                role="student",
+            )
+            CourseEnrollment.objects.create(user=student, course=self.course)
+            TaskProgress.objects.create(
+                user=student, task=self.tasks[0], status="completed"
+            )
+            attempt = QuizAttempt.objects.create(
+                user=student,
+                quiz=self.quiz,
+                score=100,
+                time_taken=datetime.timedelta(minutes=5),
+                completion_status="completed",
+            )
+            QuizResponse.objects.create(
+                attempt=attempt,
+                question=self.question,
+                selected_option=self.option,
+                is_correct=True,
+                time_spent=datetime.timedelta(seconds=30),
+            )
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_enrollment_list_query_count_is_independent_of_page_size(self):
+        self._add_students(2)
+        few, _ = self._count_queries("/api/v1/enrollments/")
+
+        self._add_students(4)
+        many, response = self._count_queries("/api/v1/enrollments/")
+
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.data["results"]), 6)
+        # One of the course's three tasks is completed
+        for enrollment in response.data["results"]:
+            self.assertAlmostEqual(enrollment["progress_percentage"], 100 / 3)
+            self.assertEqual(
+                enrollment["course_details"]["creator_details"]["id"],
+                self.instructor.id,
+            )
+
+    def test_quiz_attempt_list_query_count_is_independent_of_page_size(self):
+        url = "/api/v1/quiz-attempts/?expand=quiz_details,responses"
+        self._add_students(2)
+        few, _ = self._count_queries(url)
+
+        self._add_students(4)
+        many, response = self._count_queries(url)
+
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertEqual(len(response.data["results"][0]["responses"]), 1)
+
+    def test_quiz_attempt_list_is_slim_by_default(self):
+        self._add_students(1)
+
+        _, response = self._count_queries("/api/v1/quiz-attempts/")
+        attempt = response.data["results"][0]
+
+        self.assertNotIn("quiz_details", attempt)
+        self.assertNotIn("responses", attempt)
+        self.assertEqual(attempt["score"], 100)
+
+    def test_quiz_attempt_detail_includes_nested_payload(self):
+        self._add_students(1)
+        attempt = QuizAttempt.objects.get()
+
+        _, response = self._count_queries(f"/api/v1/quiz-attempts/{attempt.id}/")
+
+        self.assertEqual(response.data["quiz_details"]["id"], self.quiz.id)
+        self.assertEqual(len(response.data["responses"]), 1)
+
+    def test_fields_parameter_limits_payload(self):
+        self._add_students(1)
+
+        _, response = self._count_queries("/api/v1/enrollments/?fields=id,status")
+
+        self.assertEqual(set(response.data["results"][0]), {"id", "status"})
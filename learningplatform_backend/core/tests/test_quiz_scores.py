@@ -0,0 +1,281 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.caching import quiz_responses_key, quiz_scores_key
+from core.models import (
+    Course,
+    CourseEnrollment,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+)
+
+User = get_user_model()
+
+
+class QuizScoreStatsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        course = Course.objects.create(
+            title="Course", description="Description", creator=self.instructor
+        )
+        self.quiz = QuizTask.objects.create(course=course, title="Quiz")
+        self.url = f"/api/v1/quiz-tasks/{self.quiz.id}/score-stats/"
+        self.students = []
+        for i, scores in enumerate([(40, 80), (60,), (90, 70), (50,)]):
+            student = User.objects.create_user(
+                username=f"student{i}",
+                email=f"student{i}@example.com",
+                password="studentpass",
+            )
+            self.students.append(student)
+            CourseEnrollment.objects.create(user=student, course=course)
+            for score in scores:
+                self.attempt(student, score)
+
+    def attempt(self, student, score):
+        return QuizAttempt.objects.create(
+            user=student,
+            quiz=self.quiz,
+            score=score,
+            time_taken=timedelta(minutes=5),
+            completion_status="completed",
+        )
+
+    @override_settings(SHARED_CACHE=True)
+    def test_distributions_and_own_rank(self):
+        self.client.force_authenticate(user=self.students[0])
+
+        data = self.client.get(self.url, {"percentiles": "50,90"}).json()
+
+        attempts = data["attempts"]
+        self.assertEqual(attempts["count"], 6)
+        self.assertEqual(attempts["mean"], 65)
+        self.assertEqual(
+            attempts["quartiles"], {"q1": 52.5, "median": 65.0, "q3": 77.5}
+        )
+        self.assertEqual(attempts["percentiles"], {"p50": 65.0, "p90": 85.0})
+        self.assertEqual(sum(attempts["histogram"]["counts"]), 6)
+        self.assertEqual(data["first_attempts"]["min"], 40)
+        self.assertEqual(data["first_attempts"]["max"], 90)
+        self.assertEqual(data["best_attempts"]["min"], 50)
+        self.assertEqual(data["best_attempts"]["count"], 4)
+        # Best scores are 50, 60, 80 and 90; first scores 40, 50, 60 and 90
+        self.assertEqual(
+            data["your_scores"],
+            {
+                "first": 40,
+                "best": 80,
+                "first_percentile_rank": 0.0,
+                "best_percentile_rank": 50.0,
+            },
+        )
+
+        # Later requests are served from the cached score arrays
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_new_attempts_drop_the_cached_scores(self):
+        self.client.force_authenticate(user=self.instructor)
+        self.client.get(self.url)
+        self.assertIsNotNone(cache.get(quiz_scores_key(self.quiz.id)))
+
+        self.attempt(self.students[1], 100)
+
+        self.assertIsNone(cache.get(quiz_scores_key(self.quiz.id)))
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["attempts"]["count"], 7)
+        self.assertIsNone(data["your_scores"])
+
+    def test_access_and_validation(self):
+        outsider = User.objects.create_user(
+            username="outsider", email="outsider@example.com", password="pass"
+        )
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        self.client.force_authenticate(user=self.instructor)
+        self.assertEqual(
+            self.client.get(self.url, {"percentiles": "50,101"}).status_code, 400
+        )
+        self.assertEqual(
+            self.client.get(self.url, {"percentiles": "median"}).status_code, 400
+        )
+        self.assertEqual(
+            self.client.get("/api/v1/quiz-tasks/999/score-stats/").status_code, 404
+        )
+
+
+class QuizThresholdSimulationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user(
+            username="instructor",
+            email="instructor@example.com",
+            password="instructorpass",
+            role="instructor",
+        )
+        course = Course.objects.create(
+            title="Course", description="Description", creator=self.instructor
+        )
+        self.quiz = QuizTask.objects.create(
+            course=course, title="Quiz", pass_threshold=70
+        )
+        self.url = f"/api/v1/quiz-tasks/{self.quiz.id}/threshold-simulation/"
+        self.easy = QuizQuestion.objects.create(quiz=self.quiz, text="Easy", points=1)
+        self.hard = QuizQuestion.objects.create(quiz=self.quiz, text="Hard", points=3)
+        # Learner 0 scores 25 then 75, learner 1 scores 100, learner 2 scores 0
+        self.students = []
+        for i, attempts in enumerate(
+            [[(True, False), (False, True)], [(True, True)], [(False, False)]]
+        ):
+            student = User.objects.create_user(
+                username=f"student{i}",
+                email=f"student{i}@example.com",
+                password="studentpass",
+            )
+            self.students.append(student)
+            for answers in attempts:
+                self.attempt(student, answers)
+
+    def attempt(self, student, answers):
+        earned = sum(
+            question.points
+            for question, correct in zip((self.easy, self.hard), answers)
+            if correct
+        )
+        attempt = QuizAttempt.objects.create(
+            user=student,
+            quiz=self.quiz,
+            score=earned * 100 / 4,
+            time_taken=timedelta(minutes=5),
+            completion_status="completed",
+        )
+        for question, correct in zip((self.easy, self.hard), answers):
+            option = QuizOption.objects.create(
+                question=question, text="Option", is_correct=correct
+            )
+            QuizResponse.objects.create(
+                attempt=attempt,
+                question=question,
+                selected_option=option,
+                is_correct=correct,
+                time_spent=timedelta(minutes=1),
+            )
+        return attempt
+
+    def simulate(self, payload):
+        return self.client.post(self.url, payload, format="json")
+
+    def test_recorded_and_reweighted_pass_rates(self):
+        self.client.force_authenticate(user=self.instructor)
+
+        response = self.simulate(
+            {
+                "thresholds": [50, 80],
+                "scenarios": [
+                    {"name": "equal", "points": {str(self.hard.id): 1}},
+                ],
+            }
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["current_threshold"], 70)
+        self.assertEqual((data["attempts"], data["learners"]), (4, 3))
+        recorded, equal = data["scenarios"]
+        self.assertEqual(recorded["name"], "recorded")
+        self.assertEqual(
+            recorded["results"][0],
+            {
+                "threshold": 50.0,
+                "attempts_passed": 2,
+                "attempt_pass_rate": 50.0,
+                "learners_passed": 2,
+                "learner_pass_rate": 66.67,
+            },
+        )
+        self.assertEqual(
+            [(r["attempts_passed"], r["learners_passed"]) for r in recorded["results"]],
+            [(2, 2), (1, 1)],
+        )
+        # With equal points both of learner 0's attempts score 50, but they
+        # still count as a single passing learner
+        self.assertEqual(equal["name"], "equal")
+        self.assertEqual(
+            [(r["attempts_passed"], r["learners_passed"]) for r in equal["results"]],
+            [(3, 2), (1, 1)],
+        )
+
+        # Later simulations run on the cached response matrix
+        with self.assertNumQueries(1):
+            self.simulate({"thresholds": [60]})
+
+    def test_new_responses_drop_the_cached_matrix(self):
+        self.client.force_authenticate(user=self.instructor)
+        self.simulate({"thresholds": [60]})
+        self.assertIsNotNone(cache.get(quiz_responses_key(self.quiz.id)))
+
+        self.attempt(self.students[2], (True, True))
+
+        self.assertIsNone(cache.get(quiz_responses_key(self.quiz.id)))
+        data = self.simulate({"thresholds": [60]}).json()
+        self.assertEqual(data["scenarios"][0]["results"][0]["learners_passed"], 3)
+
+    def test_answers_to_an_open_attempt_add_no_queries(self):
+        attempt = QuizAttempt.objects.create(
+            user=self.students[2],
+            quiz=self.quiz,
+            score=0,
+            time_taken=timedelta(minutes=5),
+            completion_status="in_progress",
+        )
+        option = QuizOption.objects.create(question=self.easy, text="Option")
+
+        with self.assertNumQueries(1):
+            QuizResponse.objects.create(
+                attempt=attempt,
+                question=self.easy,
+                selected_option=option,
+                is_correct=False,
+                time_spent=timedelta(minutes=1),
+            )
+
+    def test_access_and_validation(self):
+        self.client.force_authenticate(user=self.students[0])
+        self.assertEqual(self.simulate({"thresholds": [60]}).status_code, 403)
+
+        self.client.force_authenticate(user=self.instructor)
+        self.assertEqual(self.simulate({"thresholds": []}).status_code, 400)
+        self.assertEqual(self.simulate({"thresholds": [120]}).status_code, 400)
+        self.assertEqual(
+            self.simulate(
+                {"thresholds": [60], "scenarios": [{"name": "x", "points": {"a": 1}}]}
+            ).status_code,
+            400,
+        )
+        response = self.simulate(
+            {"thresholds": [60], "scenarios": [{"name": "x", "points": {"999": 1}}]}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("999", response.json()["error"])
+        self.assertEqual(
+            self.client.post(
+                "/api/v1/quiz-tasks/999/threshold-simulation/",
+                {"thresholds": [60]},
+                format="json",
+            ).status_code,
+            404,
+        )
@@ -0,0 +1,57 @@
+import datetime
+import io
+import json
+from decimal import Decimal
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+from core.renderers import FastJSONParser, FastJSONRenderer
+
+
+@skipIf(renderers.orjson is None, "orjson is not installed")
+class FastJSONRendererTests(SimpleTestCase):
+    def setUp(self):
+        self.payload = {
+            "time_spent": datetime.timedelta(minutes=5, microseconds=10),
+            "average": Decimal("12.50"),
+            "created_at": datetime.datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+            "date": datetime.date(2024, 5, 1),
+            "label": gettext_lazy("Completed"),
+            "text": "unicode \u00fcn\u00efc\u00f8d\u00e9 \u2028 line",
+            1: [1, 2.5, None, True],
+        }
+
+    def test_output_matches_drf_renderer(self):
+        expected = JSONRenderer().render(self.payload)
+        actual = FastJSONRenderer().render(self.payload)
+
+        self.assertEqual(json.loads(actual), json.loads(expected))
+        self.assertIn(b"\\u2028", actual)
+        self.assertIn(b'"2024-05-01T12:30:00Z"', actual)
+
+    def test_indented_output_falls_back_to_drf(self):
+        rendered = FastJSONRenderer().render(
+            {"a": 1}, "application/json; indent=4", {}
+        )
+
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+    def test_unsupported_values_fall_back_to_drf(self):
+        rendered = FastJSONRenderer().render({"big": 2**70})
+
+        self.assertEqual(json.loads(rendered), {"big": 2**70})
+
+    def test_parser_round_trip(self):
+        parsed = FastJSONParser().parse(io.BytesIO(b'{"items": [{"task": 1}]}'))
+
+        self.assertEqual(parsed, {"items": [{"task": 1}]})
+
+    def test_parser_rejects_invalid_json(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"items": NaN}'))
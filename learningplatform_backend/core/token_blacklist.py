@@ -0,0 +1,182 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .caching import cache_is_shared
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Shared cache keys; without a shared cache backend (``SHARED_CACHE``) other
+# processes would never see them, so every check goes to the database instead
+GENERATION_KEY = "token_blacklist_generation"
+HIGH_WATER_KEY = "token_blacklist_high_water"
+
+# Seconds before a local filter is rebuilt even if the cache reports no change,
+# bounding the damage of lost cache entries (evictions, restarts)
+FILTER_MAX_AGE = 5 * 60
+
+
+def blacklisted_jti_key(jti):
+    return f"token_blacklist_jti_{jti}"
+
+
+class BloomFilter:
+    """
+    A fixed-size bloom filter over strings.
+
+    Membership tests never give false negatives, so a miss proves a JTI was
+    not blacklisted when the filter was last synchronised.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(int(capacity), 1)
+        self.num_bits = max(
+            64, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        # Kirsch-Mitzenmacher double hashing
+        return ((first + i * second) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class BlacklistIndex:
+    """
+    Answers "is this JTI blacklisted?" mostly without touching the database.
+
+    Lookups first check the shared cache of recently blacklisted JTIs, then a
+    process-local bloom filter built from the non-expired blacklist rows.
+    Only bloom filter hits (real entries or rare false positives) fall back to
+    the ``BlacklistedToken`` table. The filter is kept current through two
+    shared cache values: a high-water mark of the newest blacklist row id,
+    which triggers an incremental load, and a generation id, which triggers a
+    full rebuild after purges.
+
+    Without a shared cache every lookup checks the table, as blacklisting in
+    another process could not be seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._built_at = 0
+        self._generation = None
+        self._high_water = 0
+
+    def contains(self, jti):
+        if not cache_is_shared():
+            return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+        state = cache.get_many(
+            [GENERATION_KEY, HIGH_WATER_KEY, blacklisted_jti_key(jti)]
+        )
+        if state.get(blacklisted_jti_key(jti)):
+            return True
+
+        self._sync(state.get(GENERATION_KEY), state.get(HIGH_WATER_KEY))
+
+        if jti not in self._bloom:
+            return False
+
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def record(self, blacklisted_token):
+        """Publish a newly blacklisted token to the cache and local filter."""
+        outstanding = blacklisted_token.token
+        remaining = (outstanding.expires_at - timezone.now()).total_seconds()
+        if remaining > 0:
+            cache.set(blacklisted_jti_key(outstanding.jti), True, int(remaining) + 1)
+
+        high_water = cache.get(HIGH_WATER_KEY) or 0
+        if blacklisted_token.pk > high_water:
+            cache.set(HIGH_WATER_KEY, blacklisted_token.pk, None)
+
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(outstanding.jti)
+
+    def reset(self):
+        """Force every process to rebuild its filter (e.g. after a purge)."""
+        cache.set(GENERATION_KEY, uuid.uuid4().hex, None)
+        cache.delete(HIGH_WATER_KEY)
+
+    def _sync(self, generation, high_water):
+        with self._lock:
+            if generation is None:
+                # Cache was cleared or never initialised
+                generation = uuid.uuid4().hex
+                if not cache.add(GENERATION_KEY, generation, None):
+                    generation = cache.get(GENERATION_KEY)
+
+            if (
+                self._bloom is None
+                or generation != self._generation
+                or time.monotonic() - self._built_at > FILTER_MAX_AGE
+            ):
+                self._rebuild(generation)
+            elif high_water is None or high_water > self._high_water:
+                self._load_since(self._high_water)
+                if self._bloom.count > self._bloom.capacity:
+                    self._rebuild(generation)
+
+    def _blacklist_rows(self):
+        return BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()
+        ).values_list("id", "token__jti")
+
+    def _rebuild(self, generation):
+        rows = list(self._blacklist_rows())
+        self._bloom = BloomFilter(capacity=max(1024, len(rows) * 2))
+        self._built_at = time.monotonic()
+        self._generation = generation
+        self._high_water = 0
+        self._add_rows(rows)
+        logger.debug("Rebuilt token blacklist filter with %s entries", len(rows))
+
+    def _load_since(self, last_id):
+        self._add_rows(self._blacklist_rows().filter(id__gt=last_id))
+
+    def _add_rows(self, rows):
+        for row_id, jti in rows:
+            self._bloom.add(jti)
+            self._high_water = max(self._high_water, row_id)
+        cache.add(HIGH_WATER_KEY, self._high_water, None)
+
+
+blacklist_index = BlacklistIndex()
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """Refresh token whose blacklist check goes through ``blacklist_index``."""
+
+    def check_blacklist(self):
+        if blacklist_index.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
@@ -1,8 +1,11 @@
+import gzip
 import logging
 from django.db import models
 from django.db.models import Avg
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.contrib.auth.models import AnonymousUser
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.authentication import get_authorization_header
 from rest_framework.decorators import action, api_view, permission_classes
@@ -10,7 +13,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from .models import (
@@ -18,6 +21,7 @@ from .models import (
     CourseEnrollment,
     CourseVersion,
     LearningTask,
+    QuestionTag,
     QuizAttempt,
     QuizOption,
     QuizQuestion,
@@ -32,6 +36,7 @@ from .serializers import (
     CourseVersionSerializer,
     CustomTokenObtainPairSerializer,
     LearningTaskSerializer,
+    QuestionTagSerializer,
     QuizAttemptSerializer,
     QuizOptionSerializer,
     QuizQuestionSerializer,
@@ -41,7 +46,26 @@ from .serializers import (
     TaskProgressSerializer,
     UserSerializer,
 )
+from .token_blacklist import CachedBlacklistRefreshToken
 from .permissions import IsEnrolledInCourse, IsInstructorOrAdmin, IsStudentOrReadOnly
+from .caching import is_enrolled
+from .analytics import build_admin_dashboard, build_instructor_dashboard
+from .conditional import ConditionalGetMixin, QuizConditionalGetMixin
+from .course_versions import delete_course_version, get_version_snapshot
+from .course_clone import CourseImportError, clone_course, import_course_snapshot
+from .course_content import (
+    get_content_bundle,
+    get_course_content_pointer,
+    publish_course_version,
+)
+from .fast_serializers import FastListMixin, learning_task_serializer
+from .bulk_operations import (
+    MAX_BULK_ENROLLMENTS,
+    MAX_BULK_ITEMS,
+    bulk_enroll_users,
+    bulk_provision_users,
+    parse_user_identifiers,
+)
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -86,7 +110,7 @@ class LogoutView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
+            token = CachedBlacklistRefreshToken(refresh_token)
             token.blacklist()
             return Response(status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
@@ -111,8 +135,33 @@ class UserViewSet(viewsets.ModelViewSet):
                 return [permissions.IsAuthenticated()]
         return super().get_permissions()
 
+    @action(detail=False, methods=["post"], url_path="bulk-provision")
+    def bulk_provision(self, request):
+        """
+        Create many accounts at once (admin only).
+
+        Accepts ``{"users": [...]}`` where each entry has ``username`` and
+        ``email`` plus either ``sso: true``, a plaintext ``password`` or an
+        imported ``password_hash``.
+        """
+        entries = request.data.get("users") if isinstance(request.data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return Response(
+                {"error": "Provide a non-empty 'users' list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-class CourseViewSet(viewsets.ModelViewSet):
+        if len(entries) > MAX_BULK_ITEMS:
+            return Response(
+                {"error": f"A single request may provision at most {MAX_BULK_ITEMS} users."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        summary = bulk_provision_users(entries)
+        return Response(summary, status=status.HTTP_201_CREATED)
+
+
+class CourseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     API endpoint for courses
     """
@@ -176,11 +225,7 @@ class CourseViewSet(viewsets.ModelViewSet):
             course = self.get_object()
 
             # Check if the user is enrolled
-            is_enrolled = CourseEnrollment.objects.filter(
-                user_id=user_id, course_id=course.id
-            ).exists()
-
-            if not is_enrolled:
+            if not is_enrolled(user_id, course.id, request):
                 # Return limited course details for non-enrolled users
                 return Response(
                     {
@@ -242,7 +287,7 @@ class CourseViewSet(viewsets.ModelViewSet):
                     "learning_objectives": course.learning_objectives,
                     "prerequisites": course.prerequisites,
                     "tasks": [
-                        {"id": task.id, "title": task.title, "type": task.type}
+                        {"id": task.id, "title": task.title, "type": task.task_type}
                         for task in tasks
                     ],
                 }
@@ -286,6 +331,206 @@ class CourseViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED,
         )
 
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="bulk-enroll",
+        permission_classes=[IsAuthenticated],
+    )
+    def bulk_enroll(self, request, pk=None):
+        """
+        Enroll a cohort of users given as ``{"users": [...ids or emails]}``
+        or as an uploaded CSV ``file``.
+        """
+        course = self.get_object()
+        user = request.user
+        is_admin = user.role == "admin" or user.is_staff
+
+        if not is_admin and not (
+            user.role == "instructor" and course.creator_id == user.id
+        ):
+            return Response(
+                {"error": "You do not have permission to enroll users in this course."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        upload = request.FILES.get("file")
+        if upload is not None:
+            try:
+                text = upload.read().decode("utf-8-sig")
+            except UnicodeDecodeError:
+                return Response(
+                    {"error": "The CSV file must be UTF-8 encoded."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            identifiers = parse_user_identifiers(text)
+        elif isinstance(request.data, dict):
+            identifiers = request.data.get("users")
+        else:
+            identifiers = None
+
+        if not isinstance(identifiers, list) or not identifiers:
+            return Response(
+                {"error": "Provide a non-empty 'users' list or a CSV 'file'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(identifiers) > MAX_BULK_ENROLLMENTS:
+            return Response(
+                {
+                    "error": f"A single request may enroll at most {MAX_BULK_ENROLLMENTS} users."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        summary = bulk_enroll_users(course, identifiers)
+        return Response(summary, status=status.HTTP_200_OK)
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="publish-content",
+        permission_classes=[IsAuthenticated],
+    )
+    def publish_content(self, request, pk=None):
+        """
+        Snapshot the course as a new version and compile its student content
+        bundle.
+        """
+        course = self.get_object()
+        user = request.user
+        is_admin = user.role == "admin" or user.is_staff
+
+        if not is_admin and not (
+            user.role == "instructor" and course.creator_id == user.id
+        ):
+            return Response(
+                {"error": "You do not have permission to publish this course."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        bundle = publish_course_version(
+            course, user=user, notes=request.data.get("notes", "")
+        )
+        return Response(
+            {
+                "version": bundle.version.version_number,
+                "checksum": bundle.checksum,
+                "size": bundle.size,
+                "url": reverse("course_content_bundle", args=[bundle.checksum]),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="content",
+        permission_classes=[IsAuthenticated],
+    )
+    def content(self, request, pk=None):
+        """
+        Point to the latest published content bundle of the course.
+        """
+        if not can_read_course_content(request, pk):
+            return Response(
+                {"error": "You must be enrolled in this course to view its content."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        pointer = get_course_content_pointer(pk)
+        if pointer is None:
+            return Response(
+                {"error": "This course has no published content yet."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(
+            {
+                **pointer,
+                "url": reverse("course_content_bundle", args=[pointer["checksum"]]),
+            }
+        )
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="clone",
+        permission_classes=[IsAuthenticated],
+    )
+    def clone(self, request, pk=None):
+        """
+        Copy the course, or one of its versions, to a new course owned by the
+        requesting user.
+        """
+        course = self.get_object()
+        user = request.user
+        is_admin = user.role == "admin" or user.is_staff
+
+        if not is_admin and not (
+            user.role == "instructor" and course.creator_id == user.id
+        ):
+            return Response(
+                {"error": "You do not have permission to clone this course."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        overrides = {
+            "title": request.data.get("title"),
+            "status": request.data.get("status"),
+        }
+        version_number = request.data.get("version")
+        if version_number is None:
+            new_course, counts = clone_course(course, user, **overrides)
+        else:
+            version = CourseVersion.objects.filter(
+                course=course, version_number=version_number
+            ).first()
+            if version is None:
+                return Response(
+                    {"error": f"Course version {version_number} not found."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            try:
+                new_course, counts = import_course_snapshot(
+                    get_version_snapshot(version), user, **overrides
+                )
+            except CourseImportError as e:
+                return Response(
+                    {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+        return Response(
+            {"course": CourseSerializer(new_course).data, "counts": counts},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        permission_classes=[IsAuthenticated, IsInstructorOrAdmin],
+    )
+    def import_snapshot(self, request):
+        """
+        Create a new course from a course content snapshot, e.g. one exported
+        from another installation.
+        """
+        try:
+            course, counts = import_course_snapshot(
+                request.data.get("snapshot"),
+                request.user,
+                title=request.data.get("title"),
+                status=request.data.get("status"),
+            )
+        except CourseImportError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"course": CourseSerializer(course).data, "counts": counts},
+            status=status.HTTP_201_CREATED,
+        )
+
     def get_permissions(self):
         """
         Allow students to view course details.
@@ -301,21 +546,30 @@ class CourseVersionViewSet(viewsets.ModelViewSet):
     API endpoint for course versions
     """
 
-    queryset = CourseVersion.objects.all().order_by("created_at")
+    # Snapshots are loaded (or rebuilt) on demand by the serializer
+    queryset = (
+        CourseVersion.objects.select_related("created_by")
+        .defer("content_snapshot", "snapshot_delta")
+        .order_by("created_at")
+    )
     serializer_class = CourseVersionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
+    def perform_destroy(self, instance):
+        delete_course_version(instance)
 
-class LearningTaskViewSet(viewsets.ModelViewSet):
+
+class LearningTaskViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint for learning tasks
     """
 
     queryset = LearningTask.objects.all()
     serializer_class = LearningTaskSerializer
+    compiled_serializer = learning_task_serializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
@@ -323,6 +577,9 @@ class LearningTaskViewSet(viewsets.ModelViewSet):
         course_id = self.request.query_params.get("course")
         if course_id is not None:
             queryset = queryset.filter(course_id=course_id)
+        task_type = self.request.query_params.get("task_type")
+        if task_type is not None:
+            queryset = queryset.filter(task_type=task_type)
         return queryset
 
     @action(detail=False, methods=["get"], url_path="course/(?P<course_id>[^/.]+)")
@@ -351,12 +608,14 @@ class LearningTaskViewSet(viewsets.ModelViewSet):
             )
 
 
-class QuizTaskViewSet(viewsets.ModelViewSet):
+class QuizTaskViewSet(QuizConditionalGetMixin, viewsets.ModelViewSet):
     """
     API endpoint for quiz tasks
     """
 
-    queryset = QuizTask.objects.all()
+    queryset = QuizTask.objects.prefetch_related(
+        "questions__options", "questions__tags"
+    )
     serializer_class = QuizTaskSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -366,11 +625,28 @@ class QuizQuestionViewSet(viewsets.ModelViewSet):
     API endpoint for quiz questions
     """
 
-    queryset = QuizQuestion.objects.all()
+    queryset = QuizQuestion.objects.prefetch_related("options", "tags")
     serializer_class = QuizQuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
+class QuestionTagViewSet(viewsets.ModelViewSet):
+    """
+    API endpoint for question tags (skills/topics used in quiz analytics)
+    """
+
+    queryset = QuestionTag.objects.all()
+    serializer_class = QuestionTagSerializer
+
+    def get_permissions(self):
+        """
+        Anyone signed in may read tags; instructors and admins manage them.
+        """
+        if self.action in ["list", "retrieve"]:
+            return [IsAuthenticated()]
+        return [IsAuthenticated(), IsInstructorOrAdmin()]
+
+
 class QuizOptionViewSet(viewsets.ModelViewSet):
     """
     API endpoint for quiz options
@@ -511,12 +787,64 @@ class UserTaskProgressAPI(APIView):
         return Response(data)
 
 
+def can_read_course_content(request, course_id):
+    """Instructors, admins and enrolled students may read course content."""
+    user = request.user
+    if user.role in ["instructor", "admin"] or user.is_staff:
+        return True
+    return is_enrolled(user.id, course_id, request)
+
+
+class CourseContentBundleAPI(APIView):
+    """
+    Serves an immutable course content bundle by checksum.
+
+    Bundles never change, so responses may be cached for a year and the
+    gzip bytes are sent as stored to clients that accept gzip.
+    """
+
+    permission_classes = [IsAuthenticated]
+    stateless_auth = True
+
+    def get(self, request, checksum):
+        bundle = get_content_bundle(checksum)
+        if bundle is None or not can_read_course_content(
+            request, bundle["course_id"]
+        ):
+            # Do not reveal which checksums exist
+            return Response(
+                {"error": "Content bundle not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        etag = f'"{checksum}"'
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            accepts_gzip = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+            if accepts_gzip:
+                response = HttpResponse(
+                    bundle["content"], content_type="application/json"
+                )
+                response["Content-Encoding"] = "gzip"
+            else:
+                response = HttpResponse(
+                    gzip.decompress(bundle["content"]),
+                    content_type="application/json",
+                )
+
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, max-age=31536000, immutable"
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+
 class InstructorDashboardAPI(APIView):
     """
     API endpoint for instructor-specific dashboard data.
     """
 
     permission_classes = [IsAuthenticated]
+    stateless_auth = True
 
     def get(self, request):
         if request.user.role != "instructor":
@@ -525,27 +853,7 @@ class InstructorDashboardAPI(APIView):
                 status=403,
             )
 
-        # Fetch courses created by the instructor
-        courses_created = Course.objects.filter(creator=request.user).count()
-        # Fetch students enrolled in the instructor's courses
-        students_enrolled = (
-            CourseEnrollment.objects.filter(course__creator=request.user)
-            .values("user")
-            .distinct()
-            .count()
-        )
-        # Fetch recent activity in the instructor's courses
-        recent_activity = (
-            TaskProgress.objects.filter(task__course__creator=request.user)
-            .order_by("-updated_at")[:5]
-            .values("task__title", "status", "updated_at")
-        )
-
-        data = {
-            "courses_created": courses_created,
-            "students_enrolled": students_enrolled,
-            "recent_activity": list(recent_activity),
-        }
+        data = build_instructor_dashboard(request.user.id)
         return Response(data)
 
 
@@ -555,6 +863,7 @@ class AdminDashboardAPI(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    stateless_auth = True
 
     def get(self, request):
         if request.user.role != "admin":
@@ -563,13 +872,7 @@ class AdminDashboardAPI(APIView):
                 status=403,
             )
 
-        # Example data for the admin dashboard
-        data = {
-            "totalTasks": TaskProgress.objects.count(),
-            "completedTasks": TaskProgress.objects.filter(status="completed").count(),
-            "averageScore": QuizAttempt.objects.aggregate(Avg("score"))["score__avg"]
-            or 0,
-        }
+        data = build_admin_dashboard()
         return Response(data)
 
 
@@ -2,6 +2,9 @@
 ASGI config for learningplatform_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server, e.g.
+``uvicorn learningplatform_backend.asgi:application``, to get the benefit of
+the async endpoints under ``/api/v1/async/``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import logging
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -103,6 +104,30 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Several core caches (token blacklist, enrollments, content hashes) are only
+# invalidated in the process that handles a write, so they are only kept across
+# requests when every worker shares the cache. Set REDIS_URL to use Redis; the
+# local-memory fallback is private to each process.
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+# Whether all worker processes see the same default cache (see core.caching)
+SHARED_CACHE = bool(REDIS_URL)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -150,9 +175,19 @@ AUTH_USER_MODEL = "core.User"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # orjson-backed JSON when installed, DRF's stdlib JSON otherwise
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
 }
@@ -179,8 +214,27 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_EXP_CLAIM": "refresh_exp",
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=5),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
+    "TOKEN_REFRESH_SERIALIZER": "core.serializers.CachedBlacklistTokenRefreshSerializer",
 }
 
+# Seconds an authenticated User row stays in the cache (see core.authentication)
+AUTH_USER_CACHE_TIMEOUT = 60
+
+# Seconds a user's enrolled course ids stay cached (see core.caching)
+ENROLLMENT_CACHE_TIMEOUT = 300
+
+# Seconds a published course content bundle stays cached (see core.course_content)
+CONTENT_BUNDLE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Seconds a quiz content digest stays cached with a shared cache (see core.caching)
+QUIZ_CONTENT_CACHE_TIMEOUT = 60 * 60
+
+# Course versions store a full snapshot every N versions and deltas in between
+COURSE_VERSION_CHECKPOINT_INTERVAL = 10
+
+# Run independent report queries on parallel connections (see core.async_views)
+ASYNC_PARALLEL_QUERIES = True
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = (
     True  # Only for development, set to specific origins in production
@@ -30,14 +30,18 @@ from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
-from core import views
+from core import async_views, views
 from core.progress_api import (
     CourseAnalyticsAPI,
+    CourseCategoryPerformanceAPI,
+    CourseFunnelAPI,
     CourseStudentProgressAPI,
     CourseTaskAnalyticsAPI,
     EnhancedCourseEnrollmentViewSet,
     EnhancedQuizAttemptViewSet,
     EnhancedTaskProgressViewSet,
+    QuizScoreStatsAPI,
+    QuizThresholdSimulationAPI,
     StudentProgressAPI,
     StudentQuizPerformanceAPI,
 )
@@ -59,6 +63,7 @@ router.register(r"learning-tasks", views.LearningTaskViewSet)
 router.register(r"quiz-tasks", views.QuizTaskViewSet)
 router.register(r"quiz-questions", views.QuizQuestionViewSet)
 router.register(r"quiz-options", views.QuizOptionViewSet)
+router.register(r"question-tags", views.QuestionTagViewSet)
 router.register(r"course-enrollments", views.CourseEnrollmentViewSet)
 router.register(r"task-progress", EnhancedTaskProgressViewSet)
 router.register(r"quiz-attempts", EnhancedQuizAttemptViewSet)
@@ -93,6 +98,16 @@ analytics_urls = [
         CourseTaskAnalyticsAPI.as_view(),
         name="course_task_analytics",
     ),
+    path(
+        "courses/<int:pk>/category-performance/",
+        CourseCategoryPerformanceAPI.as_view(),
+        name="course_category_performance",
+    ),
+    path(
+        "courses/<int:pk>/funnel/",
+        CourseFunnelAPI.as_view(),
+        name="course_funnel",
+    ),
     path(
         "students/<int:pk>/progress/",
         StudentProgressAPI.as_view(),
@@ -108,6 +123,45 @@ analytics_urls = [
         StudentQuizPerformanceAPI.as_view(),
         name="student_quiz_performance",
     ),
+    path(
+        "quiz-tasks/<int:pk>/score-stats/",
+        QuizScoreStatsAPI.as_view(),
+        name="quiz_score_stats",
+    ),
+    path(
+        "quiz-tasks/<int:pk>/threshold-simulation/",
+        QuizThresholdSimulationAPI.as_view(),
+        name="quiz_threshold_simulation",
+    ),
+]
+
+# Async (ASGI) counterparts of the read-heavy endpoints
+async_urls = [
+    path(
+        "courses/<int:pk>/analytics/",
+        async_views.AsyncCourseAnalyticsAPI.as_view(),
+        name="async_course_analytics",
+    ),
+    path(
+        "students/<int:pk>/progress/",
+        async_views.AsyncStudentProgressAPI.as_view(),
+        name="async_student_progress",
+    ),
+    path(
+        "students/progress/",
+        async_views.AsyncStudentProgressAPI.as_view(),
+        name="async_student_personal_progress",
+    ),
+    path(
+        "instructor/dashboard/",
+        async_views.AsyncInstructorDashboardAPI.as_view(),
+        name="async_instructor_dashboard",
+    ),
+    path(
+        "admin/dashboard/",
+        async_views.AsyncAdminDashboardAPI.as_view(),
+        name="async_admin_dashboard",
+    ),
 ]
 
 # Custom instructor URL
@@ -155,6 +209,7 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include(router.urls)),
     path("api/v1/", include(analytics_urls)),
+    path("api/v1/async/", include(async_urls)),
     path("api/v1/", include(instructor_urls)),  # Ensure instructor URLs are included
     path("auth/", include(auth_urls)),  # Ensure this includes the auth URLs
     path("api-auth/", include("rest_framework.urls")),  # DRF browsable API login
@@ -175,6 +230,11 @@ urlpatterns = [
     path(
         "users/profile/", UserProfileAPI.as_view(), name="user_profile"
     ),  # Add user profile route
+    path(
+        "api/v1/content-bundles/<str:checksum>/",
+        views.CourseContentBundleAPI.as_view(),
+        name="course_content_bundle",
+    ),
     path(
         "swagger/",
         schema_view.with_ui("swagger", cache_timeout=0),
@@ -120,7 +120,10 @@ def log_request(request, logger=None, log_headers=True):
 
     # Log the body only for methods that typically include a payload
     if request.method in {"POST", "PUT", "PATCH"}:
-        request_data["body"] = request.body.decode("utf-8") if request.body else None
+        # Uploads are not necessarily UTF-8; the view decides whether to reject them
+        request_data["body"] = (
+            request.body.decode("utf-8", errors="replace") if request.body else None
+        )
 
     if log_headers:
         sensitive_headers = {"Authorization", "Cookie"}